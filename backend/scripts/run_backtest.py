@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.backtest_service import BACKTEST_PERIODS, BacktestService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="저장된 일봉으로 분석 점수 모델 백테스트")
+    parser.add_argument("symbols", nargs="*", help="종목 코드 (예: AAPL 005930)")
+    parser.add_argument("--file", help="한 줄에 종목 하나씩 적은 파일")
+    parser.add_argument("--periods", default=",".join(BACKTEST_PERIODS), help="short,medium,long 중 쉼표 구분")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    symbols = list(args.symbols)
+    if args.file:
+        with open(args.file, encoding="utf-8") as handle:
+            symbols.extend(line.strip() for line in handle if line.strip() and not line.startswith("#"))
+    if not symbols:
+        raise SystemExit("no symbols given")
+
+    service = BacktestService()
+    started = time.perf_counter()
+    histories = await service.load_histories(symbols)
+    loaded = time.perf_counter()
+    report = service.run(histories, periods=[period.strip() for period in args.periods.split(",") if period.strip()], max_workers=args.workers)
+    report["load_seconds"] = round(loaded - started, 2)
+    report["backtest_seconds"] = round(time.perf_counter() - loaded, 2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
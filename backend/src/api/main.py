@@ -12,19 +12,29 @@ from src.api.routes import (
     alert_routes,
     auth_routes,
     device_token_routes,
+    diagnostics_routes,
     internal_routes,
+    metrics_routes,
     naver_stock_routes,
     news_routes,
     notification_routes,
+    screener_routes,
     session_routes,
     watchlist_routes,
 )
 from src.api.dependencies import require_session_or_admin
+from src.api.middleware import http_metrics_middleware
 from src.config.logging_config import configure_logging
 from src.config.settings import settings
-from src.models.database import init_models
+from src.models.database import SessionLocal, init_models
+from src.services.feed_fetcher import feed_fetcher
+from src.services.market_indicator_board import market_indicator_board
+from src.services.quote_events import quote_event_bus
+from src.utils.loop_monitor import event_loop_monitor
+from src.utils.timing import configure_timing
 
 configure_logging()
+configure_timing(settings.instrumentation_enabled, settings.instrumentation_sample_rate)
 logger = logging.getLogger(__name__)
 STATIC_DIR = Path(__file__).resolve().parents[1] / "web"
 
@@ -34,7 +44,42 @@ async def lifespan(_: FastAPI):
     if settings.auto_create_tables:
         await init_models()
         logger.info("Database tables ensured")
+    if settings.event_loop_monitor_enabled:
+        event_loop_monitor.start(
+            interval=settings.event_loop_monitor_interval_ms / 1000,
+            slow_threshold=settings.event_loop_slow_callback_ms / 1000,
+        )
+    indicator_states = analysis_routes.analysis_service.indicator_states
+    if settings.indicator_state_path:
+        try:
+            restored = indicator_states.load(settings.indicator_state_path)
+            logger.info("Restored %s indicator states", restored)
+        except Exception as exc:
+            logger.warning("Indicator state restore failed: %s", exc)
+    market_indicator_board.start(settings.market_board_refresh_seconds)
+    news_routes.news_service.start(settings.news_ingest_seconds)
+    if settings.quote_event_queue_size > 0:
+        alert_service = internal_routes.alert_service
+        try:
+            async with SessionLocal() as db:
+                indexed = await alert_service.load_price_index(db)
+            logger.info("Indexed %s active price alerts", indexed)
+        except Exception as exc:
+            logger.warning("Price alert index load failed: %s", exc)
+        quote_event_bus.subscribe(alert_service.on_quote)
+        quote_event_bus.start(settings.quote_event_queue_size)
     yield
+    await quote_event_bus.stop()
+    await market_indicator_board.stop()
+    await news_routes.news_service.stop()
+    await feed_fetcher.close()
+    await event_loop_monitor.stop()
+    screener_routes.screener_service.shutdown()
+    if settings.indicator_state_path:
+        try:
+            indicator_states.save(settings.indicator_state_path)
+        except Exception as exc:
+            logger.warning("Indicator state save failed: %s", exc)
 
 
 app = FastAPI(
@@ -52,16 +97,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(http_metrics_middleware)
 
 app.include_router(session_routes.router)
 app.include_router(analysis_routes.router)
 app.include_router(alert_routes.router)
 app.include_router(auth_routes.router)
 app.include_router(device_token_routes.router)
+app.include_router(diagnostics_routes.router)
 app.include_router(internal_routes.router)
+app.include_router(metrics_routes.router)
 app.include_router(naver_stock_routes.router)
 app.include_router(news_routes.router)
 app.include_router(notification_routes.router)
+app.include_router(screener_routes.router)
 app.include_router(watchlist_routes.router)
 
 if STATIC_DIR.exists():
@@ -0,0 +1,32 @@
+import time
+
+from fastapi import Request
+
+from src.utils.metrics import registry
+
+HTTP_REQUESTS = registry.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+HTTP_LATENCY = registry.histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+
+def _route_label(request: Request) -> str:
+    # Use the route template, not the raw path, so /stocks/{symbol} stays one series.
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+async def http_metrics_middleware(request: Request, call_next):
+    in_flight = HTTP_IN_FLIGHT.labels()
+    in_flight.inc()
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        in_flight.dec()
+        route = _route_label(request)
+        HTTP_LATENCY.labels(request.method, route).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(request.method, route, status).inc()
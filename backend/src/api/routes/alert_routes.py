@@ -14,6 +14,7 @@ from src.schemas.api import (
     StockAlertCreate,
     StockAlertResponse,
 )
+from src.services.alert_index import currency_key, price_alert_index, stock_key
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
@@ -33,6 +34,7 @@ async def create_stock_alert(payload: StockAlertCreate, db: AsyncSession = Depen
     db.add(alert)
     await db.commit()
     await db.refresh(alert)
+    price_alert_index.add(stock_key(alert.stock_symbol), alert.id, alert.target_price, alert.condition)
     return alert
 
 
@@ -43,6 +45,7 @@ async def delete_stock_alert(alert_id: str, db: AsyncSession = Depends(get_prote
         raise HTTPException(status_code=404, detail="Stock alert not found")
     await db.delete(alert)
     await db.commit()
+    price_alert_index.remove(alert_id)
 
 
 @router.get("/currencies", response_model=List[CurrencyAlertResponse])
@@ -61,6 +64,9 @@ async def create_currency_alert(payload: CurrencyAlertCreate, db: AsyncSession =
     db.add(alert)
     await db.commit()
     await db.refresh(alert)
+    price_alert_index.add(
+        currency_key(alert.base_currency, alert.target_currency), alert.id, alert.target_rate, alert.condition
+    )
     return alert
 
 
@@ -71,6 +77,7 @@ async def delete_currency_alert(alert_id: str, db: AsyncSession = Depends(get_pr
         raise HTTPException(status_code=404, detail="Currency alert not found")
     await db.delete(alert)
     await db.commit()
+    price_alert_index.remove(alert_id)
 
 
 @router.get("/news", response_model=List[NewsAlertResponse])
@@ -1,13 +1,145 @@
-from typing import Optional
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.api.dependencies import require_session_or_admin
-from src.schemas.api import TechnicalAnalysisResponse
+from src.config.settings import settings
+from src.models.database import SessionLocal
+from src.schemas.api import AnalysisBatchRequest, MultiPeriodAnalysisResponse, TechnicalAnalysisResponse
+from src.services.analysis_cache import CachedAnalysis
 from src.services.analysis_service import AnalysisService
+from src.services.analysis_snapshot_service import AnalysisSnapshotService
+from src.utils.server_timing import stage, start_stage_timer
+from src.utils.stage_graph import StageFailed
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 analysis_service = AnalysisService()
+analysis_snapshot_service = AnalysisSnapshotService(analysis_service)
+logger = logging.getLogger(__name__)
+
+
+async def _timed_analysis(
+    pending: Awaitable[Optional[Dict]],
+    response: Response,
+    debug: bool,
+    not_found_detail: str,
+) -> Union[Dict, Response]:
+    timer = start_stage_timer()
+    try:
+        analysis = await pending
+    except StageFailed as exc:
+        logger.warning("Analysis aborted: %s (%s)", exc, timer.header_value())
+        raise HTTPException(
+            status_code=504 if exc.reason == "timeout" else 502,
+            detail=f"Analysis data unavailable: {exc.name}",
+            headers={"Server-Timing": timer.header_value()},
+        ) from exc
+    response.headers["Server-Timing"] = timer.header_value()
+    logger.info("Analysis timing: %s", response.headers["Server-Timing"])
+    if not analysis:
+        raise HTTPException(status_code=404, detail=not_found_detail, headers={"Server-Timing": timer.header_value()})
+    if debug:
+        return {**analysis, "debug": timer.to_dict()}
+    if isinstance(analysis, CachedAnalysis):
+        return Response(
+            content=_analysis_body(analysis),
+            media_type="application/json",
+            headers={"Server-Timing": response.headers["Server-Timing"]},
+        )
+    return analysis
+
+
+# Single-period requests compute medium/long from Yahoo's own weekly/monthly bars, while snapshots resample
+# daily bars, so only the daily horizon is the same computation on both paths. /all resamples on both.
+SINGLE_PERIOD_SNAPSHOTS = ("short",)
+# The snapshot table is an optimization: a slow or unreachable database falls through to live analysis.
+SNAPSHOT_LOOKUP_TIMEOUT = 2.0
+SNAPSHOT_LOOKUP_ERRORS = (SQLAlchemyError, OSError, asyncio.TimeoutError)
+
+
+async def _lookup_snapshots(asset_type: str, symbol: str, periods) -> Dict[str, Dict]:
+    # The session is opened only here, so live requests and snapshot misses never wait on the database pool.
+    async def lookup() -> Dict[str, Dict]:
+        async with SessionLocal() as db:
+            return await analysis_snapshot_service.get_fresh_periods(db, asset_type, symbol, periods)
+
+    try:
+        return await asyncio.wait_for(lookup(), SNAPSHOT_LOOKUP_TIMEOUT)
+    except SNAPSHOT_LOOKUP_ERRORS as exc:
+        logger.warning("Analysis snapshot lookup failed; computing live: %s", exc)
+        return {}
+
+
+async def _snapshot_or_live(
+    asset_type: str,
+    symbol: str,
+    period: str,
+    live: bool,
+    compute: Callable[[], Awaitable[Optional[Dict]]],
+    market: Optional[str] = None,
+) -> Optional[Dict]:
+    # A fresh precomputed snapshot answers without any upstream call; ?live=1 always recomputes.
+    # Snapshots are computed without a market hint, so an explicit market is always served live.
+    if not live and not market and period in SINGLE_PERIOD_SNAPSHOTS:
+        with stage("snapshot", period):
+            snapshot = (await _lookup_snapshots(asset_type, symbol, (period,))).get(period)
+        if snapshot:
+            return snapshot
+    return await compute()
+
+
+async def _all_periods_snapshot_or_live(
+    asset_type: str,
+    symbol: str,
+    live: bool,
+    compute: Callable[[], Awaitable[Optional[Dict]]],
+    market: Optional[str] = None,
+) -> Optional[Dict]:
+    if not live and not market:
+        with stage("snapshot", "all"):
+            snapshots = await _lookup_snapshots(asset_type, symbol, AnalysisService.ALL_PERIODS)
+        if len(snapshots) == len(AnalysisService.ALL_PERIODS):
+            return {"asset_type": asset_type, "symbol": symbol, "analyses": snapshots}
+    return await compute()
+
+
+def _analysis_body(analysis: Dict) -> bytes:
+    # Same encoding FastAPI applies through response_model + JSONResponse; cached results keep theirs.
+    if isinstance(analysis, CachedAnalysis) and analysis.body is not None:
+        return analysis.body
+    payload = jsonable_encoder(TechnicalAnalysisResponse(**analysis))
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    if isinstance(analysis, CachedAnalysis):
+        analysis.body = body
+    return body
+
+
+async def _stream_batch(request: AnalysisBatchRequest) -> AsyncIterator[bytes]:
+    items = [item.dict() for item in request.items]
+    async for result in analysis_service.iter_batch_analysis(items, settings.analysis_batch_concurrency):
+        item = items[result["index"]]
+        analysis = result["analysis"]
+        status = "error" if result["error"] else ("ok" if analysis else "not_found")
+        meta = {
+            "index": result["index"],
+            "symbol": item["symbol"],
+            "period": item["period"],
+            "asset_type": item["asset_type"],
+            "status": status,
+            "error": result["error"],
+            "duration_ms": result["duration_ms"],
+        }
+        line = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if analysis:
+            # Splice the (possibly pre-serialized) analysis body in instead of re-encoding it.
+            line = line[:-1] + b',"analysis":' + _analysis_body(analysis) + b"}"
+        yield line + b"\n"
 
 
 @router.get(
@@ -15,11 +147,53 @@ analysis_service = AnalysisService()
     response_model=TechnicalAnalysisResponse,
     dependencies=[Depends(require_session_or_admin)],
 )
-async def get_stock_analysis(symbol: str, market: Optional[str] = None):
-    analysis = await analysis_service.get_stock_analysis(symbol, market=market, period="short")
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Stock analysis not found")
-    return analysis
+async def get_stock_analysis(
+    symbol: str,
+    response: Response,
+    market: Optional[str] = None,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _snapshot_or_live(
+            "stock",
+            symbol.upper(),
+            "short",
+            live,
+            lambda: analysis_service.get_stock_analysis(symbol, market=market, period="short"),
+            market,
+        ),
+        response,
+        debug,
+        "Stock analysis not found",
+    )
+
+
+# Registered before /stocks/{symbol}/{period} so "all" is not taken as a period name.
+@router.get(
+    "/stocks/{symbol}/all",
+    response_model=MultiPeriodAnalysisResponse,
+    dependencies=[Depends(require_session_or_admin)],
+)
+async def get_stock_analysis_all_periods(
+    symbol: str,
+    response: Response,
+    market: Optional[str] = None,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _all_periods_snapshot_or_live(
+            "stock",
+            symbol.upper(),
+            live,
+            lambda: analysis_service.get_stock_analysis_all_periods(symbol, market=market),
+            market,
+        ),
+        response,
+        debug,
+        "Stock analysis not found",
+    )
 
 
 @router.get(
@@ -27,11 +201,27 @@ async def get_stock_analysis(symbol: str, market: Optional[str] = None):
     response_model=TechnicalAnalysisResponse,
     dependencies=[Depends(require_session_or_admin)],
 )
-async def get_stock_analysis_by_period(symbol: str, period: str, market: Optional[str] = None):
-    analysis = await analysis_service.get_stock_analysis(symbol, market=market, period=period)
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Stock analysis not found")
-    return analysis
+async def get_stock_analysis_by_period(
+    symbol: str,
+    period: str,
+    response: Response,
+    market: Optional[str] = None,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _snapshot_or_live(
+            "stock",
+            symbol.upper(),
+            period.lower(),
+            live,
+            lambda: analysis_service.get_stock_analysis(symbol, market=market, period=period),
+            market,
+        ),
+        response,
+        debug,
+        "Stock analysis not found",
+    )
 
 
 @router.get(
@@ -39,11 +229,50 @@ async def get_stock_analysis_by_period(symbol: str, period: str, market: Optiona
     response_model=TechnicalAnalysisResponse,
     dependencies=[Depends(require_session_or_admin)],
 )
-async def get_currency_analysis(base: str, target: str):
-    analysis = await analysis_service.get_currency_analysis(base, target, period="short")
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Currency analysis not found")
-    return analysis
+async def get_currency_analysis(
+    base: str,
+    target: str,
+    response: Response,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _snapshot_or_live(
+            "currency",
+            f"{base.upper()}/{target.upper()}",
+            "short",
+            live,
+            lambda: analysis_service.get_currency_analysis(base, target, period="short"),
+        ),
+        response,
+        debug,
+        "Currency analysis not found",
+    )
+
+
+@router.get(
+    "/currencies/{base}/{target}/all",
+    response_model=MultiPeriodAnalysisResponse,
+    dependencies=[Depends(require_session_or_admin)],
+)
+async def get_currency_analysis_all_periods(
+    base: str,
+    target: str,
+    response: Response,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _all_periods_snapshot_or_live(
+            "currency",
+            f"{base.upper()}/{target.upper()}",
+            live,
+            lambda: analysis_service.get_currency_analysis_all_periods(base, target),
+        ),
+        response,
+        debug,
+        "Currency analysis not found",
+    )
 
 
 @router.get(
@@ -51,8 +280,29 @@ async def get_currency_analysis(base: str, target: str):
     response_model=TechnicalAnalysisResponse,
     dependencies=[Depends(require_session_or_admin)],
 )
-async def get_currency_analysis_by_period(base: str, target: str, period: str):
-    analysis = await analysis_service.get_currency_analysis(base, target, period=period)
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Currency analysis not found")
-    return analysis
+async def get_currency_analysis_by_period(
+    base: str,
+    target: str,
+    period: str,
+    response: Response,
+    live: bool = False,
+    debug: bool = False,
+):
+    return await _timed_analysis(
+        _snapshot_or_live(
+            "currency",
+            f"{base.upper()}/{target.upper()}",
+            period.lower(),
+            live,
+            lambda: analysis_service.get_currency_analysis(base, target, period=period),
+        ),
+        response,
+        debug,
+        "Currency analysis not found",
+    )
+
+
+@router.post("/batch", dependencies=[Depends(require_session_or_admin)])
+async def analyze_batch(request: AnalysisBatchRequest):
+    """여러 종목/기간 분석을 한 번에 요청하고, 끝나는 순서대로 한 줄씩(NDJSON) 받는다"""
+    return StreamingResponse(_stream_batch(request), media_type="application/x-ndjson")
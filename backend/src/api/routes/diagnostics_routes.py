@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends
+
+from src.api.dependencies import require_admin_key
+from src.config.settings import settings
+from src.utils.loop_monitor import event_loop_monitor
+from src.utils.timing import FUNCTION_LATENCY, UPSTREAM_LATENCY, timing_config
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], dependencies=[Depends(require_admin_key)])
+
+
+@router.get("/event-loop")
+async def get_event_loop_report(top: int = 20):
+    return event_loop_monitor.report(top=top)
+
+
+@router.post("/event-loop/start")
+async def start_event_loop_monitor():
+    event_loop_monitor.start(
+        interval=settings.event_loop_monitor_interval_ms / 1000,
+        slow_threshold=settings.event_loop_slow_callback_ms / 1000,
+    )
+    return event_loop_monitor.report(top=0)
+
+
+@router.post("/event-loop/stop")
+async def stop_event_loop_monitor():
+    await event_loop_monitor.stop()
+    return event_loop_monitor.report(top=0)
+
+
+@router.post("/event-loop/reset")
+async def reset_event_loop_report():
+    event_loop_monitor.reset()
+    return {"status": "ok"}
+
+
+@router.get("/timings")
+async def get_timings():
+    return {
+        "enabled": timing_config.enabled,
+        "sample_rate": timing_config.sample_rate,
+        "functions": FUNCTION_LATENCY.snapshot(),
+        "upstreams": UPSTREAM_LATENCY.snapshot(),
+    }
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_protected_db
+from src.api.routes.analysis_routes import analysis_snapshot_service
 from src.config.settings import settings
-from src.schemas.api import InternalRefreshResponse, InternalRunResponse
+from src.schemas.api import InternalPrecomputeResponse, InternalRefreshResponse, InternalRunResponse
 from src.services.alert_service import AlertService
 from src.services.currency_service import CurrencyService
 from src.services.fx_watchlist_quote_service import FxWatchlistQuoteService
@@ -11,6 +12,7 @@ from src.services.news_service import NewsService
 from src.services.notification_service import NotificationService
 from src.services.stock_service import StockService
 from src.services.watchlist_quote_service import WatchlistQuoteService
+from src.utils.timing import track_job
 
 router = APIRouter(prefix="/internal", tags=["internal"])
 alert_service = AlertService(
@@ -25,17 +27,27 @@ fx_watchlist_quote_service = FxWatchlistQuoteService()
 
 @router.post("/run-alert-checks", response_model=InternalRunResponse)
 async def run_alert_checks(db: AsyncSession = Depends(get_protected_db)):
-    result = await alert_service.run_checks(db)
+    with track_job("run_alert_checks"):
+        result = await alert_service.run_checks(db)
     return {"status": "ok", **result}
 
 
 @router.post("/refresh-watchlist-quotes", response_model=InternalRefreshResponse)
 async def refresh_watchlist_quotes(db: AsyncSession = Depends(get_protected_db)):
-    snapshots = await watchlist_quote_service.refresh_snapshots(db)
+    with track_job("refresh_watchlist_quotes"):
+        snapshots = await watchlist_quote_service.refresh_snapshots(db)
     return {"status": "ok", "refreshed": len(snapshots)}
 
 
 @router.post("/refresh-fx-quotes", response_model=InternalRefreshResponse)
 async def refresh_fx_quotes(db: AsyncSession = Depends(get_protected_db)):
-    snapshots = await fx_watchlist_quote_service.refresh_snapshots(db)
+    with track_job("refresh_fx_quotes"):
+        snapshots = await fx_watchlist_quote_service.refresh_snapshots(db)
     return {"status": "ok", "refreshed": len(snapshots)}
+
+
+@router.post("/precompute-analysis", response_model=InternalPrecomputeResponse)
+async def precompute_analysis(db: AsyncSession = Depends(get_protected_db)):
+    with track_job("precompute_analysis"):
+        result = await analysis_snapshot_service.precompute(db)
+    return {"status": "ok", **result}
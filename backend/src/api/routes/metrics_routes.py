@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies import require_admin_key
+from src.models.database import engine
+from src.utils.metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DB_POOL_CONNECTIONS = registry.gauge("db_pool_connections", "Database pool connections by state", ("state",))
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_admin_key)])
+
+
+def collect_db_pool() -> None:
+    pool = engine.pool
+    for state, reader in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+        method = getattr(pool, reader, None)
+        if callable(method):
+            DB_POOL_CONNECTIONS.labels(state).set(method())
+
+
+registry.register_collector(collect_db_pool)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
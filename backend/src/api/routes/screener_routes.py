@@ -0,0 +1,44 @@
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from src.api.dependencies import require_session_or_admin
+from src.api.routes.analysis_routes import analysis_service
+from src.schemas.api import ScreenerResponse
+from src.services.screener_service import ScreenerService, parse_filters
+from src.utils.server_timing import start_stage_timer
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+# Shares the analysis service's candle store, so screening reuses bars the analysis pages already fetched.
+screener_service = ScreenerService(analysis_service)
+logger = logging.getLogger(__name__)
+
+
+@router.get("", response_model=ScreenerResponse, dependencies=[Depends(require_session_or_admin)])
+async def screen(
+    response: Response,
+    period: str = "short",
+    market: Optional[str] = None,
+    symbols: Optional[str] = Query(None, description="쉼표로 구분한 종목 (비우면 전체 유니버스)"),
+    filters: List[str] = Query([], alias="filter", description="예: final_score>=60, action==buy"),
+    limit: int = Query(50, ge=1, le=500),
+    debug: bool = False,
+):
+    timer = start_stage_timer()
+    try:
+        parsed = parse_filters(filters)
+        result = await screener_service.screen(
+            period=period,
+            filters=parsed,
+            symbols=[symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None,
+            market=market,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    response.headers["Server-Timing"] = timer.header_value()
+    logger.info("Screener timing: %s", response.headers["Server-Timing"])
+    if debug:
+        return {**result, "debug": timer.to_dict()}
+    return result
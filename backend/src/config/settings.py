@@ -25,6 +25,30 @@ class Settings(BaseSettings):
     apns_bundle_id: str = "com.stockalert.app"
     apns_private_key: Optional[str] = None
     apns_use_sandbox: bool = True
+    event_loop_monitor_enabled: bool = False
+    event_loop_monitor_interval_ms: int = 100
+    event_loop_slow_callback_ms: int = 100
+    instrumentation_enabled: bool = True
+    instrumentation_sample_rate: float = 1.0
+    indicator_state_path: Optional[str] = None
+    candle_store_dir: Optional[str] = None
+    candle_refresh_seconds: float = 60.0
+    candle_store_max_entries: int = 1000
+    analysis_cache_ttl: int = 900
+    analysis_cache_price_step: float = 0.001
+    analysis_batch_concurrency: int = 6
+    analysis_snapshot_max_age: int = 900
+    screener_universe_file: Optional[str] = None
+    screener_workers: int = 0
+    screener_candle_max_age: float = 900.0
+    market_board_refresh_seconds: float = 60.0
+    market_board_max_age: float = 180.0
+    news_feed_refresh_seconds: float = 60.0
+    news_ingest_seconds: float = 120.0
+    news_store_max_age: float = 600.0
+    news_store_capacity: int = 2000
+    alert_fetch_concurrency: int = 8
+    quote_event_queue_size: int = 1000
 
     class Config:
         env_file = ".env"
@@ -209,6 +209,35 @@ class NewsArticleResponse(BaseModel):
     url: str
     published: str
     source: str
+    sources: List[str] = Field(default_factory=list)
+
+
+class AnalysisStageTiming(BaseModel):
+    name: str
+    duration_ms: float
+    description: Optional[str] = None
+
+
+class AnalysisDebugInfo(BaseModel):
+    total_ms: float
+    stages: List[AnalysisStageTiming] = Field(default_factory=list)
+
+
+class AnalysisBatchItem(BaseModel):
+    symbol: str = Field(..., min_length=1, max_length=20)
+    period: str = "short"
+    market: Optional[str] = None
+    asset_type: str = Field("stock", regex="^(stock|currency)$")
+
+
+class AnalysisBatchRequest(BaseModel):
+    items: List[AnalysisBatchItem] = Field(..., min_items=1, max_items=60)
+
+
+class AnalysisSnapshotInfo(BaseModel):
+    version: int
+    as_of: datetime
+    computed_at: datetime
 
 
 class TechnicalAnalysisResponse(BaseModel):
@@ -278,6 +307,46 @@ class TechnicalAnalysisResponse(BaseModel):
     timeframe: str
     source: str
     notes: List[str]
+    as_of: Optional[datetime] = None
+    degraded_stages: List[str] = Field(default_factory=list)
+    snapshot: Optional[AnalysisSnapshotInfo] = None
+    debug: Optional[AnalysisDebugInfo] = None
+
+
+class MultiPeriodAnalysisResponse(BaseModel):
+    asset_type: str
+    symbol: str
+    analyses: Dict[str, TechnicalAnalysisResponse]
+    debug: Optional[AnalysisDebugInfo] = None
+
+
+class ScreenerRow(BaseModel):
+    symbol: str
+    yahoo_symbol: str
+    market: str
+    close: float
+    change_percent: float
+    final_score: int
+    trend_score: int
+    momentum_score: int
+    volume_score: int
+    volatility_score: int
+    risk_penalty: int
+    action: str
+    trend: str
+    first_buy: float
+    first_sell: float
+    stop_loss: float
+    last_bar_at: int
+
+
+class ScreenerResponse(BaseModel):
+    period: str
+    universe: int
+    scored: int
+    matched: int
+    results: List[ScreenerRow] = Field(default_factory=list)
+    debug: Optional[AnalysisDebugInfo] = None
 
 
 class InternalRunResponse(BaseModel):
@@ -289,3 +358,10 @@ class InternalRunResponse(BaseModel):
 class InternalRefreshResponse(BaseModel):
     status: str
     refreshed: int
+
+
+class InternalPrecomputeResponse(BaseModel):
+    status: str
+    targets: int
+    refreshed: int
+    failed: int
@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Set, Tuple
+
+InstrumentKey = Tuple[str, str]
+
+
+def stock_key(symbol: str) -> InstrumentKey:
+    return "stock", symbol.strip().upper()
+
+
+def currency_key(base_currency: str, target_currency: str) -> InstrumentKey:
+    return "currency", f"{base_currency.strip().upper()}/{target_currency.strip().upper()}"
+
+
+class ThresholdBook:
+    """
+    종목 하나의 활성 가격 알림을 조건별 정렬 배열로 보관
+
+    above 는 목표가 오름차순이라 현재가보다 낮은 목표가가 앞쪽 구간, below 는 현재가보다 높은 목표가가 뒤쪽 구간이 되므로
+    이분 탐색 한 번으로 발동할 알림 k 개를 O(log n + k)에 찾는다.
+    """
+
+    def __init__(self) -> None:
+        self.targets: Dict[str, List[float]] = {"above": [], "below": []}
+        self.ids: Dict[str, List[str]] = {"above": [], "below": []}
+        self.equal: Dict[float, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids["above"]) + len(self.ids["below"]) + sum(len(ids) for ids in self.equal.values())
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, float, str]]) -> "ThresholdBook":
+        book = cls()
+        sides: Dict[str, List[Tuple[float, str]]] = {"above": [], "below": []}
+        for alert_id, target, condition in entries:
+            if condition in sides:
+                sides[condition].append((target, alert_id))
+            else:
+                book.equal.setdefault(target, set()).add(alert_id)
+        for condition, pairs in sides.items():
+            pairs.sort()
+            book.targets[condition] = [target for target, _ in pairs]
+            book.ids[condition] = [alert_id for _, alert_id in pairs]
+        return book
+
+    def add(self, alert_id: str, target: float, condition: str) -> None:
+        if condition not in self.targets:
+            self.equal.setdefault(target, set()).add(alert_id)
+            return
+        position = bisect_right(self.targets[condition], target)
+        self.targets[condition].insert(position, target)
+        self.ids[condition].insert(position, alert_id)
+
+    def remove(self, alert_id: str, target: float, condition: str) -> None:
+        if condition not in self.targets:
+            ids = self.equal.get(target)
+            if ids is not None:
+                ids.discard(alert_id)
+                if not ids:
+                    del self.equal[target]
+            return
+        targets, ids = self.targets[condition], self.ids[condition]
+        for position in range(bisect_left(targets, target), bisect_right(targets, target)):
+            if ids[position] == alert_id:
+                del targets[position]
+                del ids[position]
+                return
+
+    def crossed(self, price: float) -> List[str]:
+        # Same comparisons as before: above fires on price > target, below on price < target, equal on ==.
+        fired = self.ids["above"][: bisect_left(self.targets["above"], price)]
+        fired.extend(self.ids["below"][bisect_right(self.targets["below"], price) :])
+        fired.extend(self.equal.get(price, ()))
+        return fired
+
+
+class PriceAlertIndex:
+    """
+    (자산 종류, 종목·통화쌍)별 ThresholdBook 묶음
+
+    점검 때 DB 의 활성 알림으로 다시 만들고, 그 사이에는 알림 생성·삭제·발동을 그때그때 반영한다.
+    """
+
+    def __init__(self) -> None:
+        self.books: Dict[InstrumentKey, ThresholdBook] = {}
+        self._entries: Dict[str, Tuple[InstrumentKey, float, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, alert_id: object) -> bool:
+        return alert_id in self._entries
+
+    def instruments(self) -> List[InstrumentKey]:
+        return [key for key, book in self.books.items() if len(book)]
+
+    def rebuild(self, entries: Iterable[Tuple[InstrumentKey, str, float, str]]) -> None:
+        grouped: Dict[InstrumentKey, List[Tuple[str, float, str]]] = {}
+        self._entries = {}
+        for key, alert_id, target, condition in entries:
+            grouped.setdefault(key, []).append((alert_id, float(target), condition))
+            self._entries[alert_id] = (key, float(target), condition)
+        self.books = {key: ThresholdBook.build(book_entries) for key, book_entries in grouped.items()}
+
+    def add(self, key: InstrumentKey, alert_id: str, target: float, condition: str) -> None:
+        self.remove(alert_id)
+        self.books.setdefault(key, ThresholdBook()).add(alert_id, float(target), condition)
+        self._entries[alert_id] = (key, float(target), condition)
+
+    def remove(self, alert_id: str) -> bool:
+        entry = self._entries.pop(alert_id, None)
+        if entry is None:
+            return False
+        key, target, condition = entry
+        self.books[key].remove(alert_id, target, condition)
+        return True
+
+    def crossed(self, key: InstrumentKey, price: float) -> List[str]:
+        book = self.books.get(key)
+        return book.crossed(float(price)) if book is not None else []
+
+
+price_alert_index = PriceAlertIndex()
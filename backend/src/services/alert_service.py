@@ -1,86 +1,273 @@
+import asyncio
+import logging
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.database import CurrencyAlert, NewsAlert, StockAlert
+from src.config.settings import settings
+from src.models.database import CurrencyAlert, NewsAlert, SessionLocal, StockAlert
+from src.services.alert_index import InstrumentKey, PriceAlertIndex, currency_key, price_alert_index, stock_key
+from src.services.news_percolator import NewsPercolator
+from src.services.news_store import StoredArticle
+from src.utils.metrics import registry
+from src.utils.timing import timed
+
+ALERTS_CHECKED = registry.counter("alerts_checked_total", "Alerts evaluated by alert checks", ("alert_type",))
+ALERTS_TRIGGERED = registry.counter("alerts_triggered_total", "Alerts that fired", ("alert_type",))
 
 
 class AlertService:
-    def __init__(self, stock_service, currency_service, news_service, notification_service) -> None:
+    def __init__(
+        self,
+        stock_service,
+        currency_service,
+        news_service,
+        notification_service,
+        price_index: Optional[PriceAlertIndex] = None,
+        session_factory=None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
         self.stock_service = stock_service
         self.currency_service = currency_service
         self.news_service = news_service
         self.notification_service = notification_service
+        self.price_index = price_index if price_index is not None else price_alert_index
+        self.session_factory = session_factory or SessionLocal
+        # Held by scheduled checks and quote events only while evaluating and committing, never across fetches.
+        self._trigger_lock = asyncio.Lock()
+        # One set per check in progress, collecting alerts fired elsewhere while that check was fetching.
+        self._fired_listeners: List[Set[str]] = []
+        # Last news store article already run through the alert percolator.
+        self._news_cursor = -1
 
+    @timed()
     async def run_checks(self, db: AsyncSession) -> Dict[str, int]:
-        checked = 0
-        triggered = 0
+        """
+        활성 알림 전체를 점검하고 조건을 만족한 알림을 발송
 
-        stock_alerts = list((await db.execute(select(StockAlert).where(StockAlert.is_active.is_(True)))).scalars())
-        for alert in stock_alerts:
-            checked += 1
-            quote = await self.stock_service.get_stock_quote(alert.stock_symbol)
-            if quote and self._matches(quote["price"], alert.target_price, alert.condition):
-                alert.is_active = False
-                alert.triggered_at = datetime.now(timezone.utc)
+        종목·환율 알림은 종목(통화쌍)별로 묶어 시세를 한 번씩만 동시에 조회하고,
+        발동한 알림 상태는 한 번에 커밋한 뒤 푸시를 보낸다.
+        """
+        fired_elsewhere: Set[str] = set()
+        self._fired_listeners.append(fired_elsewhere)
+        try:
+            return await self._run_checks(db, fired_elsewhere)
+        finally:
+            self._fired_listeners.remove(fired_elsewhere)
+
+    async def on_quote(self, key: InstrumentKey, price: float, quote: Dict[str, Any]) -> int:
+        """
+        시세 갱신 이벤트 하나로 해당 종목(통화쌍)의 가격 알림만 바로 평가
+
+        색인에서 넘어선 목표가가 없으면 DB 를 건드리지 않고 끝나며, 발동한 알림 수를 돌려준다.
+        """
+        if not self.price_index.crossed(key, price):
+            return 0
+        model = StockAlert if key[0] == "stock" else CurrencyAlert
+        async with self.session_factory() as db:
+            async with self._trigger_lock:
+                # A scheduled check may have fired these while this event waited for the lock.
+                fired = set(self.price_index.crossed(key, price))
+                if not fired:
+                    return 0
+                result = await db.execute(select(model).where(model.id.in_(fired), model.is_active.is_(True)))
+                alerts = [alert for alert in result.scalars() if alert.id in fired]
+                now = datetime.now(timezone.utc)
+                notifications: List[Dict] = []
+                for alert in alerts:
+                    alert.is_active = False
+                    alert.triggered_at = now
+                    if model is StockAlert:
+                        notifications.append(self._stock_notification(alert, quote.get("price", price)))
+                    else:
+                        notifications.append(self._currency_notification(alert, quote))
                 await db.commit()
-                await self.notification_service.send_push_to_all(
-                    db,
-                    title=f"Stock Alert: {alert.stock_symbol}",
-                    body=f"{alert.stock_symbol} hit {quote['price']}",
-                    alert_type="stock",
-                    alert_id=alert.id,
-                    extra_data={"symbol": alert.stock_symbol, "price": quote["price"]},
-                )
-                triggered += 1
+                for alert_id in fired:
+                    self.price_index.remove(alert_id)
+                self._announce_fired(alert.id for alert in alerts)
+            for notification in notifications:
+                await self.notification_service.send_push_to_all(db, **notification)
+                ALERTS_TRIGGERED.labels(notification["alert_type"]).inc()
+        return len(notifications)
 
+    async def load_price_index(self, db: AsyncSession) -> int:
+        """DB 의 활성 종목·환율 알림으로 가격 알림 색인을 채우고 담긴 알림 수를 돌려준다"""
+        stock_alerts = list((await db.execute(select(StockAlert).where(StockAlert.is_active.is_(True)))).scalars())
         currency_alerts = list((await db.execute(select(CurrencyAlert).where(CurrencyAlert.is_active.is_(True)))).scalars())
-        for alert in currency_alerts:
-            checked += 1
-            rate = await self.currency_service.get_exchange_rate(alert.base_currency, alert.target_currency)
-            if rate and self._matches(float(rate["rate"]), alert.target_rate, alert.condition):
-                alert.is_active = False
-                alert.triggered_at = datetime.now(timezone.utc)
-                await db.commit()
-                await self.notification_service.send_push_to_all(
-                    db,
-                    title=f"Currency Alert: {alert.base_currency}/{alert.target_currency}",
-                    body=f"{alert.base_currency}/{alert.target_currency} hit {rate['rate']}",
-                    alert_type="currency",
-                    alert_id=alert.id,
-                    extra_data=rate,
-                )
-                triggered += 1
+        self._rebuild_price_index(stock_alerts, currency_alerts)
+        return len(self.price_index)
 
+    async def _run_checks(self, db: AsyncSession, fired_elsewhere: Set[str]) -> Dict[str, int]:
+        stock_alerts = list((await db.execute(select(StockAlert).where(StockAlert.is_active.is_(True)))).scalars())
+        currency_alerts = list((await db.execute(select(CurrencyAlert).where(CurrencyAlert.is_active.is_(True)))).scalars())
         news_alerts = list((await db.execute(select(NewsAlert).where(NewsAlert.is_active.is_(True)))).scalars())
-        for alert in news_alerts:
-            checked += 1
-            articles = await self.news_service.get_latest_news(query=alert.keywords, limit=3)
-            alert.last_checked = datetime.now(timezone.utc)
-            if articles:
+
+        semaphore = asyncio.Semaphore(max(1, settings.alert_fetch_concurrency))
+        quotes, rates = await asyncio.gather(
+            self._fetch_instruments(
+                (self._stock_key(alert) for alert in stock_alerts),
+                lambda symbol: self.stock_service.get_stock_quote(symbol),
+                semaphore,
+            ),
+            self._fetch_instruments(
+                (self._pair_key(alert) for alert in currency_alerts),
+                lambda pair: self.currency_service.get_exchange_rate(*pair),
+                semaphore,
+            ),
+        )
+
+        if news_alerts:
+            await self.news_service.ensure_fresh()
+
+        notifications: List[Dict] = []
+        async with self._trigger_lock:
+            # Quote events (or an overlapping check) may have fired some of these while the quotes were fetched.
+            stock_alerts = [alert for alert in stock_alerts if alert.id not in fired_elsewhere]
+            currency_alerts = [alert for alert in currency_alerts if alert.id not in fired_elsewhere]
+            news_alerts = [alert for alert in news_alerts if alert.id not in fired_elsewhere]
+            now = datetime.now(timezone.utc)
+
+            # Rebuilt from the database on every check; between checks the alert routes and quote events keep it current.
+            self._rebuild_price_index(stock_alerts, currency_alerts)
+            fired: Set[str] = set()
+            for symbol, quote in quotes.items():
+                if quote:
+                    fired.update(self.price_index.crossed(stock_key(symbol), quote["price"]))
+            for pair, rate in rates.items():
+                if rate:
+                    fired.update(self.price_index.crossed(currency_key(*pair), float(rate["rate"])))
+            ALERTS_CHECKED.labels("stock").inc(len(stock_alerts))
+            ALERTS_CHECKED.labels("currency").inc(len(currency_alerts))
+
+            for alert in stock_alerts:
+                if alert.id not in fired:
+                    continue
+                quote = quotes[self._stock_key(alert)]
                 alert.is_active = False
-                alert.triggered_at = datetime.now(timezone.utc)
-                await db.commit()
-                await self.notification_service.send_push_to_all(
-                    db,
-                    title=f"News Alert: {alert.keywords}",
-                    body=articles[0]["title"],
-                    alert_type="news",
-                    alert_id=alert.id,
-                    extra_data={"keywords": alert.keywords, "article_count": len(articles)},
-                )
-                triggered += 1
-            else:
-                await db.commit()
+                alert.triggered_at = now
+                self.price_index.remove(alert.id)
+                notifications.append(self._stock_notification(alert, quote["price"]))
 
-        return {"checked": checked, "triggered": triggered}
+            for alert in currency_alerts:
+                if alert.id not in fired:
+                    continue
+                rate = rates[self._pair_key(alert)]
+                alert.is_active = False
+                alert.triggered_at = now
+                self.price_index.remove(alert.id)
+                notifications.append(self._currency_notification(alert, rate))
+
+            if news_alerts:
+                matches = self._percolate_news(news_alerts)
+                for alert in news_alerts:
+                    ALERTS_CHECKED.labels("news").inc()
+                    alert.last_checked = now
+                    articles = matches.get(alert.id)
+                    if articles:
+                        alert.is_active = False
+                        alert.triggered_at = now
+                        notifications.append(
+                            {
+                                "title": f"News Alert: {alert.keywords}",
+                                "body": articles[0]["title"],
+                                "alert_type": "news",
+                                "alert_id": alert.id,
+                                "extra_data": {"keywords": alert.keywords, "article_count": len(articles)},
+                            }
+                        )
+
+            # Persist every state change before any push, so a failed send never re-fires an alert.
+            await db.commit()
+            self._announce_fired(notification["alert_id"] for notification in notifications)
+        for notification in notifications:
+            await self.notification_service.send_push_to_all(db, **notification)
+            ALERTS_TRIGGERED.labels(notification["alert_type"]).inc()
+
+        return {"checked": len(stock_alerts) + len(currency_alerts) + len(news_alerts), "triggered": len(notifications)}
+
+    async def _fetch_instruments(
+        self, keys: Iterable[Hashable], fetch: Callable[[Any], Awaitable[Optional[Dict]]], semaphore: asyncio.Semaphore
+    ) -> Dict[Hashable, Optional[Dict]]:
+        unique = list(dict.fromkeys(keys))
+
+        async def run(key: Hashable) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await fetch(key)
+                except Exception as exc:
+                    self.logger.warning("Alert price fetch failed for %s: %s", key, exc)
+                    return None
+
+        return dict(zip(unique, await asyncio.gather(*(run(key) for key in unique))))
+
+    def _announce_fired(self, alert_ids: Iterable[str]) -> None:
+        alert_ids = list(alert_ids)
+        for fired_elsewhere in self._fired_listeners:
+            fired_elsewhere.update(alert_ids)
+
+    def _rebuild_price_index(self, stock_alerts: List[StockAlert], currency_alerts: List[CurrencyAlert]) -> None:
+        self.price_index.rebuild(
+            [(stock_key(alert.stock_symbol), alert.id, alert.target_price, alert.condition) for alert in stock_alerts]
+            + [
+                (currency_key(alert.base_currency, alert.target_currency), alert.id, alert.target_rate, alert.condition)
+                for alert in currency_alerts
+            ]
+        )
 
     @staticmethod
-    def _matches(current: float, target: float, condition: str) -> bool:
-        if condition == "above":
-            return current > target
-        if condition == "below":
-            return current < target
-        return current == target
+    def _stock_notification(alert: StockAlert, price: Any) -> Dict:
+        return {
+            "title": f"Stock Alert: {alert.stock_symbol}",
+            "body": f"{alert.stock_symbol} hit {price}",
+            "alert_type": "stock",
+            "alert_id": alert.id,
+            "extra_data": {"symbol": alert.stock_symbol, "price": price},
+        }
+
+    @staticmethod
+    def _currency_notification(alert: CurrencyAlert, rate: Dict) -> Dict:
+        return {
+            "title": f"Currency Alert: {alert.base_currency}/{alert.target_currency}",
+            "body": f"{alert.base_currency}/{alert.target_currency} hit {rate['rate']}",
+            "alert_type": "currency",
+            "alert_id": alert.id,
+            "extra_data": rate,
+        }
+
+    @staticmethod
+    def _stock_key(alert: StockAlert) -> str:
+        return alert.stock_symbol.strip().upper()
+
+    @staticmethod
+    def _pair_key(alert: CurrencyAlert) -> Tuple[str, str]:
+        return alert.base_currency.strip().upper(), alert.target_currency.strip().upper()
+
+    def _percolate_news(self, alerts: List[NewsAlert]) -> Dict[str, List[Dict]]:
+        """
+        이전 점검 뒤에 들어온 기사만 전체 알림 키워드 매처에 한 번씩 통과시킨다
+
+        한 번도 점검하지 않은 알림만 저장소 전체를 한 번 검색해 이미 들어와 있던 기사를 확인한다.
+        """
+        store = self.news_service.store
+        percolator = NewsPercolator((alert.id, alert.keywords) for alert in alerts if alert.last_checked is not None)
+        new_articles = store.articles_since(self._news_cursor)
+        hits: Dict[str, List[StoredArticle]] = {}
+        if percolator:
+            for _, stored in new_articles:
+                for alert_id in percolator.match(stored.tokens, stored.text):
+                    hits.setdefault(alert_id, []).append(stored)
+        if new_articles:
+            self._news_cursor = new_articles[-1][0]
+
+        matches = {
+            alert_id: [store.public_article(stored) for stored in sorted(found, key=lambda stored: stored.recency)[:3]]
+            for alert_id, found in hits.items()
+        }
+        for alert in alerts:
+            if alert.last_checked is None:
+                articles = store.search(alert.keywords, limit=3)
+                if articles:
+                    matches[alert.id] = articles
+        return matches
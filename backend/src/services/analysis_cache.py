@@ -0,0 +1,59 @@
+import math
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from src.services.candle_series import CandleSeries
+from src.utils.metrics import record_cache_lookup
+
+
+class CachedAnalysis(dict):
+    """캐시에 보관된 분석 결과. 최초 응답 때 직렬화한 JSON 본문을 body에 두고 재사용한다."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, analysis: Dict) -> None:
+        super().__init__(analysis)
+        self.body: Optional[bytes] = None
+
+
+class AnalysisResultCache:
+    """
+    (자산, 심볼, 기간)별 최신 분석 결과 캐시
+
+    마지막 봉 시각, 현재가 구간, 시장 맥락 버전이 같을 때만 적중한다. 입력이 바뀌면 지문이 달라져 덮어쓴다.
+    펀더멘털처럼 지문에 없는 입력은 ttl_seconds로 갱신 주기를 제한한다.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, price_step: float = 0.001) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.price_step = price_step
+        self.entries: Dict[Tuple[str, str, str], Dict[str, object]] = {}
+
+    def price_bucket(self, price: Optional[float]) -> Optional[int]:
+        # Log-scale buckets: every bucket spans the same relative move (price_step) at any price level.
+        if price is None or price <= 0 or self.price_step <= 0:
+            return None
+        return math.floor(math.log(price) / math.log1p(self.price_step))
+
+    def fingerprint(
+        self,
+        source: str,
+        history: CandleSeries,
+        live_price: Optional[float],
+        news_context: Dict,
+    ) -> Tuple[Hashable, ...]:
+        price = live_price if live_price is not None else float(history.close[-1])
+        return (source, int(history.timestamp[-1]), self.price_bucket(price), news_context.get("version"))
+
+    def get(self, slot: Tuple[str, str, str], fingerprint: Tuple[Hashable, ...]) -> Optional[CachedAnalysis]:
+        entry = self.entries.get(slot)
+        if not entry or entry["fingerprint"] != fingerprint or time.time() > float(entry["expires_at"]):
+            record_cache_lookup("analysis_result", False)
+            return None
+        record_cache_lookup("analysis_result", True)
+        return entry["data"]
+
+    def put(self, slot: Tuple[str, str, str], fingerprint: Tuple[Hashable, ...], analysis: Dict) -> CachedAnalysis:
+        cached = CachedAnalysis(analysis)
+        self.entries[slot] = {"fingerprint": fingerprint, "data": cached, "expires_at": time.time() + self.ttl_seconds}
+        return cached
@@ -1,16 +1,27 @@
+import asyncio
 import logging
 import re
-from datetime import datetime
-from statistics import mean, pstdev
-from typing import Dict, List, Optional, Tuple
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 from bs4 import BeautifulSoup
 
 from src.config.settings import settings
+from src.services.analysis_cache import AnalysisResultCache
+from src.services.candle_resampler import exchange_timezone, resample
+from src.services.candle_series import CandleSeries
+from src.services.candle_store import CandleStore, range_to_seconds
+from src.services.indicator_engine import IndicatorEngine
+from src.services.indicator_state import IndicatorStateStore
 from src.services.market_context_service import MarketContextService
+from src.services.news_lexicon import news_lexicon
 from src.services.news_service import NewsService
 from src.services.stock_service import StockService
+from src.utils.server_timing import stage
+from src.utils.stage_graph import StageFailed, StageGraph
+from src.utils.timing import timed
 
 
 class AnalysisService:
@@ -19,108 +30,402 @@ class AnalysisService:
         self.news_service = NewsService()
         self.stock_service = StockService()
         self.market_context_service = MarketContextService(self.news_service)
-
+        self.indicator_engine = IndicatorEngine()
+        self.indicator_states = IndicatorStateStore()
+        self.candle_store = CandleStore(
+            settings.candle_store_dir,
+            refresh_seconds=settings.candle_refresh_seconds,
+            max_entries=settings.candle_store_max_entries,
+        )
+        self.result_cache = AnalysisResultCache(settings.analysis_cache_ttl, settings.analysis_cache_price_step)
+
+    # Per-stage budgets in seconds. Optional stages that run over fall back to a neutral default.
+    STAGE_TIMEOUTS = {
+        "quote": 6.0,
+        "resolve_symbol": 12.0,
+        "history": 12.0,
+        "investor_flow": 6.0,
+        "fundamentals": 6.0,
+        "market_context": 8.0,
+    }
+
+    # Probing .KS/.KQ candidates gives up after this long and uses the first candidate, well inside the
+    # resolve_symbol budget, so a slow miss degrades to the baseline guess instead of failing the analysis.
+    RESOLVE_PROBE_BUDGET = 8.0
+
+    # Horizons an "all periods" request derives from one daily history (intraday needs its own 30m bars).
+    ALL_PERIODS = ("short", "medium", "long")
+
+    @timed()
     async def get_stock_analysis(self, symbol: str, market: Optional[str] = None, period: str = "short") -> Optional[Dict]:
-        quote = await self.stock_service.get_stock_quote(symbol)
-        stock_name = str(quote.get("name") or symbol.upper()) if quote else symbol.upper()
-        stock_market = market or (quote.get("market") if quote else None)
-        price_unit = str(quote.get("currency") or ("USD" if not symbol.isdigit() else "KRW")) if quote else ("USD" if not symbol.isdigit() else "KRW")
-        live_price = float(quote.get("price")) if quote and quote.get("price") is not None else None
         analysis_window = self._get_analysis_window(period)
-        fundamentals = None
 
-        yahoo_symbol = await self._resolve_stock_symbol(symbol, stock_market)
-        raw_history = await self._fetch_history(
-            yahoo_symbol,
-            range_value=analysis_window["range"],
-            interval_value=analysis_window["interval"],
+        async def load_history(yahoo_symbol: str) -> CandleSeries:
+            return await self._load_history(yahoo_symbol, analysis_window, period)
+
+        graph, results = await self._run_stock_stages(
+            symbol,
+            market,
+            load_history,
+            with_investor_flow=(period or "").lower() == "intraday",
         )
-        history = self._normalize_history_for_period(raw_history, period)
-        if not history:
+        if not results["history"]:
             return None
-        if symbol.isdigit():
-            if (period or "").lower() == "intraday":
-                investor_flow = await self._fetch_intraday_live_flow(symbol)
-            else:
-                investor_flow = None
-            market_scope = "domestic"
-        else:
-            investor_flow = None
-            market_scope = "global"
-            fundamentals = await self.stock_service.get_stock_fundamentals(symbol)
-        news_context = await self.market_context_service.build_context(
-            asset_type="stock",
-            symbol=symbol.upper(),
-            name=stock_name,
-            market_scope=market_scope,
+        return self._score_stock(symbol, graph, results, results["history"], period)
+
+    @timed()
+    async def get_stock_analysis_all_periods(self, symbol: str, market: Optional[str] = None) -> Optional[Dict]:
+        graph, results = await self._run_stock_stages(symbol, market, self._load_daily_history)
+        analyses = {}
+        for period, history in self._derive_period_histories(results["history"], results["resolve_symbol"]).items():
+            analysis = self._score_stock(symbol, graph, results, history, period, resampled=True)
+            if analysis:
+                analyses[period] = analysis
+        return self._all_periods_response("stock", symbol.upper(), analyses)
+
+    @timed()
+    async def get_currency_analysis(self, base: str, target: str, period: str = "short") -> Optional[Dict]:
+        pair = f"{base.upper()}{target.upper()}=X"
+        analysis_window = self._get_analysis_window(period)
+
+        async def load_history(yahoo_symbol: str) -> CandleSeries:
+            return await self._load_history(yahoo_symbol, analysis_window, period)
+
+        graph, results = await self._run_currency_stages(base, target, load_history)
+        if not results["history"]:
+            return None
+        return self._score_currency(pair, target, graph, results, results["history"], period)
+
+    @timed()
+    async def get_currency_analysis_all_periods(self, base: str, target: str) -> Optional[Dict]:
+        pair = f"{base.upper()}{target.upper()}=X"
+        graph, results = await self._run_currency_stages(base, target, self._load_daily_history)
+        analyses = {}
+        for period, history in self._derive_period_histories(results["history"], pair).items():
+            analysis = self._score_currency(pair, target, graph, results, history, period, resampled=True)
+            if analysis:
+                analyses[period] = analysis
+        return self._all_periods_response("currency", f"{base.upper()}/{target.upper()}", analyses)
+
+    async def _run_stock_stages(
+        self,
+        symbol: str,
+        market: Optional[str],
+        load_history: Callable[[str], Awaitable[CandleSeries]],
+        with_investor_flow: bool = False,
+    ) -> Tuple[StageGraph, Dict]:
+        normalized = symbol.upper()
+        is_domestic = symbol.isdigit()
+
+        async def load_quote() -> Optional[Dict]:
+            return await self.stock_service.get_stock_quote(symbol)
+
+        async def resolve_symbol(quote: Optional[Dict] = None) -> str:
+            return await self._resolve_stock_symbol(symbol, market or (quote.get("market") if quote else None))
+
+        async def load_resolved_history(resolve_symbol: str) -> CandleSeries:
+            return await load_history(resolve_symbol)
+
+        async def load_context(quote: Optional[Dict]) -> Dict:
+            return await self.market_context_service.build_context(
+                asset_type="stock",
+                symbol=normalized,
+                name=self._stock_name(symbol, quote),
+                market_scope="domestic" if is_domestic else "global",
+            )
+
+        # Only symbol resolution of a domestic code without an explicit market needs the quote first.
+        graph = StageGraph()
+        graph.add("quote", load_quote, timeout=self.STAGE_TIMEOUTS["quote"], required=False)
+        graph.add(
+            "resolve_symbol",
+            resolve_symbol,
+            depends=("quote",) if is_domestic and not market else (),
+            timeout=self.STAGE_TIMEOUTS["resolve_symbol"],
         )
-        return self._build_analysis(
-            history=history,
-            asset_type="stock",
-            symbol=symbol.upper(),
-            name=stock_name,
-            price_unit=price_unit,
-            source=f"yahoo_chart:{yahoo_symbol}",
-            timeframe=analysis_window["label"],
-            period=period,
-            investor_flow=investor_flow,
-            news_context=news_context,
-            live_price=live_price,
-            fundamentals=fundamentals,
+        graph.add(
+            "history",
+            load_resolved_history,
+            depends=("resolve_symbol",),
+            timeout=self.STAGE_TIMEOUTS["history"],
+            description=lambda inputs: inputs["resolve_symbol"],
+        )
+        if is_domestic and with_investor_flow:
+            graph.add(
+                "investor_flow",
+                lambda: self._fetch_intraday_live_flow(symbol),
+                timeout=self.STAGE_TIMEOUTS["investor_flow"],
+                required=False,
+            )
+        if not is_domestic:
+            graph.add(
+                "fundamentals",
+                lambda: self.stock_service.get_stock_fundamentals(symbol),
+                timeout=self.STAGE_TIMEOUTS["fundamentals"],
+                required=False,
+            )
+        graph.add(
+            "market_context",
+            load_context,
+            depends=("quote",),
+            timeout=self.STAGE_TIMEOUTS["market_context"],
+            required=False,
+            default={},
         )
+        return graph, await graph.run()
 
-    async def get_currency_analysis(self, base: str, target: str, period: str = "short") -> Optional[Dict]:
+    async def _run_currency_stages(
+        self,
+        base: str,
+        target: str,
+        load_history: Callable[[str], Awaitable[CandleSeries]],
+    ) -> Tuple[StageGraph, Dict]:
         pair = f"{base.upper()}{target.upper()}=X"
-        analysis_window = self._get_analysis_window(period)
+        display_symbol = f"{base.upper()}/{target.upper()}"
+
+        async def load_context() -> Dict:
+            return await self.market_context_service.build_context(
+                asset_type="currency",
+                symbol=display_symbol,
+                name=display_symbol,
+            )
+
+        graph = StageGraph()
+        graph.add("history", lambda: load_history(pair), timeout=self.STAGE_TIMEOUTS["history"], description=pair)
+        graph.add("market_context", load_context, timeout=self.STAGE_TIMEOUTS["market_context"], required=False, default={})
+        return graph, await graph.run()
+
+    def _score_stock(
+        self,
+        symbol: str,
+        graph: StageGraph,
+        results: Dict,
+        history: CandleSeries,
+        period: str,
+        resampled: bool = False,
+    ) -> Optional[Dict]:
+        normalized = symbol.upper()
+        is_domestic = symbol.isdigit()
+        quote = results["quote"]
+        yahoo_symbol = results["resolve_symbol"]
+        price_unit = str(quote.get("currency") or ("USD" if not is_domestic else "KRW")) if quote else ("USD" if not is_domestic else "KRW")
+        live_price = float(quote.get("price")) if quote and quote.get("price") is not None else None
+        investor_flow = results.get("investor_flow")
+        indicator_interval = self._get_indicator_interval(period, resampled)
+        cache_slot = ("stock", normalized, f"{period}/{indicator_interval}")
+        fingerprint = self.result_cache.fingerprint(yahoo_symbol, history, live_price, results["market_context"])
+        with stage("result_cache", period):
+            cached = self.result_cache.get(cache_slot, fingerprint)
+        if cached is not None:
+            return cached
+        with stage("scoring", period):
+            analysis = self._build_analysis(
+                history=history,
+                asset_type="stock",
+                symbol=normalized,
+                name=self._stock_name(symbol, quote),
+                price_unit=price_unit,
+                source=f"yahoo_chart:{yahoo_symbol}",
+                timeframe=self._get_analysis_window(period)["label"],
+                period=period,
+                investor_flow=investor_flow,
+                news_context=results["market_context"],
+                live_price=live_price,
+                fundamentals=results.get("fundamentals"),
+                indicator_key=(yahoo_symbol, indicator_interval),
+            )
+        # Investor flow is not part of the fingerprint, so analyses that use it are never cached.
+        return self._finish_analysis(analysis, graph, cache_slot, fingerprint, cacheable=investor_flow is None)
+
+    def _score_currency(
+        self,
+        pair: str,
+        target: str,
+        graph: StageGraph,
+        results: Dict,
+        history: CandleSeries,
+        period: str,
+        resampled: bool = False,
+    ) -> Optional[Dict]:
+        display_symbol = f"{pair[:3]}/{pair[3:6]}"
+        indicator_interval = self._get_indicator_interval(period, resampled)
+        cache_slot = ("currency", display_symbol, f"{period}/{indicator_interval}")
+        fingerprint = self.result_cache.fingerprint(pair, history, None, results["market_context"])
+        with stage("result_cache", period):
+            cached = self.result_cache.get(cache_slot, fingerprint)
+        if cached is not None:
+            return cached
+        with stage("scoring", period):
+            analysis = self._build_analysis(
+                history=history,
+                asset_type="currency",
+                symbol=display_symbol,
+                name=display_symbol,
+                price_unit=target.upper(),
+                source=f"yahoo_chart:{pair}",
+                timeframe=self._get_analysis_window(period)["label"],
+                period=period,
+                investor_flow=None,
+                news_context=results["market_context"],
+                indicator_key=(pair, indicator_interval),
+            )
+        return self._finish_analysis(analysis, graph, cache_slot, fingerprint)
+
+    async def _load_daily_history(self, yahoo_symbol: str) -> CandleSeries:
+        # The longest horizon decides the range; shorter ones are trimmed views of the same bars.
+        return await self._fetch_history(yahoo_symbol, range_value=self._get_analysis_window("long")["range"], interval_value="1d")
+
+    def _derive_period_histories(self, daily: CandleSeries, yahoo_symbol: str) -> Dict[str, CandleSeries]:
+        if not daily:
+            return {}
+        now = time.time()
+        return {period: self._derive_period_history(daily, yahoo_symbol, period, now) for period in self.ALL_PERIODS}
+
+    def _derive_period_history(self, daily: CandleSeries, yahoo_symbol: str, period: str, now: float) -> CandleSeries:
+        window = self._get_analysis_window(period)
+        recent = daily.since(now - range_to_seconds(window["range"]))
+        interval = self._get_indicator_interval(period)
+        return recent if interval == "1d" else resample(recent, interval, exchange_timezone(yahoo_symbol))
+
+    @staticmethod
+    def _all_periods_response(asset_type: str, symbol: str, analyses: Dict[str, Dict]) -> Optional[Dict]:
+        if not analyses:
+            return None
+        return {"asset_type": asset_type, "symbol": symbol, "analyses": analyses}
+
+    async def iter_batch_analysis(self, requests: List[Dict[str, Optional[str]]], concurrency: int) -> AsyncIterator[Dict]:
+        """
+        여러 종목/기간 분석을 동시 실행 수를 제한해 돌리고 끝나는 순서대로 돌려준다
+
+        시장 맥락의 거시 입력은 범위별로 공유되므로 종목 수와 무관하게 한 번만 조회된다.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(index: int, request: Dict[str, Optional[str]]) -> Dict:
+            async with semaphore:
+                started = time.perf_counter()
+                analysis: Optional[Dict] = None
+                error: Optional[str] = None
+                try:
+                    analysis = await self._analyze_request(request)
+                except StageFailed as exc:
+                    error = f"Analysis data unavailable: {exc.name}"
+                except ValueError as exc:
+                    error = str(exc)
+                except Exception as exc:
+                    self.logger.exception("Batch analysis failed for %s: %s", request.get("symbol"), exc)
+                    error = "Analysis failed"
+                return {
+                    "index": index,
+                    "analysis": analysis,
+                    "error": error,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                }
+
+        tasks = [asyncio.create_task(run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # The consumer may stop early (client disconnected); don't leave analyses running.
+            for task in tasks:
+                task.cancel()
+
+    async def _analyze_request(self, request: Dict[str, Optional[str]]) -> Optional[Dict]:
+        symbol = str(request.get("symbol") or "").strip()
+        period = str(request.get("period") or "short")
+        if request.get("asset_type") == "currency":
+            base, target = self._split_currency_pair(symbol)
+            return await self.get_currency_analysis(base, target, period=period)
+        return await self.get_stock_analysis(symbol, market=request.get("market"), period=period)
+
+    @staticmethod
+    def _split_currency_pair(pair: str) -> Tuple[str, str]:
+        normalized = pair.replace("-", "/").upper()
+        if "/" in normalized:
+            base, _, target = normalized.partition("/")
+        else:
+            base, target = normalized[:3], normalized[3:]
+        if len(base) != 3 or len(target) != 3 or not (base + target).isalpha():
+            raise ValueError(f"Invalid currency pair: {pair}")
+        return base, target
+
+    async def _load_history(self, yahoo_symbol: str, analysis_window: Dict[str, str], period: str) -> CandleSeries:
         raw_history = await self._fetch_history(
-            pair,
+            yahoo_symbol,
             range_value=analysis_window["range"],
             interval_value=analysis_window["interval"],
         )
-        history = self._normalize_history_for_period(raw_history, period)
-        if not history:
-            return None
-        news_context = await self.market_context_service.build_context(
-            asset_type="currency",
-            symbol=f"{base.upper()}/{target.upper()}",
-            name=f"{base.upper()}/{target.upper()}",
-        )
-        return self._build_analysis(
-            history=history,
-            asset_type="currency",
-            symbol=f"{base.upper()}/{target.upper()}",
-            name=f"{base.upper()}/{target.upper()}",
-            price_unit=target.upper(),
-            source=f"yahoo_chart:{pair}",
-            timeframe=analysis_window["label"],
-            period=period,
-            investor_flow=None,
-            news_context=news_context,
-        )
+        return self._normalize_history_for_period(raw_history, period, exchange_timezone(yahoo_symbol))
 
-    async def _resolve_stock_symbol(self, symbol: str, market: Optional[str]) -> str:
+    @staticmethod
+    def _stock_name(symbol: str, quote: Optional[Dict]) -> str:
+        return str(quote.get("name") or symbol.upper()) if quote else symbol.upper()
+
+    def _finish_analysis(
+        self,
+        analysis: Optional[Dict],
+        graph: StageGraph,
+        cache_slot: Tuple[str, str, str],
+        fingerprint: Tuple,
+        cacheable: bool = True,
+    ) -> Optional[Dict]:
+        if not analysis:
+            return analysis
+        # Results built from fallback inputs are returned as-is and never cached.
+        if graph.degraded:
+            analysis["degraded_stages"] = list(graph.degraded)
+            return analysis
+        if not cacheable:
+            return analysis
+        return self.result_cache.put(cache_slot, fingerprint, analysis)
+
+    @staticmethod
+    def _symbol_candidates(symbol: str, market: Optional[str]) -> List[str]:
         normalized = symbol.upper()
         if not normalized.isdigit():
-            return normalized
-
-        candidates: List[str]
+            return [normalized]
         if market == "KOSDAQ":
-            candidates = [f"{normalized}.KQ", f"{normalized}.KS"]
-        elif market == "KOSPI":
-            candidates = [f"{normalized}.KS", f"{normalized}.KQ"]
-        else:
-            candidates = [f"{normalized}.KS", f"{normalized}.KQ"]
+            return [f"{normalized}.KQ", f"{normalized}.KS"]
+        return [f"{normalized}.KS", f"{normalized}.KQ"]
+
+    async def _resolve_stock_symbol(self, symbol: str, market: Optional[str], max_age: Optional[float] = None) -> str:
+        candidates = self._symbol_candidates(symbol, market)
+        if len(candidates) == 1:
+            return candidates[0]
+        normalized = symbol.upper()
 
-        for candidate in candidates:
-            history = await self._fetch_history(candidate, range_value="1mo", interval_value="1d")
-            if history:
-                return candidate
-        return candidates[0]
+        async def probe() -> str:
+            for candidate in candidates:
+                history = await self._fetch_history(candidate, range_value="1mo", interval_value="1d", max_age=max_age)
+                if history:
+                    return candidate
+            return candidates[0]
 
-    async def _fetch_history(self, yahoo_symbol: str, range_value: str = "6mo", interval_value: str = "1d") -> List[Dict[str, float]]:
+        try:
+            return await asyncio.wait_for(probe(), self.RESOLVE_PROBE_BUDGET)
+        except asyncio.TimeoutError:
+            self.logger.warning("Symbol resolution timed out for %s; using %s", normalized, candidates[0])
+            return candidates[0]
+
+    async def _fetch_history(
+        self, yahoo_symbol: str, range_value: str = "6mo", interval_value: str = "1d", max_age: Optional[float] = None
+    ) -> CandleSeries:
+        return await self.candle_store.get_history(yahoo_symbol, interval_value, range_value, self._download_history, max_age=max_age)
+
+    @timed(upstream="yahoo_chart")
+    async def _download_history(
+        self,
+        yahoo_symbol: str,
+        interval_value: str,
+        range_value: Optional[str] = None,
+        period1: Optional[int] = None,
+        period2: Optional[int] = None,
+    ) -> CandleSeries:
+        window = f"period1={period1}&period2={period2}" if period1 is not None else f"range={range_value}"
         url = (
             "https://query1.finance.yahoo.com/v8/finance/chart/"
-            f"{yahoo_symbol}?range={range_value}&interval={interval_value}&includePrePost=false"
+            f"{yahoo_symbol}?{window}&interval={interval_value}&includePrePost=false"
         )
         timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
 
@@ -129,40 +434,25 @@ class AnalysisService:
                 async with session.get(url, headers={"User-Agent": "Mozilla/5.0"}) as response:
                     if response.status != 200:
                         self.logger.warning("Analysis history fetch failed: %s %s", yahoo_symbol, response.status)
-                        return []
+                        return CandleSeries.empty()
                     payload = await response.json()
         except Exception as exc:
             self.logger.warning("Analysis history fetch error for %s: %s", yahoo_symbol, exc)
-            return []
+            return CandleSeries.empty()
 
         result = (((payload or {}).get("chart") or {}).get("result") or [None])[0]
         if not result:
-            return []
+            return CandleSeries.empty()
 
         quote = (((result.get("indicators") or {}).get("quote") or [None])[0]) or {}
-        closes = quote.get("close") or []
-        highs = quote.get("high") or []
-        lows = quote.get("low") or []
-        opens = quote.get("open") or []
-        volumes = quote.get("volume") or []
-
-        candles: List[Dict[str, float]] = []
-        timestamps = result.get("timestamp") or []
-
-        for timestamp, open_, high, low, close, volume in zip(timestamps, opens, highs, lows, closes, volumes):
-            if None in (open_, high, low, close):
-                continue
-            candles.append(
-                {
-                    "timestamp": int(timestamp),
-                    "open": float(open_),
-                    "high": float(high),
-                    "low": float(low),
-                    "close": float(close),
-                    "volume": float(volume) if volume is not None else 0.0,
-                }
-            )
-        return candles
+        return CandleSeries.from_columns(
+            result.get("timestamp") or [],
+            quote.get("open") or [],
+            quote.get("high") or [],
+            quote.get("low") or [],
+            quote.get("close") or [],
+            quote.get("volume") or [],
+        )
 
     @staticmethod
     def _get_analysis_window(period: str) -> Dict[str, str]:
@@ -175,6 +465,14 @@ class AnalysisService:
         }
         return mapping.get(normalized, mapping["short"])
 
+    def _get_indicator_interval(self, period: str, resampled: bool = False) -> str:
+        # Long-period history is re-aggregated into yearly candles before the indicators run.
+        interval = "1y" if (period or "").lower() == "long" else self._get_analysis_window(period)["interval"]
+        # Bars resampled from daily history are stamped differently from Yahoo's own, so keep their state apart.
+        if resampled and interval != "1d":
+            return f"1d>{interval}"
+        return interval
+
     @staticmethod
     def _get_strategy_profile(period: str) -> Dict[str, float]:
         normalized = (period or "short").lower()
@@ -277,41 +575,17 @@ class AnalysisService:
         }
         return profiles.get(normalized, profiles["short"])
 
-    def _normalize_history_for_period(self, history: List[Dict[str, float]], period: str) -> List[Dict[str, float]]:
+    def _normalize_history_for_period(self, history: CandleSeries, period: str, timezone: str = "UTC") -> CandleSeries:
         if (period or "").lower() != "long":
             return history
-        return self._aggregate_to_yearly_candles(history)
+        return self._aggregate_to_yearly_candles(history, timezone)
 
     @staticmethod
-    def _aggregate_to_yearly_candles(history: List[Dict[str, float]]) -> List[Dict[str, float]]:
-        buckets: Dict[int, Dict[str, float]] = {}
-        order: List[int] = []
-        for candle in history:
-            timestamp = candle.get("timestamp")
-            if not timestamp:
-                continue
-            year = datetime.utcfromtimestamp(int(timestamp)).year
-            if year not in buckets:
-                order.append(year)
-                buckets[year] = {
-                    "timestamp": int(timestamp),
-                    "open": candle["open"],
-                    "high": candle["high"],
-                    "low": candle["low"],
-                    "close": candle["close"],
-                    "volume": float(candle.get("volume", 0.0) or 0.0),
-                }
-                continue
-
-            current = buckets[year]
-            current["high"] = max(current["high"], candle["high"])
-            current["low"] = min(current["low"], candle["low"])
-            current["close"] = candle["close"]
-            current["timestamp"] = int(timestamp)
-            current["volume"] += float(candle.get("volume", 0.0) or 0.0)
-
-        return [buckets[year] for year in order]
+    def _aggregate_to_yearly_candles(history: CandleSeries, timezone: str = "UTC") -> CandleSeries:
+        # Year boundaries follow the exchange's local calendar (a KRX January bar is stamped in UTC December).
+        return resample(history, "1y", timezone)
 
+    @timed(upstream="naver_investor_flow")
     async def _fetch_investor_flow(self, symbol: str) -> Optional[Dict]:
         url = f"https://finance.naver.com/item/main.naver?code={symbol}"
         timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
@@ -375,6 +649,7 @@ class AnalysisService:
             "summary": f"최근 5거래일 외국인 {direction(foreign_5d)}, 기관 {direction(institution_5d)}",
         }
 
+    @timed(upstream="naver_intraday_flow")
     async def _fetch_intraday_live_flow(self, symbol: str) -> Optional[Dict]:
         url = f"https://finance.naver.com/item/frgn.naver?code={symbol}"
         timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
@@ -485,12 +760,11 @@ class AnalysisService:
             "summary": summary,
         }
 
-    def _build_global_flow(self, history: List[Dict[str, float]]) -> Optional[Dict]:
+    def _build_global_flow(self, history: CandleSeries) -> Optional[Dict]:
         if len(history) < 25:
             return None
 
         recent = history[-20:]
-        volumes = [item.get("volume", 0.0) for item in recent]
 
         signed_notional = 0.0
         up_volume = 0.0
@@ -499,14 +773,11 @@ class AnalysisService:
         obv_20 = []
         adl = 0.0
         adl_20 = []
-        previous_close = history[-21]["close"]
-
-        for candle in recent:
-            close = candle["close"]
-            volume = candle.get("volume", 0.0) or 0.0
-            high = candle["high"]
-            low = candle["low"]
+        previous_close = float(history.close[-21])
 
+        for close, volume, high, low in zip(
+            recent.close.tolist(), recent.volume.tolist(), recent.high.tolist(), recent.low.tolist()
+        ):
             if close > previous_close:
                 signed_notional += close * volume
                 up_volume += volume
@@ -588,9 +859,10 @@ class AnalysisService:
             "themes": [item["label"] for item in macro_signals[:3]],
         }
 
+    @timed()
     def _build_analysis(
         self,
-        history: List[Dict[str, float]],
+        history: CandleSeries,
         asset_type: str,
         symbol: str,
         name: str,
@@ -602,33 +874,40 @@ class AnalysisService:
         news_context: Dict,
         live_price: Optional[float] = None,
         fundamentals: Optional[Dict] = None,
+        indicator_key: Optional[Tuple[str, str]] = None,
     ) -> Dict:
-        closes = [item["close"] for item in history]
-        highs = [item["high"] for item in history]
-        lows = [item["low"] for item in history]
-        volumes = [item.get("volume", 0.0) for item in history]
+        closes = history.close
+        highs = history.high
+        lows = history.low
+        volumes = history.volume
         profile = self._get_strategy_profile(period)
         score_profile = self._get_score_profile(period)
 
-        current = float(live_price) if live_price and live_price > 0 else closes[-1]
-        previous_close = closes[-2] if len(closes) > 1 else closes[-1]
+        current = float(live_price) if live_price and live_price > 0 else float(closes[-1])
+        previous_close = float(closes[-2]) if len(closes) > 1 else float(closes[-1])
         primary_span = min(profile["primary_span"], len(closes))
         secondary_span = min(profile["secondary_span"], len(closes))
-        sma20 = mean(closes[-primary_span:]) if len(closes) >= primary_span else mean(closes)
-        sma60 = mean(closes[-secondary_span:]) if len(closes) >= secondary_span else mean(closes)
-        prev_sma20 = mean(closes[-primary_span - 1:-1]) if len(closes) > primary_span else sma20
-        prev_sma60 = mean(closes[-secondary_span - 1:-1]) if len(closes) > secondary_span else sma60
-        low20 = min(lows[-primary_span:]) if len(lows) >= primary_span else min(lows)
-        low60 = min(lows[-secondary_span:]) if len(lows) >= secondary_span else min(lows)
-        high20 = max(highs[-primary_span:]) if len(highs) >= primary_span else max(highs)
-        high60 = max(highs[-secondary_span:]) if len(highs) >= secondary_span else max(highs)
-        rsi14 = self._calculate_rsi(closes, 14)
-        macd_line, macd_signal, macd_hist = self._calculate_macd(closes)
-        macd_metrics = self._calculate_macd_metrics(closes)
-        stochastic = self._calculate_stochastic(history)
-        atr14 = self._calculate_atr(history, 14)
-        bollinger = self._calculate_bollinger(closes, min(20, len(closes)))
-        volume_ratio = self._calculate_volume_ratio(volumes, 20)
+        sma20 = float(closes[-primary_span:].mean())
+        sma60 = float(closes[-secondary_span:].mean())
+        prev_sma20 = float(closes[-primary_span - 1:-1].mean()) if len(closes) > primary_span else sma20
+        prev_sma60 = float(closes[-secondary_span - 1:-1].mean()) if len(closes) > secondary_span else sma60
+        low20 = float(lows[-primary_span:].min())
+        low60 = float(lows[-secondary_span:].min())
+        high20 = float(highs[-primary_span:].max())
+        high60 = float(highs[-secondary_span:].max())
+        if indicator_key:
+            indicators = self.indicator_states.sync(indicator_key, history.timestamp, highs, lows, closes, volumes).latest()
+        else:
+            indicators = self.indicator_engine.compute(
+                highs, lows, closes, volumes, bollinger_period=min(20, len(closes))
+            ).latest()
+        rsi14 = indicators["rsi"]
+        macd_metrics = indicators["macd"]
+        macd_hist = macd_metrics["histogram"]
+        stochastic = indicators["stochastic"]
+        atr14 = indicators["atr"]
+        bollinger = indicators["bollinger"]
+        volume_ratio = indicators["volume_ratio"]
         volume_signal = self._label_volume_signal(volume_ratio)
         is_global_stock = asset_type == "stock" and not symbol.isdigit()
 
@@ -937,6 +1216,7 @@ class AnalysisService:
             "news_brief": news_brief,
             "risk_notes": risk_notes,
             "timeframe": timeframe,
+            "as_of": datetime.fromtimestamp(int(history.timestamp[-1]), timezone.utc),
             "source": source,
             "notes": notes,
         }
@@ -1669,158 +1949,6 @@ class AnalysisService:
         summary = self._join_reason_summary(reasons, "재무 건전성과 자본 효율은 보통 수준으로 봤습니다.")
         return min(20, score), reasons[:4], summary
 
-    @staticmethod
-    def _calculate_rsi(closes: List[float], period: int) -> Optional[float]:
-        if len(closes) <= period:
-            return None
-        gains = []
-        losses = []
-        for previous, current in zip(closes[:-1], closes[1:]):
-            delta = current - previous
-            gains.append(max(delta, 0))
-            losses.append(abs(min(delta, 0)))
-        avg_gain = mean(gains[-period:])
-        avg_loss = mean(losses[-period:])
-        if avg_loss == 0:
-            return 100.0
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
-
-    @staticmethod
-    def _ema(values: List[float], period: int) -> List[float]:
-        multiplier = 2 / (period + 1)
-        ema_values = [values[0]]
-        for value in values[1:]:
-            ema_values.append((value - ema_values[-1]) * multiplier + ema_values[-1])
-        return ema_values
-
-    def _calculate_macd(self, closes: List[float]) -> Tuple[Optional[float], Optional[float], Optional[float]]:
-        if len(closes) < 35:
-            return None, None, None
-        ema12 = self._ema(closes, 12)
-        ema26 = self._ema(closes, 26)
-        macd_series = [a - b for a, b in zip(ema12[-len(ema26):], ema26)]
-        signal_series = self._ema(macd_series, 9)
-        macd_line = macd_series[-1]
-        signal_line = signal_series[-1]
-        histogram = macd_line - signal_line
-        return macd_line, signal_line, histogram
-
-    def _calculate_macd_metrics(self, closes: List[float]) -> Dict[str, Optional[float]]:
-        if len(closes) < 35:
-            return {
-                "macd_line": None,
-                "signal_line": None,
-                "histogram": None,
-                "golden_cross": False,
-                "dead_cross": False,
-            }
-        ema12 = self._ema(closes, 12)
-        ema26 = self._ema(closes, 26)
-        macd_series = [a - b for a, b in zip(ema12[-len(ema26):], ema26)]
-        signal_series = self._ema(macd_series, 9)
-        macd_line = macd_series[-1]
-        signal_line = signal_series[-1]
-        histogram = macd_line - signal_line
-        prev_macd = macd_series[-2] if len(macd_series) > 1 else None
-        prev_signal = signal_series[-2] if len(signal_series) > 1 else None
-        golden_cross = prev_macd is not None and prev_signal is not None and prev_macd <= prev_signal and macd_line > signal_line
-        dead_cross = prev_macd is not None and prev_signal is not None and prev_macd >= prev_signal and macd_line < signal_line
-        return {
-            "macd_line": macd_line,
-            "signal_line": signal_line,
-            "histogram": histogram,
-            "golden_cross": golden_cross,
-            "dead_cross": dead_cross,
-        }
-
-    @staticmethod
-    def _calculate_stochastic(history: List[Dict[str, float]], period: int = 14, smooth: int = 3) -> Dict[str, Optional[float]]:
-        if len(history) < period + smooth:
-            return {"k": None, "d": None, "golden_cross": False, "dead_cross": False}
-
-        fast_k_values: List[float] = []
-        for idx in range(period - 1, len(history)):
-            window = history[idx - period + 1: idx + 1]
-            highest = max(candle["high"] for candle in window)
-            lowest = min(candle["low"] for candle in window)
-            close = history[idx]["close"]
-            if highest == lowest:
-                fast_k_values.append(50.0)
-            else:
-                fast_k_values.append(((close - lowest) / (highest - lowest)) * 100)
-
-        if len(fast_k_values) < smooth + 1:
-            return {"k": None, "d": None, "golden_cross": False, "dead_cross": False}
-
-        slow_k_series = [mean(fast_k_values[max(0, idx - smooth + 1): idx + 1]) for idx in range(len(fast_k_values))]
-        slow_d_series = [mean(slow_k_series[max(0, idx - smooth + 1): idx + 1]) for idx in range(len(slow_k_series))]
-        k_value = slow_k_series[-1]
-        d_value = slow_d_series[-1]
-        prev_k = slow_k_series[-2]
-        prev_d = slow_d_series[-2]
-        return {
-            "k": k_value,
-            "d": d_value,
-            "golden_cross": prev_k <= prev_d and k_value > d_value,
-            "dead_cross": prev_k >= prev_d and k_value < d_value,
-        }
-
-    @staticmethod
-    def _calculate_bollinger(closes: List[float], period: int = 20, multiplier: float = 2.0) -> Dict[str, Optional[float]]:
-        if len(closes) < period:
-            return {"middle": None, "upper": None, "lower": None, "bandwidth": None, "position": None}
-        window = closes[-period:]
-        middle = mean(window)
-        deviation = pstdev(window) if len(window) > 1 else 0.0
-        upper = middle + multiplier * deviation
-        lower = middle - multiplier * deviation
-        bandwidth = ((upper - lower) / middle) if middle else None
-        latest = closes[-1]
-        if upper == lower:
-            position = 0.5
-        else:
-            position = (latest - lower) / (upper - lower)
-        return {
-            "middle": middle,
-            "upper": upper,
-            "lower": lower,
-            "bandwidth": bandwidth,
-            "position": position,
-        }
-
-    @staticmethod
-    def _calculate_atr(history: List[Dict[str, float]], period: int) -> Optional[float]:
-        if len(history) <= period:
-            return None
-        true_ranges = []
-        prev_close = history[0]["close"]
-        for candle in history[1:]:
-            tr = max(
-                candle["high"] - candle["low"],
-                abs(candle["high"] - prev_close),
-                abs(candle["low"] - prev_close),
-            )
-            true_ranges.append(tr)
-            prev_close = candle["close"]
-        return mean(true_ranges[-period:]) if true_ranges else None
-
-    @staticmethod
-    def _calculate_volume_ratio(volumes: List[float], period: int) -> Optional[float]:
-        if len(volumes) <= period:
-            return None
-        latest_non_zero = next((value for value in reversed(volumes) if value and value > 0), None)
-        if latest_non_zero is None:
-            return None
-        recent_non_zero = [value for value in volumes[-period:] if value and value > 0]
-        average = mean(recent_non_zero) if recent_non_zero else 0
-        if average <= 0:
-            return None
-        ratio = latest_non_zero / average
-        if ratio < 0.05:
-            return None
-        return ratio
-
     @staticmethod
     def _label_volume_signal(volume_ratio: Optional[float]) -> str:
         if volume_ratio is None:
@@ -1835,77 +1963,16 @@ class AnalysisService:
 
     @staticmethod
     def _extract_macro_signals(articles: List[Dict[str, str]], asset_type: str) -> List[Dict[str, int]]:
-        keyword_scores = {
-            "rate": ("금리", -1),
-            "inflation": ("물가", -1),
-            "tariff": ("관세", -1),
-            "war": ("지정학", -2),
-            "attack": ("지정학", -2),
-            "missile": ("지정학", -2),
-            "drone": ("지정학", -2),
-            "conflict": ("지정학", -2),
-            "ceasefire": ("지정학", -1),
-            "ukraine": ("지정학", -2),
-            "russia": ("지정학", -2),
-            "gaza": ("지정학", -2),
-            "israel": ("지정학", -2),
-            "iran": ("지정학", -2),
-            "red sea": ("지정학", -2),
-            "sanction": ("제재", -1),
-            "oil": ("원자재", -1 if asset_type == "stock" else 0),
-            "fed": ("통화정책", -1),
-            "treasury": ("금리", -1),
-            "stimulus": ("정책완화", 1),
-            "ai": ("성장산업", 1),
-            "chip": ("성장산업", 1),
-            "soft landing": ("경기개선", 1),
-            "cut": ("정책완화", 1),
-        }
-
         signals: List[Dict[str, int]] = []
         for article in articles:
-            combined = f"{article['title']} {article['summary']}".lower()
-            score = 0
-            matched = []
-            for keyword, (label, keyword_score) in keyword_scores.items():
-                if keyword in combined:
-                    score += keyword_score
-                    matched.append(label)
-            if score == 0:
-                continue
-            signals.append({"label": ", ".join(list(dict.fromkeys(matched))[:2]), "score": score})
+            signal = news_lexicon.classify(article).macro_signal(asset_type)
+            if signal:
+                signals.append(signal)
         return signals
 
     @staticmethod
     def _score_articles(articles: List[Dict[str, str]], asset_type: str) -> int:
-        positive_words = ["beat", "surge", "growth", "partnership", "record", "gain", "rally", "strong"]
-        negative_words = [
-            "fall",
-            "drop",
-            "delay",
-            "risk",
-            "probe",
-            "cut",
-            "warn",
-            "miss",
-            "tariff",
-            "war",
-            "attack",
-            "missile",
-            "drone",
-            "conflict",
-            "ukraine",
-            "russia",
-            "gaza",
-            "israel",
-            "iran",
-            "sanction",
-        ]
-        score = 0
-        for article in articles:
-            combined = f"{article['title']} {article['summary']}".lower()
-            score += sum(1 for word in positive_words if word in combined)
-            score -= sum(1 for word in negative_words if word in combined)
+        score = sum(news_lexicon.classify(article).impact for article in articles)
         if asset_type == "currency":
             score = int(score / 2)
         return score
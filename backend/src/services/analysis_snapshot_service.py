@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+from src.models.database import AnalysisSnapshot, FxWatchlistItem, WatchlistItem
+from src.schemas.api import TechnicalAnalysisResponse
+from src.services.analysis_service import AnalysisService
+from src.utils.timing import timed
+
+# Bump whenever the scoring rules or the analysis payload change, so older snapshots are never served.
+ANALYSIS_SNAPSHOT_VERSION = 1
+
+SnapshotTarget = Tuple[str, str, Optional[str]]
+
+
+class AnalysisSnapshotService:
+    """
+    관심 종목·환율의 기간별 분석을 미리 계산해 analysis_snapshots 테이블에 보관
+
+    일/주/년봉 분석은 일봉 한 벌에서 함께 나오므로 종목당 이력 조회 한 번으로 세 기간을 채운다.
+    """
+
+    def __init__(self, analysis_service: Optional[AnalysisService] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.analysis_service = analysis_service or AnalysisService()
+
+    async def get_fresh(self, db: AsyncSession, asset_type: str, symbol: str, period: str) -> Optional[Dict]:
+        snapshots = await self.get_fresh_periods(db, asset_type, symbol, (period,))
+        return snapshots.get(period)
+
+    async def get_fresh_periods(self, db: AsyncSession, asset_type: str, symbol: str, periods) -> Dict[str, Dict]:
+        """max_age 안에 현재 버전으로 계산된 스냅샷만 응답 형태로 돌려준다"""
+        periods = [period for period in periods if period in AnalysisService.ALL_PERIODS]
+        if not periods:
+            return {}
+        oldest = datetime.now(timezone.utc) - timedelta(seconds=settings.analysis_snapshot_max_age)
+        rows = (
+            await db.execute(
+                select(AnalysisSnapshot).where(
+                    AnalysisSnapshot.asset_type == asset_type,
+                    AnalysisSnapshot.symbol == symbol,
+                    AnalysisSnapshot.period.in_(periods),
+                    AnalysisSnapshot.version == ANALYSIS_SNAPSHOT_VERSION,
+                    AnalysisSnapshot.computed_at >= oldest,
+                )
+            )
+        ).scalars()
+        return {row.period: self.snapshot_response(row) for row in rows}
+
+    @staticmethod
+    def snapshot_response(row: AnalysisSnapshot) -> Dict:
+        return {
+            **row.payload,
+            "snapshot": {"version": row.version, "as_of": row.as_of, "computed_at": row.computed_at},
+        }
+
+    @timed()
+    async def precompute(self, db: AsyncSession) -> Dict[str, int]:
+        targets = await self._load_targets(db)
+        semaphore = asyncio.Semaphore(max(1, settings.analysis_batch_concurrency))
+
+        async def run(target: SnapshotTarget) -> List[Dict]:
+            async with semaphore:
+                try:
+                    return self._snapshot_rows(target, await self._analyze(target))
+                except Exception as exc:
+                    self.logger.warning("Analysis precompute failed for %s %s: %s", target[0], target[1], exc)
+                    return []
+
+        results = await asyncio.gather(*(run(target) for target in targets))
+        rows = [row for target_rows in results for row in target_rows]
+        if rows:
+            statement = insert(AnalysisSnapshot).values(rows)
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[AnalysisSnapshot.asset_type, AnalysisSnapshot.symbol, AnalysisSnapshot.period],
+                    set_={
+                        "version": statement.excluded.version,
+                        "as_of": statement.excluded.as_of,
+                        "payload": statement.excluded.payload,
+                        "computed_at": statement.excluded.computed_at,
+                    },
+                )
+            )
+            await db.commit()
+        return {"targets": len(targets), "refreshed": len(rows), "failed": sum(1 for target_rows in results if not target_rows)}
+
+    async def _load_targets(self, db: AsyncSession) -> List[SnapshotTarget]:
+        symbols = (await db.execute(select(WatchlistItem.symbol).order_by(WatchlistItem.symbol.asc()))).scalars()
+        pairs = (
+            await db.execute(
+                select(FxWatchlistItem.base_currency, FxWatchlistItem.target_currency).order_by(
+                    FxWatchlistItem.base_currency.asc(), FxWatchlistItem.target_currency.asc()
+                )
+            )
+        ).all()
+        targets: List[SnapshotTarget] = [("stock", symbol.upper(), None) for symbol in symbols]
+        targets.extend(("currency", base.upper(), target.upper()) for base, target in pairs)
+        return list(dict.fromkeys(targets))
+
+    async def _analyze(self, target: SnapshotTarget) -> Optional[Dict]:
+        asset_type, symbol, quote_currency = target
+        if asset_type == "currency":
+            return await self.analysis_service.get_currency_analysis_all_periods(symbol, quote_currency)
+        return await self.analysis_service.get_stock_analysis_all_periods(symbol)
+
+    @staticmethod
+    def _snapshot_rows(target: SnapshotTarget, result: Optional[Dict]) -> List[Dict]:
+        if not result:
+            return []
+        computed_at = datetime.now(timezone.utc)
+        rows = []
+        for period, analysis in result["analyses"].items():
+            # A degraded analysis would keep serving fallback inputs for max_age; leave the old row to expire.
+            if analysis.get("degraded_stages"):
+                continue
+            rows.append(
+                {
+                    "asset_type": target[0],
+                    "symbol": result["symbol"],
+                    "period": period,
+                    "version": ANALYSIS_SNAPSHOT_VERSION,
+                    "as_of": analysis["as_of"],
+                    "payload": jsonable_encoder(TechnicalAnalysisResponse(**analysis)),
+                    "computed_at": computed_at,
+                }
+            )
+        return rows
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.config.settings import settings
+from src.services.analysis_service import AnalysisService
+from src.services.candle_resampler import exchange_timezone, resample
+from src.services.candle_series import CANDLE_FIELDS, CandleSeries
+from src.services.score_engine import ACTION_BUY, ACTION_SELL, ScoreEngine, ScoreSeries
+
+BACKTEST_PERIODS = ("short", "medium", "long")
+# Bars resampled from the stored daily history for each analysis period.
+PERIOD_INTERVALS = {"short": "1d", "medium": "1wk", "long": "1y"}
+
+EXIT_STOP = 0
+EXIT_TARGET = 1
+EXIT_TIME = 2
+
+
+def simulate_period(history: CandleSeries, scores: ScoreSeries, holding_bars: int, warmup: int) -> Dict[str, object]:
+    """
+    매수 신호 봉의 종가에 진입해 1차 매도가(익절)·손절가·보유 기간 만료 중 먼저 오는 것으로 청산한다
+
+    같은 봉에서 손절가와 익절가가 모두 닿으면 보수적으로 손절로 본다. 갭으로 가격대를 건너뛰면 시가에 체결한다.
+    """
+    length = len(history)
+    index = np.arange(length)
+    eligible = (index >= warmup) & (index + holding_bars < length)
+    close = history.close
+    forward = np.full(length, np.nan)
+    if length > holding_bars:
+        forward[:-holding_bars] = close[holding_bars:] / close[:-holding_bars] - 1
+
+    entries = np.flatnonzero(eligible & (scores.action == ACTION_BUY))
+    sells = np.flatnonzero(eligible & (scores.action == ACTION_SELL))
+    result: Dict[str, object] = {
+        "bars": int(eligible.sum()),
+        "baseline_forward": forward[eligible],
+        "sell_forward": forward[sells],
+        "buy_returns": np.empty(0),
+        "buy_adverse": np.empty(0),
+        "buy_holding": np.empty(0, dtype=np.int64),
+        "buy_exit": np.empty(0, dtype=np.int64),
+        "equity_return": 0.0,
+        "max_drawdown": 0.0,
+    }
+    if not len(entries):
+        return result
+
+    offsets = np.arange(1, holding_bars + 1)
+    window = entries[:, None] + offsets
+    rows = np.arange(len(entries))
+    entry_price = close[entries]
+    stop = scores.stop_loss[entries]
+    target = scores.first_sell[entries]
+
+    stop_hit = history.low[window] <= stop[:, None]
+    target_hit = history.high[window] >= target[:, None]
+    first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), holding_bars)
+    first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), holding_bars)
+    stopped = (first_stop < holding_bars) & (first_stop <= first_target)
+    targeted = ~stopped & (first_target < holding_bars)
+    exit_offset = np.select([stopped, targeted], [first_stop, first_target], holding_bars - 1)
+    exit_open = history.open[window[rows, exit_offset]]
+    exit_price = np.select(
+        [stopped, targeted],
+        [np.minimum(exit_open, stop), np.maximum(exit_open, target)],
+        close[entries + holding_bars],
+    )
+    returns = exit_price / entry_price - 1
+    held_lows = np.where(offsets[None, :] - 1 <= exit_offset[:, None], history.low[window], np.inf)
+    adverse = np.minimum(held_lows.min(axis=1) / entry_price - 1, 0.0)
+
+    result.update(
+        {
+            "buy_returns": returns,
+            "buy_adverse": adverse,
+            "buy_holding": exit_offset + 1,
+            "buy_exit": np.select([stopped, targeted], [EXIT_STOP, EXIT_TARGET], EXIT_TIME),
+        }
+    )
+    result["equity_return"], result["max_drawdown"] = _sequential_equity(entries, exit_offset + 1, returns, adverse)
+    return result
+
+
+def _sequential_equity(entries: np.ndarray, holding: np.ndarray, returns: np.ndarray, adverse: np.ndarray):
+    # One position at a time: signals while a trade is open are skipped. Drawdown includes intra-trade lows.
+    equity = peak = 1.0
+    max_drawdown = 0.0
+    next_free = -1
+    for entry, held, trade_return, trade_adverse in zip(entries.tolist(), holding.tolist(), returns.tolist(), adverse.tolist()):
+        if entry < next_free:
+            continue
+        max_drawdown = min(max_drawdown, equity * (1 + trade_adverse) / peak - 1)
+        equity *= 1 + trade_return
+        peak = max(peak, equity)
+        max_drawdown = min(max_drawdown, equity / peak - 1)
+        next_free = entry + held
+    return equity - 1, max_drawdown
+
+
+def backtest_symbol(payload: Dict[str, object]) -> Dict[str, object]:
+    """프로세스 풀 작업 단위: 한 종목의 일봉으로 기간별 점수 모델을 재현"""
+    daily = CandleSeries(*(payload["columns"][field] for field in CANDLE_FIELDS))
+    engine = ScoreEngine()
+    periods: Dict[str, Dict[str, object]] = {}
+    for period in payload["periods"]:
+        interval = PERIOD_INTERVALS[period]
+        history = daily if interval == "1d" else resample(daily, interval, str(payload["timezone"]))
+        profile = AnalysisService._get_strategy_profile(period)
+        scores = engine.score(history, period)
+        periods[period] = simulate_period(
+            history, scores, holding_bars=int(profile["primary_span"]), warmup=int(profile["secondary_span"])
+        )
+    return {"symbol": payload["symbol"], "periods": periods}
+
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    return round(float(np.mean(values)), 4) if len(values) else None
+
+
+def _median(values: np.ndarray) -> Optional[float]:
+    return round(float(np.median(values)), 4) if len(values) else None
+
+
+def summarize(results: Sequence[Dict[str, object]], periods: Iterable[str]) -> Dict[str, Dict[str, object]]:
+    report: Dict[str, Dict[str, object]] = {}
+    for period in periods:
+        parts = [result["periods"][period] for result in results if period in result["periods"]]
+        parts = [part for part in parts if part["bars"]]
+        returns = np.concatenate([part["buy_returns"] for part in parts]) if parts else np.empty(0)
+        exits = np.concatenate([part["buy_exit"] for part in parts]) if parts else np.empty(0)
+        sells = np.concatenate([part["sell_forward"] for part in parts]) if parts else np.empty(0)
+        baseline = np.concatenate([part["baseline_forward"] for part in parts]) if parts else np.empty(0)
+        equity = np.array([part["equity_return"] for part in parts])
+        drawdowns = np.array([part["max_drawdown"] for part in parts])
+        report[period] = {
+            "symbols": len(parts),
+            "bars": int(sum(part["bars"] for part in parts)),
+            "buy_signals": int(len(returns)),
+            "buy_hit_rate": _mean(returns > 0),
+            "buy_avg_return": _mean(returns),
+            "buy_median_return": _median(returns),
+            "target_exit_rate": _mean(exits == EXIT_TARGET),
+            "stop_exit_rate": _mean(exits == EXIT_STOP),
+            "avg_holding_bars": _mean(np.concatenate([part["buy_holding"] for part in parts])) if parts else None,
+            "avg_adverse_excursion": _mean(np.concatenate([part["buy_adverse"] for part in parts])) if parts else None,
+            "sell_signals": int(len(sells)),
+            "sell_hit_rate": _mean(sells < 0),
+            "sell_avg_forward_return": _mean(sells),
+            "baseline_avg_forward_return": _mean(baseline),
+            "strategy_avg_return": _mean(equity),
+            "strategy_median_return": _median(equity),
+            "avg_max_drawdown": _mean(drawdowns),
+            "worst_max_drawdown": round(float(drawdowns.min()), 4) if len(drawdowns) else None,
+        }
+    return report
+
+
+class BacktestService:
+    """
+    저장된 일봉으로 분석 점수 모델을 기간 프로필별로 재현해 적중률·수익률·낙폭을 집계
+
+    종목별 계산은 서로 독립이라 프로세스 풀로 나눠 돌린다.
+    """
+
+    def __init__(self, analysis_service: Optional[AnalysisService] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.analysis_service = analysis_service or AnalysisService()
+
+    async def load_histories(self, symbols: Iterable[str]) -> Dict[str, CandleSeries]:
+        """종목별 20년 일봉 (캔들 저장소를 거치므로 두 번째 실행부터는 증분 조회만 한다)"""
+        semaphore = asyncio.Semaphore(max(1, settings.analysis_batch_concurrency))
+
+        async def load(symbol: str):
+            async with semaphore:
+                yahoo_symbol = await self.analysis_service._resolve_stock_symbol(symbol, None)
+                return yahoo_symbol, await self.analysis_service._load_daily_history(yahoo_symbol)
+
+        loaded = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        return {yahoo_symbol: history for yahoo_symbol, history in loaded if len(history)}
+
+    def run(
+        self,
+        histories: Dict[str, CandleSeries],
+        periods: Sequence[str] = BACKTEST_PERIODS,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, object]:
+        unknown = [period for period in periods if period not in PERIOD_INTERVALS]
+        if unknown:
+            raise ValueError(f"Unsupported backtest periods: {unknown}")
+        payloads: List[Dict[str, object]] = [
+            {
+                "symbol": symbol,
+                "timezone": exchange_timezone(symbol),
+                "columns": {field: getattr(history, field) for field in CANDLE_FIELDS},
+                "periods": list(periods),
+            }
+            for symbol, history in histories.items()
+        ]
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(payloads) <= 1:
+            results = [backtest_symbol(payload) for payload in payloads]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(payloads) // (workers * 4))
+                results = list(pool.map(backtest_symbol, payloads, chunksize=chunksize))
+        return {
+            "symbols": [result["symbol"] for result in results],
+            "periods": summarize(results, periods),
+        }
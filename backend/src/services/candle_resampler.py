@@ -0,0 +1,85 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.services.candle_series import CandleSeries
+
+DEFAULT_TIMEZONE = "America/New_York"
+# Yahoo symbol suffix -> exchange time zone. Symbols without a suffix are US listings.
+EXCHANGE_TIMEZONES: Dict[str, str] = {
+    ".KS": "Asia/Seoul",
+    ".KQ": "Asia/Seoul",
+    ".T": "Asia/Tokyo",
+    ".HK": "Asia/Hong_Kong",
+    ".SS": "Asia/Shanghai",
+    ".SZ": "Asia/Shanghai",
+    ".TW": "Asia/Taipei",
+    ".L": "Europe/London",
+    ".DE": "Europe/Berlin",
+    ".PA": "Europe/Paris",
+    ".TO": "America/Toronto",
+    ".AX": "Australia/Sydney",
+    "=X": "Europe/London",
+}
+INDEX_TIMEZONES: Dict[str, str] = {
+    "^KS11": "Asia/Seoul",
+    "^KQ11": "Asia/Seoul",
+    "^N225": "Asia/Tokyo",
+    "^HSI": "Asia/Hong_Kong",
+}
+RESAMPLE_INTERVALS = ("1wk", "1mo", "1y")
+
+
+def exchange_timezone(yahoo_symbol: str) -> str:
+    symbol = (yahoo_symbol or "").upper()
+    if symbol in INDEX_TIMEZONES:
+        return INDEX_TIMEZONES[symbol]
+    for suffix, timezone in EXCHANGE_TIMEZONES.items():
+        if symbol.endswith(suffix):
+            return timezone
+    return DEFAULT_TIMEZONE
+
+
+@lru_cache(maxsize=65536)
+def _utc_offset_seconds(timezone: str, utc_hour: int) -> int:
+    offset = datetime.fromtimestamp(utc_hour * 3600, ZoneInfo(timezone)).utcoffset()
+    return int(offset.total_seconds()) if offset else 0
+
+
+def local_days(timestamps: np.ndarray, timezone: str) -> np.ndarray:
+    """UTC 초 단위 시각을 거래소 현지 날짜(datetime64[D])로 변환"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not len(timestamps):
+        return timestamps.astype("datetime64[D]")
+    # DST transitions happen on whole UTC hours, so one offset lookup per distinct hour is exact.
+    hours, inverse = np.unique(timestamps // 3600, return_inverse=True)
+    offsets = np.array([_utc_offset_seconds(timezone, int(hour)) for hour in hours], dtype=np.int64)
+    return ((timestamps + offsets[inverse]) // 86_400).astype("datetime64[D]")
+
+
+def period_keys(timestamps: np.ndarray, interval: str, timezone: str) -> np.ndarray:
+    days = local_days(timestamps, timezone)
+    if interval == "1wk":
+        # 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday like Yahoo's weekly bars.
+        return (days.astype(np.int64) + 3) // 7
+    if interval == "1mo":
+        return days.astype("datetime64[M]")
+    if interval == "1y":
+        return days.astype("datetime64[Y]")
+    raise ValueError(f"Unsupported resample interval: {interval}")
+
+
+def resample(series: CandleSeries, interval: str, timezone: str = "UTC") -> CandleSeries:
+    """
+    일봉 등 짧은 봉을 주/월/년봉으로 합친다 (경계는 거래소 현지 날짜 기준)
+
+    합친 봉의 시각은 구간의 마지막 봉 시각을 따른다.
+    """
+    if not len(series):
+        return series
+    if (series.timestamp == 0).any():
+        series = series[series.timestamp != 0]
+    return series.aggregate(period_keys(series.timestamp, interval, timezone))
@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+class CandleSeries:
+    """
+    컬럼형 OHLCV 시계열 (봉마다 dict를 만들지 않고 필드별 배열로 보관)
+
+    슬라이싱은 배열 뷰를 돌려주므로 복사가 일어나지 않는다.
+    """
+
+    __slots__ = CANDLE_FIELDS
+
+    def __init__(
+        self,
+        timestamp: Sequence[int],
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Sequence[float],
+    ) -> None:
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    @classmethod
+    def empty(cls) -> "CandleSeries":
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamps: Sequence[Optional[int]],
+        opens: Sequence[Optional[float]],
+        highs: Sequence[Optional[float]],
+        lows: Sequence[Optional[float]],
+        closes: Sequence[Optional[float]],
+        volumes: Sequence[Optional[float]],
+    ) -> "CandleSeries":
+        # Yahoo chart columns use null for missing bars; those rows are dropped and missing volume becomes 0.
+        length = min(len(timestamps), len(opens), len(highs), len(lows), len(closes), len(volumes))
+        if not length:
+            return cls.empty()
+        open_ = np.array(opens[:length], dtype=np.float64)
+        high = np.array(highs[:length], dtype=np.float64)
+        low = np.array(lows[:length], dtype=np.float64)
+        close = np.array(closes[:length], dtype=np.float64)
+        volume = np.nan_to_num(np.array(volumes[:length], dtype=np.float64), nan=0.0)
+        timestamp = np.array([value if value is not None else 0 for value in timestamps[:length]], dtype=np.int64)
+        valid = ~(np.isnan(open_) | np.isnan(high) | np.isnan(low) | np.isnan(close))
+        if valid.all():
+            return cls(timestamp, open_, high, low, close, volume)
+        return cls(timestamp[valid], open_[valid], high[valid], low[valid], close[valid], volume[valid])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CandleSeries":
+        rows = list(records)
+        return cls(
+            [int(row.get("timestamp") or 0) for row in rows],
+            [row["open"] for row in rows],
+            [row["high"] for row in rows],
+            [row["low"] for row in rows],
+            [row["close"] for row in rows],
+            [row.get("volume") or 0.0 for row in rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> Union["CandleSeries", Dict[str, float]]:
+        # Slices are views; boolean/index arrays (e.g. filtering) copy like regular NumPy fancy indexing.
+        if isinstance(index, (slice, np.ndarray)):
+            return CandleSeries(*(getattr(self, field)[index] for field in CANDLE_FIELDS))
+        return {
+            "timestamp": int(self.timestamp[index]),
+            **{field: float(getattr(self, field)[index]) for field in CANDLE_FIELDS[1:]},
+        }
+
+    def __repr__(self) -> str:
+        return f"CandleSeries(len={len(self)})"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, field).nbytes for field in CANDLE_FIELDS)
+
+    def since(self, timestamp: float) -> "CandleSeries":
+        """timestamp 이후(포함) 봉만 담은 뷰 (시각 오름차순 전제)"""
+        return self[int(np.searchsorted(self.timestamp, timestamp, side="left")):]
+
+    def to_records(self) -> List[Dict[str, float]]:
+        return [self[index] for index in range(len(self))]
+
+    def aggregate(self, keys: np.ndarray) -> "CandleSeries":
+        """
+        연속된 같은 key 구간을 하나의 봉으로 합친다 (시가=첫 봉, 고가/저가=최대/최소, 종가/시각=마지막 봉, 거래량=합)
+        """
+        if not len(self):
+            return self
+        keys = np.asarray(keys)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(self)] - 1
+        return CandleSeries(
+            self.timestamp[ends],
+            self.open[starts],
+            np.maximum.reduceat(self.high, starts),
+            np.minimum.reduceat(self.low, starts),
+            self.close[ends],
+            np.add.reduceat(self.volume, starts),
+        )
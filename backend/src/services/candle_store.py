@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.candle_series import CANDLE_FIELDS, CandleSeries
+from src.utils.metrics import record_cache_lookup, registry
+
+HistoryFetcher = Callable[..., Awaitable[CandleSeries]]
+
+CANDLE_STORE_FETCHES = registry.counter("candle_store_fetches_total", "Candle store upstream fetches by mode", ("mode",))
+
+DAY_SECONDS = 86_400
+RANGE_UNIT_SECONDS = {"d": DAY_SECONDS, "wk": 7 * DAY_SECONDS, "mo": 30.44 * DAY_SECONDS, "y": 365.25 * DAY_SECONDS}
+_RANGE_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]")
+# Stored files end in a hash of the raw symbol, so symbols that sanitize alike (KRW=X, KRW_X) never share a file.
+_STORED_FILENAME = re.compile(r"-[0-9a-f]{8}__[^_]+\.npz$")
+
+
+def range_to_seconds(range_value: str) -> float:
+    match = _RANGE_PATTERN.match(range_value or "")
+    if not match:
+        raise ValueError(f"Unsupported range: {range_value}")
+    return int(match.group(1)) * RANGE_UNIT_SECONDS[match.group(2)]
+
+
+class CandleStore:
+    """
+    (야후 심볼, 봉 간격)별 OHLCV 저장소
+
+    최초 요청만 전체 기간을 받고, 이후에는 마지막 확정 봉부터의 봉만 받아 진행 중인 봉을 교체한다.
+    directory를 지정하면 .npz 파일로 보관해 재시작 후에도 이어서 쓴다.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        refresh_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        max_entries: int = 1000,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self.max_entries = max(1, max_entries)
+        # Least recently used first; evicted series are re-read from the directory (or re-fetched) on demand.
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # File name -> Yahoo symbol stored inside it, so listing the directory opens each file once.
+        self._file_symbols: Dict[str, Optional[str]] = {}
+
+    async def get_history(
+        self,
+        symbol: str,
+        interval: str,
+        range_value: str,
+        fetch: HistoryFetcher,
+        max_age: Optional[float] = None,
+    ) -> CandleSeries:
+        """max_age를 주면 refresh_seconds 대신 그 시간(초)까지 묵은 봉을 그대로 쓴다"""
+        key = (symbol, interval)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            # Concurrent requests for the same series wait for one upstream call instead of racing.
+            async with lock:
+                return await self._get_locked(key, range_value, fetch, max_age)
+        finally:
+            # A lock lives only as long as its entry, so symbols that were never stored leave nothing behind.
+            if key not in self.entries and not lock.locked() and self._locks.get(key) is lock:
+                del self._locks[key]
+
+    async def _get_locked(
+        self, key: Tuple[str, str], range_value: str, fetch: HistoryFetcher, max_age: Optional[float]
+    ) -> CandleSeries:
+        symbol, interval = key
+        entry = self.entries.pop(key, None)
+        if entry is None and self.directory:
+            entry = await asyncio.to_thread(self._read, key)
+        if entry is not None:
+            self._remember(key, entry)
+
+        range_seconds = range_to_seconds(range_value)
+        now = self.clock()
+        covers_range = entry is not None and entry["range_seconds"] >= range_seconds and len(entry["series"]) > 1
+        refresh_seconds = self.refresh_seconds if max_age is None else max_age
+        if covers_range and now - entry["fetched_at"] < refresh_seconds:
+            record_cache_lookup("candle_store", True)
+            return entry["series"].since(now - range_seconds)
+        record_cache_lookup("candle_store", False)
+
+        if covers_range:
+            entry = await self._refresh(key, entry, fetch, now)
+        else:
+            series = await fetch(symbol, interval, range_value=range_value)
+            CANDLE_STORE_FETCHES.labels("full").inc()
+            if not len(series):
+                return series
+            entry = {"series": series, "range_seconds": range_seconds, "fetched_at": now}
+            await self._save(key, entry)
+        return entry["series"].since(now - range_seconds)
+
+    def stored_symbols(self, interval: str) -> List[str]:
+        """메모리나 저장 디렉터리에 interval 봉이 있는 심볼 목록"""
+        symbols = {symbol for symbol, stored_interval in self.entries if stored_interval == interval}
+        suffix = f"__{interval}.npz"
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                # Files from before the hashed naming are never read back, so they are not listed either.
+                if name.endswith(suffix) and not name.endswith(".tmp.npz") and _STORED_FILENAME.search(name):
+                    symbol = self._file_symbol(name)
+                    if symbol:
+                        symbols.add(symbol)
+        return sorted(symbols)
+
+    def _file_symbol(self, name: str) -> Optional[str]:
+        if name not in self._file_symbols:
+            symbol: Optional[str] = None
+            try:
+                with np.load(os.path.join(self.directory, name)) as data:
+                    if "symbol" in data.files:
+                        symbol = str(data["symbol"])
+            except (OSError, ValueError) as exc:
+                self.logger.warning("Candle store symbol read failed for %s: %s", name, exc)
+            self._file_symbols[name] = symbol
+        return self._file_symbols[name]
+
+    async def _refresh(self, key: Tuple[str, str], entry: Dict[str, Any], fetch: HistoryFetcher, now: float) -> Dict[str, Any]:
+        stored: CandleSeries = entry["series"]
+        # The last stored bar may still be in progress (and Yahoo may re-stamp it), so re-fetch from the
+        # last confirmed bar and let the new bars replace everything from that point on.
+        anchor = int(stored.timestamp[-2])
+        fresh = await fetch(key[0], key[1], period1=anchor, period2=int(now))
+        CANDLE_STORE_FETCHES.labels("incremental").inc()
+        if not len(fresh):
+            self.logger.warning("Incremental candle fetch returned nothing for %s %s; serving stored bars", *key)
+            return entry
+        kept = stored[stored.timestamp < fresh.timestamp[0]]
+        merged = CandleSeries(
+            *(np.concatenate((getattr(kept, field), getattr(fresh, field))) for field in CANDLE_FIELDS)
+        )
+        entry = {"series": merged, "range_seconds": entry["range_seconds"], "fetched_at": now}
+        await self._save(key, entry)
+        return entry
+
+    def _remember(self, key: Tuple[str, str], entry: Dict[str, Any]) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            oldest = next(iter(self.entries))
+            del self.entries[oldest]
+            lock = self._locks.get(oldest)
+            if lock is not None and not lock.locked():
+                del self._locks[oldest]
+
+    async def _save(self, key: Tuple[str, str], entry: Dict[str, Any]) -> None:
+        self._remember(key, entry)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._write, key, entry)
+            except OSError as exc:
+                self.logger.warning("Candle store write failed for %s %s: %s", key[0], key[1], exc)
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        digest = hashlib.blake2b(key[0].encode("utf-8"), digest_size=4).hexdigest()
+        return os.path.join(self.directory, f"{_UNSAFE_FILENAME.sub('_', key[0])}-{digest}__{key[1]}.npz")
+
+    def _write(self, key: Tuple[str, str], entry: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.tmp.npz"
+        series: CandleSeries = entry["series"]
+        np.savez(
+            temp_path,
+            range_seconds=np.float64(entry["range_seconds"]),
+            fetched_at=np.float64(entry["fetched_at"]),
+            symbol=np.array(key[0]),
+            **{field: getattr(series, field) for field in CANDLE_FIELDS},
+        )
+        os.replace(temp_path, path)
+        self._file_symbols[os.path.basename(path)] = key[0]
+
+    def _read(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                series = CandleSeries(*(data[field] for field in CANDLE_FIELDS))
+                return {"series": series, "range_seconds": float(data["range_seconds"]), "fetched_at": float(data["fetched_at"])}
+        except (OSError, KeyError, ValueError) as exc:
+            self.logger.warning("Candle store read failed for %s: %s", path, exc)
+            return None
@@ -1,18 +1,48 @@
 import logging
 import re
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 import aiohttp
 from bs4 import BeautifulSoup
 
 from src.config.settings import settings
+from src.services.alert_index import currency_key
+from src.services.quote_events import QuoteEventBus, quote_event_bus
+from src.services.quote_router import QuoteProvider, QuoteRouter, record_response_bytes
+from src.utils.timing import timed
+
+NAVER_FX_MARKET_CODES = {
+    "USD": "FX_USDKRW",
+    "EUR": "FX_EURKRW",
+    "JPY": "FX_JPYKRW",
+    "CNY": "FX_CNYKRW",
+    "GBP": "FX_GBPKRW",
+}
 
 
 class CurrencyService:
-    def __init__(self) -> None:
-        self.logger = logging.getLogger(__name__)
+    PROVIDER_KIND = "fx"
 
+    def __init__(self, quote_router: Optional[QuoteRouter] = None, events: Optional[QuoteEventBus] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.quote_router = quote_router or QuoteRouter()
+        self.events = events if events is not None else quote_event_bus
+        self.quote_router.register(
+            QuoteProvider(
+                "naver",
+                self.PROVIDER_KIND,
+                self._fetch_naver_quote,
+                fields=("rate",),
+                cost=1.0,
+                accepts=lambda pair: pair[1] == "KRW" and pair[0] in NAVER_FX_MARKET_CODES,
+            )
+        )
+        self.quote_router.register(
+            QuoteProvider("frankfurter", self.PROVIDER_KIND, self._fetch_frankfurter_quote, fields=("rate",), cost=2.0)
+        )
+
+    @timed()
     async def get_exchange_rate(
         self, base_currency: str, target_currency: str
     ) -> Optional[Dict[str, Union[float, str]]]:
@@ -27,26 +57,31 @@ class CurrencyService:
                 "source": "direct",
             }
 
-        rate = await self._fetch_naver_detail_rate(base, target)
-        if rate and rate > 0:
-            return {
-                "base_currency": base,
-                "target_currency": target,
-                "rate": float(rate),
-                "source": "naver",
-            }
+        rate = await self.quote_router.fetch(self.PROVIDER_KIND, (base, target), required_fields=("rate",))
+        if rate:
+            self.events.publish(currency_key(base, target), rate.get("rate"), rate)
+        return rate
 
-        rate = await self._fetch_frankfurter_rate(base, target)
-        if rate and rate > 0:
-            return {
-                "base_currency": base,
-                "target_currency": target,
-                "rate": float(rate),
-                "source": "frankfurter",
-            }
+    async def _fetch_naver_quote(self, pair: Tuple[str, str]) -> Optional[Dict[str, Union[float, str]]]:
+        return self._build_rate_quote(pair, await self._fetch_naver_detail_rate(*pair), "naver")
+
+    async def _fetch_frankfurter_quote(self, pair: Tuple[str, str]) -> Optional[Dict[str, Union[float, str]]]:
+        return self._build_rate_quote(pair, await self._fetch_frankfurter_rate(*pair), "frankfurter")
 
-        return None
+    @staticmethod
+    def _build_rate_quote(
+        pair: Tuple[str, str], rate: Optional[float], source: str
+    ) -> Optional[Dict[str, Union[float, str]]]:
+        if not rate or rate <= 0:
+            return None
+        return {
+            "base_currency": pair[0],
+            "target_currency": pair[1],
+            "rate": float(rate),
+            "source": source,
+        }
 
+    @timed(upstream="frankfurter")
     async def _fetch_frankfurter_rate(self, base_currency: str, target_currency: str) -> Optional[float]:
         query = urlencode({"base": base_currency.upper(), "symbols": target_currency.upper()})
         url = f"https://api.frankfurter.dev/v1/latest?{query}"
@@ -55,6 +90,7 @@ class CurrencyService:
                 async with session.get(url) as response:
                     if response.status != 200:
                         return None
+                    record_response_bytes(len(await response.read()))
                     data = await response.json()
                     rates = data.get("rates") or {}
                     result = rates.get(target_currency.upper())
@@ -65,17 +101,11 @@ class CurrencyService:
             self.logger.warning("Frankfurter FX fallback failed: %s", exc)
             return None
 
+    @timed(upstream="naver_fx")
     async def _fetch_naver_detail_rate(self, base_currency: str, target_currency: str) -> Optional[float]:
         if target_currency.upper() != "KRW":
             return None
 
-        market_codes = {
-            "USD": "FX_USDKRW",
-            "EUR": "FX_EURKRW",
-            "JPY": "FX_JPYKRW",
-            "CNY": "FX_CNYKRW",
-            "GBP": "FX_GBPKRW",
-        }
         sane_ranges = {
             "USD": (1000, 1700),
             "EUR": (1200, 2000),
@@ -85,7 +115,7 @@ class CurrencyService:
         }
 
         base = base_currency.upper()
-        code = market_codes.get(base)
+        code = NAVER_FX_MARKET_CODES.get(base)
         if not code:
             return None
 
@@ -95,6 +125,7 @@ class CurrencyService:
                 async with session.get(url, headers={"User-Agent": "Mozilla/5.0"}) as response:
                     if response.status != 200:
                         return None
+                    record_response_bytes(len(await response.read()))
                     html = await response.text()
         except Exception as exc:
             self.logger.warning("Naver FX detail fetch failed: %s", exc)
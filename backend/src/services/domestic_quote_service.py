@@ -5,14 +5,27 @@ from typing import Any, Dict, List, Optional
 
 from src.config.settings import settings
 from src.services.naver_stock_service import NaverStockService
+from src.services.quote_router import QuoteProvider, QuoteRouter
+from src.utils.metrics import record_cache_lookup
+
+QUOTE_FIELDS = ("name", "market", "price", "change", "change_percent", "currency")
 
 
 class DomesticQuoteService:
-    def __init__(self, naver_service: Optional[NaverStockService] = None) -> None:
+    PROVIDER_KIND = "domestic_stock"
+
+    def __init__(self, naver_service: Optional[NaverStockService] = None, router: Optional[QuoteRouter] = None) -> None:
         self.logger = logging.getLogger(__name__)
         self.naver = naver_service or NaverStockService()
+        self.router = router or QuoteRouter()
         self.quote_cache: Dict[str, Dict[str, Any]] = {}
         self.quote_cache_ttl = min(settings.CACHE_TIMEOUT, 20)
+        self.router.register(
+            QuoteProvider("naver_direct", self.PROVIDER_KIND, self._fetch_direct_quote, fields=QUOTE_FIELDS, cost=1.0)
+        )
+        self.router.register(
+            QuoteProvider("naver_search", self.PROVIDER_KIND, self._fetch_search_fallback, fields=QUOTE_FIELDS, cost=2.0)
+        )
 
     async def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         normalized_symbol = str(symbol or "").strip().upper()
@@ -23,16 +36,29 @@ class DomesticQuoteService:
         if cached:
             return cached
 
-        quote = await self._fetch_direct_quote(normalized_symbol)
-        if quote:
-            self._save_cached_quote(normalized_symbol, quote)
-            return quote
-
-        quote = await self._fetch_search_fallback(normalized_symbol)
+        quote = await self.router.fetch(self.PROVIDER_KIND, normalized_symbol, required_fields=("price",))
         if quote:
             self._save_cached_quote(normalized_symbol, quote)
         return quote
 
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        normalized = [str(symbol or "").strip().upper() for symbol in symbols]
+        normalized = [symbol for symbol in dict.fromkeys(normalized) if symbol.isdigit()]
+        quotes: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for symbol in normalized:
+            cached = self._get_cached_quote(symbol)
+            if cached:
+                quotes[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        fetched = await self.router.fetch_many(self.PROVIDER_KIND, missing, required_fields=("price",))
+        for symbol, quote in fetched.items():
+            self._save_cached_quote(symbol, quote)
+            quotes[symbol] = quote
+        return quotes
+
     async def enrich_search_results(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         enriched: List[Dict[str, Any]] = []
         for item in items:
@@ -102,10 +128,13 @@ class DomesticQuoteService:
     def _get_cached_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         cached = self.quote_cache.get(symbol)
         if not cached:
+            record_cache_lookup("domestic_quote", False)
             return None
         if time.time() > cached["expires_at"]:
             self.quote_cache.pop(symbol, None)
+            record_cache_lookup("domestic_quote", False)
             return None
+        record_cache_lookup("domestic_quote", True)
         return dict(cached["data"])
 
     def _save_cached_quote(self, symbol: str, quote: Dict[str, Any]) -> None:
@@ -0,0 +1,138 @@
+import asyncio
+import calendar
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+import feedparser
+
+from src.config.settings import settings
+from src.utils.metrics import registry
+from src.utils.timing import time_upstream
+
+FEED_FETCHES = registry.counter("news_feed_fetches_total", "RSS feed lookups by outcome", ("feed", "outcome"))
+
+FEED_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; StockAlertBot/1.0)"}
+
+
+class FeedEntry(NamedTuple):
+    article: Dict[str, str]
+    text: str  # lowered "title summary", matched against news queries
+    published_at: Optional[float]
+
+
+class FeedState:
+    def __init__(self) -> None:
+        self.entries: List[FeedEntry] = []
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.checked_at = 0.0
+        self.inflight: Optional[asyncio.Future] = None
+
+
+def parse_feed(source_name: str, body: bytes) -> List[FeedEntry]:
+    feed = feedparser.parse(body)
+    entries: List[FeedEntry] = []
+    for entry in feed.entries:
+        title = str(entry.get("title", ""))
+        summary = str(entry.get("summary", ""))
+        article = {
+            "title": title,
+            "summary": summary,
+            "url": str(entry.get("link", "")),
+            "published": str(entry.get("published", "")),
+            "source": source_name,
+        }
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        published_at = float(calendar.timegm(published)) if published else None
+        entries.append(FeedEntry(article, f"{title} {summary}".lower(), published_at))
+    return entries
+
+
+class FeedFetcher:
+    """
+    RSS 피드를 연결 풀 하나로 동시에 받아오는 비동기 수집기
+
+    피드마다 ETag/Last-Modified 를 기억해 조건부 요청을 보내고, 304 면 이전 파싱 결과를 그대로 쓴다.
+    refresh_seconds 안에 다시 들어온 조회는 요청 없이 보관된 항목을 돌려준다.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.refresh_seconds = settings.news_feed_refresh_seconds if refresh_seconds is None else refresh_seconds
+        self.states: Dict[str, FeedState] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def fetch_all(self, feeds: Dict[str, str]) -> Dict[str, List[FeedEntry]]:
+        results = await asyncio.gather(*(self.fetch(source_name, url) for source_name, url in feeds.items()))
+        return dict(zip(feeds, results))
+
+    async def fetch(self, source_name: str, url: str) -> List[FeedEntry]:
+        state = self.states.setdefault(url, FeedState())
+        if time.time() - state.checked_at < self.refresh_seconds:
+            FEED_FETCHES.labels(source_name, "fresh").inc()
+            return state.entries
+        if state.inflight is None:
+            state.inflight = asyncio.ensure_future(self._refresh(source_name, url, state))
+            state.inflight.add_done_callback(lambda _: setattr(state, "inflight", None))
+        # shield: a cancelled reader must not abort the fetch other readers are waiting on.
+        return await asyncio.shield(state.inflight)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.request_timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300),
+                headers=FEED_HEADERS,
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _refresh(self, source_name: str, url: str, state: FeedState) -> List[FeedEntry]:
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        try:
+            status, body, validators = await self._request(url, headers)
+        except Exception as exc:
+            # Keep serving the last good entries; retry on the next lookup.
+            self.logger.warning("Feed fetch failed for %s: %s", source_name, exc)
+            FEED_FETCHES.labels(source_name, "error").inc()
+            return state.entries
+
+        if status == 304:
+            FEED_FETCHES.labels(source_name, "not_modified").inc()
+        elif status == 200:
+            try:
+                state.entries = await asyncio.to_thread(parse_feed, source_name, body)
+            except Exception as exc:
+                self.logger.warning("Feed parse failed for %s: %s", source_name, exc)
+                FEED_FETCHES.labels(source_name, "error").inc()
+                return state.entries
+            state.etag, state.last_modified = validators
+            FEED_FETCHES.labels(source_name, "updated").inc()
+        else:
+            self.logger.warning("Feed fetch failed for %s: HTTP %s", source_name, status)
+            FEED_FETCHES.labels(source_name, "error").inc()
+            return state.entries
+        state.checked_at = time.time()
+        return state.entries
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, bytes, Tuple[Optional[str], Optional[str]]]:
+        with time_upstream("rss"):
+            async with self._get_session().get(url, headers=headers) as response:
+                body = await response.read() if response.status == 200 else b""
+                return response.status, body, (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+feed_fetcher = FeedFetcher()
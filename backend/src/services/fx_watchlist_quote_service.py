@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.database import FxRateSnapshot, FxWatchlistItem
 from src.services.currency_service import CurrencyService
+from src.utils.timing import timed
 
 
 class FxWatchlistQuoteService:
@@ -37,6 +38,7 @@ class FxWatchlistQuoteService:
         row_map = {row.pair_key: row for row in rows}
         return [row_map[key] for key in keys if key in row_map]
 
+    @timed()
     async def refresh_snapshots(
         self,
         db: AsyncSession,
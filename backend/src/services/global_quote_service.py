@@ -2,18 +2,46 @@ import logging
 import math
 import time
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
 
 import aiohttp
 import requests
 
 from src.config.settings import settings
 from src.services.naver_stock_service import NaverStockService
+from src.services.quote_router import QuoteProvider, QuoteRouter, record_response_bytes
+from src.utils.metrics import record_cache_lookup
+from src.utils.timing import timed
+
+QUOTE_FIELDS = ("name", "market", "price", "change", "change_percent", "currency")
 
 
 class GlobalQuoteService:
-    def __init__(self, naver_service: Optional[NaverStockService] = None) -> None:
+    PROVIDER_KIND = "global_stock"
+
+    def __init__(self, naver_service: Optional[NaverStockService] = None, router: Optional[QuoteRouter] = None) -> None:
         self.logger = logging.getLogger(__name__)
         self.naver = naver_service or NaverStockService()
+        self.router = router or QuoteRouter()
+        self.router.register(
+            QuoteProvider(
+                "yahoo_chart",
+                self.PROVIDER_KIND,
+                self._fetch_yahoo_quote,
+                fields=QUOTE_FIELDS,
+                cost=1.0,
+                fetch_batch=self._fetch_yahoo_quotes,
+            )
+        )
+        self.router.register(
+            QuoteProvider(
+                "naver_world",
+                self.PROVIDER_KIND,
+                self._fetch_naver_fallback,
+                fields=("name", "market", "price", "change_percent", "currency"),
+                cost=2.0,
+            )
+        )
         self.quote_cache: Dict[str, Dict[str, Any]] = {}
         self.fundamentals_cache: Dict[str, Dict[str, Any]] = {}
         self.quote_cache_ttl = min(settings.CACHE_TIMEOUT, 20)
@@ -28,16 +56,29 @@ class GlobalQuoteService:
         if cached:
             return cached
 
-        quote = await self._fetch_yahoo_quote(normalized_symbol)
-        if quote:
-            self._save_cached_quote(normalized_symbol, quote)
-            return quote
-
-        quote = await self._fetch_naver_fallback(normalized_symbol)
+        quote = await self.router.fetch(self.PROVIDER_KIND, normalized_symbol, required_fields=("price",))
         if quote:
             self._save_cached_quote(normalized_symbol, quote)
         return quote
 
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        normalized = [str(symbol or "").strip().upper() for symbol in symbols]
+        normalized = [symbol for symbol in dict.fromkeys(normalized) if symbol and not symbol.isdigit()]
+        quotes: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for symbol in normalized:
+            cached = self._get_cached_quote(symbol)
+            if cached:
+                quotes[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        fetched = await self.router.fetch_many(self.PROVIDER_KIND, missing, required_fields=("price",))
+        for symbol, quote in fetched.items():
+            self._save_cached_quote(symbol, quote)
+            quotes[symbol] = quote
+        return quotes
+
     async def get_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
         normalized_symbol = str(symbol or "").strip().upper()
         if not normalized_symbol or normalized_symbol.isdigit():
@@ -126,6 +167,39 @@ class GlobalQuoteService:
             "source": f"global:yahoo_extended_quote:{symbol}",
         }
 
+    async def _fetch_yahoo_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        # One multi-symbol quote call; symbols it leaves out are retried one by one through the chart endpoint.
+        url = "https://query1.finance.yahoo.com/v7/finance/quote?" + urlencode({"symbols": ",".join(symbols)})
+        payload = await self._fetch_json(url)
+        requested = set(symbols)
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for result in ((payload or {}).get("quoteResponse") or {}).get("result") or []:
+            symbol = str(result.get("symbol") or "").upper()
+            if symbol not in requested:
+                continue
+            # Like the chart path, the latest trade wins, including pre- and post-market sessions.
+            sessions = [
+                (result.get(f"{prefix}MarketTime") or 0, self._coerce_float(result.get(f"{prefix}MarketPrice")))
+                for prefix in ("regular", "pre", "post")
+            ]
+            prices = [(traded_at, price) for traded_at, price in sessions if price is not None and price > 0]
+            previous_close = self._coerce_float(result.get("regularMarketPreviousClose"))
+            if not prices or previous_close in (None, 0):
+                continue
+            price = max(prices, key=lambda item: item[0])[1]
+            change_value = price - previous_close
+            quotes[symbol] = {
+                "symbol": symbol,
+                "name": result.get("shortName") or result.get("longName") or symbol,
+                "price": price,
+                "change": round(change_value, 4),
+                "change_percent": self._truncate_percent((change_value / previous_close) * 100),
+                "currency": result.get("currency", "USD"),
+                "market": self._normalize_yahoo_market(result.get("exchange") or result.get("fullExchangeName")),
+                "source": f"global:yahoo_batch_quote:{symbol}",
+            }
+        return quotes
+
     async def _fetch_yahoo_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
         url = (
             "https://query1.finance.yahoo.com/ws/fundamentals-timeseries/v1/finance/timeseries/"
@@ -196,6 +270,7 @@ class GlobalQuoteService:
             return None
         return parsed
 
+    @timed(upstream="yahoo")
     async def _fetch_json(self, url: str) -> Optional[Dict[str, Any]]:
         timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
         headers = {"User-Agent": "Mozilla/5.0"}
@@ -203,6 +278,7 @@ class GlobalQuoteService:
             async with aiohttp.ClientSession(timeout=timeout) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
+                        record_response_bytes(len(await response.read()))
                         return await response.json()
                     self.logger.warning("Yahoo fetch failed: %s %s", url, response.status)
         except Exception as exc:
@@ -211,6 +287,7 @@ class GlobalQuoteService:
         try:
             response = requests.get(url, headers=headers, timeout=settings.request_timeout)
             if response.status_code == 200:
+                record_response_bytes(len(response.content))
                 return response.json()
             self.logger.warning("Yahoo requests fallback failed: %s %s", url, response.status_code)
         except Exception as exc:
@@ -220,10 +297,13 @@ class GlobalQuoteService:
     def _get_cached_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         cached = self.quote_cache.get(symbol)
         if not cached:
+            record_cache_lookup("global_quote", False)
             return None
         if time.time() > cached["expires_at"]:
             self.quote_cache.pop(symbol, None)
+            record_cache_lookup("global_quote", False)
             return None
+        record_cache_lookup("global_quote", True)
         return dict(cached["data"])
 
     def _save_cached_quote(self, symbol: str, quote: Dict[str, Any]) -> None:
@@ -235,10 +315,13 @@ class GlobalQuoteService:
     def _get_cached_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
         cached = self.fundamentals_cache.get(symbol)
         if not cached:
+            record_cache_lookup("global_fundamentals", False)
             return None
         if time.time() > cached["expires_at"]:
             self.fundamentals_cache.pop(symbol, None)
+            record_cache_lookup("global_fundamentals", False)
             return None
+        record_cache_lookup("global_fundamentals", True)
         return dict(cached["data"])
 
     def _save_cached_fundamentals(self, symbol: str, fundamentals: Dict[str, Any]) -> None:
@@ -0,0 +1,273 @@
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Block length for the closed-form EMA: decay ** -EMA_BLOCK must stay far from float64 overflow
+# for the shortest period we use (9 -> 0.8 ** -128 ~ 2e12), which keeps relative error near 1e-14.
+EMA_BLOCK = 128
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """values[0]에서 시작하는 EMA 전체 시계열 (기존 순차 계산과 동일한 시드)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+    alpha = 2 / (period + 1)
+    decay = 1 - alpha
+    steps = np.arange(EMA_BLOCK, dtype=np.float64)
+    growth = decay ** steps
+    shrink = decay ** -steps
+    out[0] = values[0]
+    previous = values[0]
+    for start in range(1, len(values), EMA_BLOCK):
+        block = values[start:start + EMA_BLOCK]
+        size = len(block)
+        # ema[s+j] = decay^(j+1) * ema[s-1] + alpha * decay^j * sum_k<=j(x[s+k] * decay^-k)
+        weighted = np.cumsum(block * shrink[:size])
+        out[start:start + size] = growth[:size] * (decay * previous + alpha * weighted)
+        previous = out[start + size - 1]
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    windows = sliding_window_view(values, window)
+    deviation = windows.std(axis=1)
+    # A flat window must be exactly 0 (pstdev semantics); the float mean can be off by an ulp.
+    deviation[windows.max(axis=1) == windows.min(axis=1)] = 0.0
+    out[window - 1:] = deviation
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    out[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return out
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    out[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return out
+
+
+def trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    # Like rolling_mean but the first window-1 bars average whatever is available (stochastic smoothing).
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(len(values))
+    starts = np.maximum(0, index - window + 1)
+    return (sums[index + 1] - sums[starts]) / (index - starts + 1)
+
+
+def _last(values: np.ndarray) -> Optional[float]:
+    if not len(values):
+        return None
+    value = float(values[-1])
+    return None if math.isnan(value) else value
+
+
+class IndicatorSeries:
+    """봉 단위 지표 시계열. 마지막 값은 latest()로 기존 _calculate_* 결과 형식으로 제공"""
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self.latest_close: Optional[float] = None
+        self.rsi = np.full(length, np.nan)
+        self.ema_fast = np.full(length, np.nan)
+        self.ema_slow = np.full(length, np.nan)
+        self.macd = np.full(length, np.nan)
+        self.macd_signal = np.full(length, np.nan)
+        self.macd_histogram = np.full(length, np.nan)
+        self.stoch_k = np.full(length, np.nan)
+        self.stoch_d = np.full(length, np.nan)
+        self.true_range = np.full(length, np.nan)
+        self.atr = np.full(length, np.nan)
+        self.bollinger_middle = np.full(length, np.nan)
+        self.bollinger_upper = np.full(length, np.nan)
+        self.bollinger_lower = np.full(length, np.nan)
+        self.volume_ratio: Optional[float] = None
+
+    def latest(self) -> Dict[str, object]:
+        return {
+            "rsi": _last(self.rsi),
+            "macd": self._latest_macd(),
+            "stochastic": self._latest_stochastic(),
+            "atr": _last(self.atr),
+            "bollinger": self._latest_bollinger(),
+            "volume_ratio": self.volume_ratio,
+        }
+
+    def _latest_macd(self) -> Dict[str, object]:
+        macd_line = _last(self.macd)
+        if macd_line is None:
+            return {"macd_line": None, "signal_line": None, "histogram": None, "golden_cross": False, "dead_cross": False}
+        signal_line = float(self.macd_signal[-1])
+        prev_macd = float(self.macd[-2])
+        prev_signal = float(self.macd_signal[-2])
+        return {
+            "macd_line": macd_line,
+            "signal_line": signal_line,
+            "histogram": macd_line - signal_line,
+            "golden_cross": prev_macd <= prev_signal and macd_line > signal_line,
+            "dead_cross": prev_macd >= prev_signal and macd_line < signal_line,
+        }
+
+    def _latest_stochastic(self) -> Dict[str, object]:
+        k_value = _last(self.stoch_k)
+        if k_value is None or self.length < 2:
+            return {"k": None, "d": None, "golden_cross": False, "dead_cross": False}
+        d_value = float(self.stoch_d[-1])
+        prev_k = float(self.stoch_k[-2])
+        prev_d = float(self.stoch_d[-2])
+        return {
+            "k": k_value,
+            "d": d_value,
+            "golden_cross": prev_k <= prev_d and k_value > d_value,
+            "dead_cross": prev_k >= prev_d and k_value < d_value,
+        }
+
+    def _latest_bollinger(self) -> Dict[str, Optional[float]]:
+        middle = _last(self.bollinger_middle)
+        if middle is None:
+            return {"middle": None, "upper": None, "lower": None, "bandwidth": None, "position": None}
+        upper = float(self.bollinger_upper[-1])
+        lower = float(self.bollinger_lower[-1])
+        return {
+            "middle": middle,
+            "upper": upper,
+            "lower": lower,
+            "bandwidth": ((upper - lower) / middle) if middle else None,
+            "position": 0.5 if upper == lower else (self.latest_close - lower) / (upper - lower),
+        }
+
+
+class IndicatorEngine:
+    """NumPy 배열 기반 기술적 지표 일괄 계산기"""
+
+    RSI_PERIOD = 14
+    MACD_FAST = 12
+    MACD_SLOW = 26
+    MACD_SIGNAL = 9
+    MACD_MIN_BARS = 35
+    STOCH_PERIOD = 14
+    STOCH_SMOOTH = 3
+    ATR_PERIOD = 14
+    BOLLINGER_PERIOD = 20
+    BOLLINGER_MULTIPLIER = 2.0
+    VOLUME_PERIOD = 20
+
+    def compute(
+        self,
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+        bollinger_period: Optional[int] = None,
+    ) -> IndicatorSeries:
+        high = np.asarray(highs, dtype=np.float64)
+        low = np.asarray(lows, dtype=np.float64)
+        close = np.asarray(closes, dtype=np.float64)
+        volume = np.asarray(volumes, dtype=np.float64)
+        length = len(close)
+        series = IndicatorSeries(length)
+        if not length:
+            return series
+        series.latest_close = float(close[-1])
+
+        self._fill_rsi(series, close)
+        self._fill_macd(series, close)
+        self._fill_stochastic(series, high, low, close)
+        self._fill_atr(series, high, low, close)
+        self._fill_bollinger(series, close, bollinger_period or min(self.BOLLINGER_PERIOD, length))
+        series.volume_ratio = self._volume_ratio(volume)
+        return series
+
+    def _fill_rsi(self, series: IndicatorSeries, close: np.ndarray) -> None:
+        period = self.RSI_PERIOD
+        if len(close) <= period:
+            return
+        delta = np.diff(close)
+        avg_gain = rolling_mean(np.maximum(delta, 0.0), period)
+        avg_loss = rolling_mean(np.maximum(-delta, 0.0), period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        rsi = np.where(avg_loss == 0, 100.0, rsi)
+        # rsi over deltas[i-period:i] belongs to bar i
+        series.rsi[1:] = np.where(np.isnan(avg_gain), np.nan, rsi)
+
+    def _fill_macd(self, series: IndicatorSeries, close: np.ndarray) -> None:
+        series.ema_fast = ema(close, self.MACD_FAST)
+        series.ema_slow = ema(close, self.MACD_SLOW)
+        if len(close) < self.MACD_MIN_BARS:
+            return
+        series.macd = series.ema_fast - series.ema_slow
+        series.macd_signal = ema(series.macd, self.MACD_SIGNAL)
+        series.macd_histogram = series.macd - series.macd_signal
+
+    def _fill_stochastic(self, series: IndicatorSeries, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        period, smooth = self.STOCH_PERIOD, self.STOCH_SMOOTH
+        if len(close) < period + smooth:
+            return
+        highest = rolling_max(high, period)[period - 1:]
+        lowest = rolling_min(low, period)[period - 1:]
+        span = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fast_k = np.where(span == 0, 50.0, (close[period - 1:] - lowest) / span * 100)
+        slow_k = trailing_mean(fast_k, smooth)
+        series.stoch_k[period - 1:] = slow_k
+        series.stoch_d[period - 1:] = trailing_mean(slow_k, smooth)
+
+    def _fill_atr(self, series: IndicatorSeries, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        if len(close) < 2:
+            return
+        previous_close = close[:-1]
+        true_range = np.maximum.reduce(
+            [high[1:] - low[1:], np.abs(high[1:] - previous_close), np.abs(low[1:] - previous_close)]
+        )
+        series.true_range[1:] = true_range
+        if len(close) > self.ATR_PERIOD:
+            series.atr[1:] = rolling_mean(true_range, self.ATR_PERIOD)
+
+    def _fill_bollinger(self, series: IndicatorSeries, close: np.ndarray, period: int) -> None:
+        if len(close) < period:
+            return
+        middle = rolling_mean(close, period)
+        deviation = rolling_std(close, period)
+        series.bollinger_middle = middle
+        series.bollinger_upper = middle + self.BOLLINGER_MULTIPLIER * deviation
+        series.bollinger_lower = middle - self.BOLLINGER_MULTIPLIER * deviation
+
+    def _volume_ratio(self, volume: np.ndarray) -> Optional[float]:
+        period = self.VOLUME_PERIOD
+        if len(volume) <= period:
+            return None
+        positive = volume[volume > 0]
+        if not len(positive):
+            return None
+        recent = volume[-period:]
+        recent = recent[recent > 0]
+        average = float(recent.mean()) if len(recent) else 0.0
+        if average <= 0:
+            return None
+        ratio = float(positive[-1]) / average
+        if ratio < 0.05:
+            return None
+        return ratio
+
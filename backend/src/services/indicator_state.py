@@ -0,0 +1,326 @@
+import bisect
+import json
+import os
+from collections import deque
+from statistics import mean, pstdev
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services.indicator_engine import IndicatorEngine, ema
+
+E = IndicatorEngine
+_WINDOWS = {
+    "gains": E.RSI_PERIOD,
+    "losses": E.RSI_PERIOD,
+    "true_ranges": E.ATR_PERIOD,
+    "high_window": E.STOCH_PERIOD,
+    "low_window": E.STOCH_PERIOD,
+    "fast_k": E.STOCH_SMOOTH,
+    "slow_k": E.STOCH_SMOOTH,
+    "close_window": E.BOLLINGER_PERIOD,
+    "volume_window": E.VOLUME_PERIOD,
+}
+_SCALARS = (
+    "count",
+    "first_timestamp",
+    "last_timestamp",
+    "last_close",
+    "ema_fast",
+    "ema_slow",
+    "macd",
+    "macd_signal",
+    "prev_macd",
+    "prev_signal",
+    "stoch_k",
+    "stoch_d",
+    "prev_k",
+    "prev_d",
+    "last_nonzero_volume",
+)
+# Bars replayed on top of seeded EMAs when building from a full history; must cover the longest
+# dependency chain of the windowed indicators (stochastic: 14 + 3 + 3 bars, plus one for crossovers).
+WARMUP_BARS = 32
+
+
+class IndicatorState:
+    """
+    (심볼, 봉 간격)별 스트리밍 지표 상태
+
+    새 봉 하나당 작업량은 가장 긴 윈도우(20봉)로 제한되어 전체 히스토리 길이와 무관하다.
+    마지막 봉은 아직 확정되지 않은 봉일 수 있으므로 직전 상태를 체크포인트로 보관해 수정할 수 있다.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+        self.last_close: Optional[float] = None
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.macd: Optional[float] = None
+        self.macd_signal: Optional[float] = None
+        self.prev_macd: Optional[float] = None
+        self.prev_signal: Optional[float] = None
+        self.stoch_k: Optional[float] = None
+        self.stoch_d: Optional[float] = None
+        self.prev_k: Optional[float] = None
+        self.prev_d: Optional[float] = None
+        self.last_nonzero_volume: Optional[float] = None
+        for name, size in _WINDOWS.items():
+            setattr(self, name, deque(maxlen=size))
+        self.checkpoint: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_history(
+        cls,
+        timestamps: Sequence[int],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+    ) -> "IndicatorState":
+        state = cls()
+        length = len(closes)
+        start = max(0, length - WARMUP_BARS)
+        if start:
+            # EMAs depend on the whole series, so seed them with the vectorized pass and replay only the tail.
+            close = np.asarray(closes[:start], dtype=np.float64)
+            ema_fast = ema(close, E.MACD_FAST)
+            ema_slow = ema(close, E.MACD_SLOW)
+            macd = ema_fast - ema_slow
+            signal = ema(macd, E.MACD_SIGNAL)
+            volume = np.asarray(volumes[:start], dtype=np.float64)
+            positive = volume[volume > 0]
+            state.count = start
+            state.first_timestamp = int(timestamps[0])
+            state.last_timestamp = int(timestamps[start - 1])
+            state.last_close = float(close[-1])
+            state.ema_fast = float(ema_fast[-1])
+            state.ema_slow = float(ema_slow[-1])
+            state.macd = float(macd[-1])
+            state.macd_signal = float(signal[-1])
+            state.last_nonzero_volume = float(positive[-1]) if len(positive) else None
+        for index in range(start, length):
+            state.push(timestamps[index], highs[index], lows[index], closes[index], volumes[index])
+        return state
+
+    def push(self, timestamp: int, high: float, low: float, close: float, volume: float) -> None:
+        self.checkpoint = self._core()
+        self._apply(int(timestamp), float(high), float(low), float(close), float(volume or 0.0))
+
+    def revise_last(self, timestamp: int, high: float, low: float, close: float, volume: float) -> None:
+        # The in-progress bar changed (new tick, or the partial bar got a new timestamp): undo it and re-apply.
+        if self.checkpoint is None:
+            raise ValueError("No bar to revise")
+        self._load_core(self.checkpoint)
+        self.push(timestamp, high, low, close, volume)
+
+    def sync(
+        self,
+        timestamps: Sequence[int],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+        max_incremental_bars: int = WARMUP_BARS,
+    ) -> bool:
+        """
+        히스토리와 상태를 맞춘다. 마지막 확정 봉 이후 봉만 반영하면 True, 전체 재계산이면 False
+        """
+        anchor = self.checkpoint.get("last_timestamp") if self.checkpoint else None
+        # EMA seeds and count belong to the window the state was built from; once Yahoo's window slides, start over.
+        same_window = len(timestamps) > 0 and self.first_timestamp == int(timestamps[0])
+        if anchor is not None and same_window:
+            index = bisect.bisect_left(timestamps, anchor)
+            if index < len(timestamps) and timestamps[index] == anchor and len(timestamps) - index - 1 <= max_incremental_bars:
+                self._load_core(self.checkpoint)
+                self.checkpoint = None
+                for position in range(index + 1, len(timestamps)):
+                    self.push(timestamps[position], highs[position], lows[position], closes[position], volumes[position])
+                return True
+        rebuilt = self.from_history(timestamps, highs, lows, closes, volumes)
+        self.__dict__.update(rebuilt.__dict__)
+        return False
+
+    def latest(self) -> Dict[str, object]:
+        return {
+            "rsi": self._latest_rsi(),
+            "macd": self._latest_macd(),
+            "stochastic": self._latest_stochastic(),
+            "atr": mean(self.true_ranges) if self.count > E.ATR_PERIOD else None,
+            "bollinger": self._latest_bollinger(),
+            "volume_ratio": self._latest_volume_ratio(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._core()
+        data["checkpoint"] = self.checkpoint
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        state = cls()
+        state._load_core(data)
+        state.checkpoint = data.get("checkpoint")
+        return state
+
+    def _apply(self, timestamp: int, high: float, low: float, close: float, volume: float) -> None:
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        if self.last_close is None:
+            self.ema_fast = self.ema_slow = close
+            self.macd = self.macd_signal = 0.0
+        else:
+            delta = close - self.last_close
+            self.gains.append(max(delta, 0.0))
+            self.losses.append(max(-delta, 0.0))
+            self.true_ranges.append(max(high - low, abs(high - self.last_close), abs(low - self.last_close)))
+            self.ema_fast += (close - self.ema_fast) * (2 / (E.MACD_FAST + 1))
+            self.ema_slow += (close - self.ema_slow) * (2 / (E.MACD_SLOW + 1))
+            self.prev_macd, self.prev_signal = self.macd, self.macd_signal
+            self.macd = self.ema_fast - self.ema_slow
+            self.macd_signal += (self.macd - self.macd_signal) * (2 / (E.MACD_SIGNAL + 1))
+
+        self.high_window.append(high)
+        self.low_window.append(low)
+        if len(self.high_window) == E.STOCH_PERIOD:
+            highest, lowest = max(self.high_window), min(self.low_window)
+            self.fast_k.append(50.0 if highest == lowest else (close - lowest) / (highest - lowest) * 100)
+            self.prev_k, self.prev_d = self.stoch_k, self.stoch_d
+            self.stoch_k = mean(self.fast_k)
+            self.slow_k.append(self.stoch_k)
+            self.stoch_d = mean(self.slow_k)
+
+        self.close_window.append(close)
+        self.volume_window.append(volume)
+        if volume > 0:
+            self.last_nonzero_volume = volume
+        self.count += 1
+        self.last_close = close
+        self.last_timestamp = timestamp
+
+    def _latest_rsi(self) -> Optional[float]:
+        if self.count <= E.RSI_PERIOD:
+            return None
+        avg_gain, avg_loss = mean(self.gains), mean(self.losses)
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def _latest_macd(self) -> Dict[str, object]:
+        if self.count < E.MACD_MIN_BARS:
+            return {"macd_line": None, "signal_line": None, "histogram": None, "golden_cross": False, "dead_cross": False}
+        return {
+            "macd_line": self.macd,
+            "signal_line": self.macd_signal,
+            "histogram": self.macd - self.macd_signal,
+            "golden_cross": self.prev_macd <= self.prev_signal and self.macd > self.macd_signal,
+            "dead_cross": self.prev_macd >= self.prev_signal and self.macd < self.macd_signal,
+        }
+
+    def _latest_stochastic(self) -> Dict[str, object]:
+        if self.count < E.STOCH_PERIOD + E.STOCH_SMOOTH or self.prev_k is None:
+            return {"k": None, "d": None, "golden_cross": False, "dead_cross": False}
+        return {
+            "k": self.stoch_k,
+            "d": self.stoch_d,
+            "golden_cross": self.prev_k <= self.prev_d and self.stoch_k > self.stoch_d,
+            "dead_cross": self.prev_k >= self.prev_d and self.stoch_k < self.stoch_d,
+        }
+
+    def _latest_bollinger(self) -> Dict[str, Optional[float]]:
+        window = list(self.close_window)
+        if not window:
+            return {"middle": None, "upper": None, "lower": None, "bandwidth": None, "position": None}
+        middle = mean(window)
+        deviation = pstdev(window) if len(window) > 1 else 0.0
+        upper = middle + E.BOLLINGER_MULTIPLIER * deviation
+        lower = middle - E.BOLLINGER_MULTIPLIER * deviation
+        return {
+            "middle": middle,
+            "upper": upper,
+            "lower": lower,
+            "bandwidth": ((upper - lower) / middle) if middle else None,
+            "position": 0.5 if upper == lower else (self.last_close - lower) / (upper - lower),
+        }
+
+    def _latest_volume_ratio(self) -> Optional[float]:
+        if self.count <= E.VOLUME_PERIOD or self.last_nonzero_volume is None:
+            return None
+        recent = [value for value in self.volume_window if value > 0]
+        average = mean(recent) if recent else 0
+        if average <= 0:
+            return None
+        ratio = self.last_nonzero_volume / average
+        return None if ratio < 0.05 else ratio
+
+    def _core(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: getattr(self, name) for name in _SCALARS}
+        data.update({name: list(getattr(self, name)) for name in _WINDOWS})
+        return data
+
+    def _load_core(self, data: Dict[str, Any]) -> None:
+        for name in _SCALARS:
+            setattr(self, name, data.get(name))
+        self.count = int(self.count or 0)
+        for name, size in _WINDOWS.items():
+            setattr(self, name, deque(data.get(name) or [], maxlen=size))
+
+
+class IndicatorStateStore:
+    """(심볼, 봉 간격)별 IndicatorState 보관소 (메모리, 스냅샷/복원 지원)"""
+
+    def __init__(self, max_states: int = 1000) -> None:
+        self.max_states = max_states
+        self.states: Dict[Tuple[str, str], IndicatorState] = {}
+        self.incremental_updates = 0
+        self.rebuilds = 0
+
+    def sync(
+        self,
+        key: Tuple[str, str],
+        timestamps: Sequence[int],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+    ) -> IndicatorState:
+        state = self.states.pop(key, None)
+        if state is None:
+            state = IndicatorState.from_history(timestamps, highs, lows, closes, volumes)
+            self.rebuilds += 1
+        elif state.sync(timestamps, highs, lows, closes, volumes):
+            self.incremental_updates += 1
+        else:
+            self.rebuilds += 1
+        # Re-inserting keeps the dict in least-recently-used order for eviction.
+        self.states[key] = state
+        while len(self.states) > self.max_states:
+            self.states.pop(next(iter(self.states)))
+        return state
+
+    def get(self, key: Tuple[str, str]) -> Optional[IndicatorState]:
+        return self.states.get(key)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {f"{symbol}|{interval}": state.to_dict() for (symbol, interval), state in self.states.items()}
+
+    def restore(self, data: Dict[str, Dict[str, Any]]) -> None:
+        for raw_key, payload in data.items():
+            symbol, _, interval = raw_key.rpartition("|")
+            self.states[(symbol, interval)] = IndicatorState.from_dict(payload)
+
+    def save(self, path: str) -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        self.restore(data)
+        return len(data)
@@ -1,54 +1,45 @@
 import asyncio
+import hashlib
+import json
 import logging
 import time
 from statistics import mean
 from typing import Dict, List, Optional, Tuple
 
-import aiohttp
-
-from src.config.settings import settings
+from src.services.market_indicator_board import (
+    DOMESTIC_MARKET_SYMBOLS,
+    GLOBAL_MARKET_SYMBOLS,
+    MarketIndicatorBoard,
+    market_indicator_board,
+)
+from src.services.news_lexicon import NEGATIVE_WORDS, POSITIVE_WORDS, TOPIC_GROUPS, news_lexicon
 from src.services.news_service import NewsService
+from src.utils.metrics import record_cache_lookup
+from src.utils.server_timing import stage
+from src.utils.timing import timed
 
 
 class MarketContextService:
-    GLOBAL_MARKET_SYMBOLS = {
-        "sp500": {"label": "S&P500", "candidates": ["^GSPC"]},
-        "nasdaq": {"label": "나스닥", "candidates": ["^IXIC"]},
-        "dow": {"label": "다우", "candidates": ["^DJI"]},
-        "vix": {"label": "VIX", "candidates": ["^VIX"]},
-        "tnx": {"label": "미국 10년물", "candidates": ["^TNX"]},
-        "dxy": {"label": "달러지수", "candidates": ["DX-Y.NYB", "DX=F"]},
-        "oil": {"label": "WTI", "candidates": ["CL=F"]},
-        "gold": {"label": "금", "candidates": ["GC=F"]},
-    }
-    DOMESTIC_MARKET_SYMBOLS = {
-        "kospi": {"label": "코스피", "candidates": ["^KS11"]},
-        "kosdaq": {"label": "코스닥", "candidates": ["^KQ11"]},
-        "usdkrw": {"label": "USD/KRW", "candidates": ["KRW=X"]},
-        "oil": {"label": "WTI", "candidates": ["CL=F"]},
-        "gold": {"label": "금", "candidates": ["GC=F"]},
-        "vix": {"label": "VIX", "candidates": ["^VIX"]},
-    }
-
-    TOPIC_GROUPS = {
-        "금리": {"keywords": ["rate", "fed", "treasury", "yield", "bond"], "weight": -1},
-        "물가": {"keywords": ["inflation", "cpi", "ppi", "price pressure"], "weight": -1},
-        "관세": {"keywords": ["tariff", "duty", "trade tension"], "weight": -1},
-        "지정학": {"keywords": ["war", "attack", "missile", "drone", "conflict", "ceasefire", "sanction"], "weight": -2},
-        "원자재": {"keywords": ["oil", "crude", "gold", "energy"], "weight": -1},
-        "정책완화": {"keywords": ["cut", "stimulus", "easing"], "weight": 1},
-        "성장산업": {"keywords": ["ai", "chip", "semiconductor", "cloud"], "weight": 1},
-    }
-
-    POSITIVE_WORDS = ["beat", "surge", "growth", "partnership", "record", "gain", "rally", "strong", "upgrade"]
-    NEGATIVE_WORDS = ["fall", "drop", "delay", "risk", "probe", "cut", "warn", "miss", "downgrade", "weak"]
-
-    def __init__(self, news_service: Optional[NewsService] = None) -> None:
+    GLOBAL_MARKET_SYMBOLS = GLOBAL_MARKET_SYMBOLS
+    DOMESTIC_MARKET_SYMBOLS = DOMESTIC_MARKET_SYMBOLS
+    TOPIC_GROUPS = TOPIC_GROUPS
+    POSITIVE_WORDS = POSITIVE_WORDS
+    NEGATIVE_WORDS = NEGATIVE_WORDS
+
+    def __init__(
+        self,
+        news_service: Optional[NewsService] = None,
+        indicator_board: Optional[MarketIndicatorBoard] = None,
+    ) -> None:
         self.logger = logging.getLogger(__name__)
         self.news_service = news_service or NewsService()
+        self.indicator_board = indicator_board or market_indicator_board
         self.context_cache: Dict[str, Dict[str, object]] = {}
         self.context_cache_ttl = 60
+        self.scope_cache: Dict[str, Dict[str, object]] = {}
+        self._scope_inflight: Dict[str, asyncio.Future] = {}
 
+    @timed()
     async def build_context(self, asset_type: str, symbol: str, name: str, market_scope: str = "global") -> Dict:
         cache_key = f"{asset_type}:{symbol.upper()}:{market_scope}"
         cached = self._get_cached_context(cache_key)
@@ -82,6 +73,7 @@ class MarketContextService:
             "related_articles": related_articles,
             "macro_articles": macro_articles,
         }
+        context["version"] = self._context_version(context)
         self._save_cached_context(cache_key, context)
         return context
 
@@ -90,111 +82,65 @@ class MarketContextService:
         if name and name.lower() != symbol.lower():
             queries.append(name)
 
-        related_results = await asyncio.gather(
-            *(self.news_service.get_latest_news(query=query, limit=4) for query in queries[:2]),
-            return_exceptions=True,
-        )
+        with stage("context_news"):
+            related_results = await asyncio.gather(
+                *(self.news_service.get_latest_news(query=query, limit=4) for query in queries[:2]),
+                return_exceptions=True,
+            )
         related_articles: List[Dict[str, str]] = []
-        seen_titles = set()
+        seen = set()
         for articles in related_results:
             if isinstance(articles, Exception):
                 continue
             for article in articles:
-                title = article.get("title", "")
-                if title in seen_titles:
+                # The store already folded syndicated copies into one article, so its URL identifies the story.
+                key = article.get("url") or article.get("title", "")
+                if key in seen:
                     continue
-                seen_titles.add(title)
+                seen.add(key)
                 related_articles.append(article)
 
+        with stage("context_macro_indicators"):
+            macro_articles, indicators = await self.get_scope_inputs(market_scope)
+        return related_articles[:4], macro_articles[:10], indicators
+
+    async def get_scope_inputs(self, market_scope: str) -> Tuple[List[Dict[str, str]], Dict[str, Dict]]:
+        """
+        시장 범위(국내/해외)별 거시 뉴스와 지수 지표
+
+        종목과 무관한 입력이라 범위당 한 번만 조회해 공유하고, 동시에 들어온 요청은 진행 중인 조회를 함께 기다린다.
+        """
+        cached = self.scope_cache.get(market_scope)
+        if cached and time.time() <= float(cached["expires_at"]):
+            record_cache_lookup("market_scope_inputs", True)
+            return cached["data"]
+        record_cache_lookup("market_scope_inputs", False)
+
+        pending = self._scope_inflight.get(market_scope)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_scope_inputs(market_scope))
+            self._scope_inflight[market_scope] = pending
+            pending.add_done_callback(lambda _: self._scope_inflight.pop(market_scope, None))
+        # shield: one waiter being cancelled (e.g. a dropped batch stream) must not cancel the shared fetch.
+        return await asyncio.shield(pending)
+
+    async def _fetch_scope_inputs(self, market_scope: str) -> Tuple[List[Dict[str, str]], Dict[str, Dict]]:
         macro_articles, indicators = await asyncio.gather(
             self.news_service.get_latest_news(limit=10),
             self._fetch_market_indicators(market_scope),
         )
-        return related_articles[:4], macro_articles[:10], indicators
+        data = (macro_articles, indicators)
+        self.scope_cache[market_scope] = {"data": data, "expires_at": time.time() + self.context_cache_ttl}
+        return data
 
     async def _fetch_market_indicators(self, market_scope: str) -> Dict[str, Dict]:
-        symbol_map = self.DOMESTIC_MARKET_SYMBOLS if market_scope == "domestic" else self.GLOBAL_MARKET_SYMBOLS
-        tasks = {
-            key: asyncio.create_task(self._fetch_indicator_with_fallback(config["candidates"], config["label"]))
-            for key, config in symbol_map.items()
-        }
-        results: Dict[str, Dict] = {}
-        for key, task in tasks.items():
-            payload = await task
-            if payload:
-                results[key] = payload
-        return results
-
-    async def _fetch_indicator_with_fallback(self, candidates: List[str], label: str) -> Optional[Dict]:
-        for candidate in candidates:
-            payload = await self._fetch_indicator_snapshot(candidate, label)
-            if payload:
-                return payload
-        return None
-
-    async def _fetch_indicator_snapshot(self, symbol: str, label: str) -> Optional[Dict]:
-        quote_url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={symbol}"
-        timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(quote_url, headers={"User-Agent": "Mozilla/5.0"}) as response:
-                    if response.status == 200:
-                        payload = await response.json()
-                        result = (((payload or {}).get("quoteResponse") or {}).get("result") or [None])[0]
-                        if result:
-                            latest = result.get("regularMarketPrice")
-                            previous = result.get("regularMarketPreviousClose")
-                            if latest is not None and previous not in (None, 0):
-                                change_percent = ((float(latest) - float(previous)) / float(previous)) * 100
-                                return {
-                                    "symbol": symbol,
-                                    "label": label,
-                                    "price": round(float(latest), 4),
-                                    "change_percent": round(change_percent, 2),
-                                    "trend_5d": None,
-                                }
-        except Exception as exc:
-            self.logger.warning("Market context fetch failed for %s: %s", symbol, exc)
-        chart_url = (
-            "https://query1.finance.yahoo.com/v8/finance/chart/"
-            f"{symbol}?range=5d&interval=1d&includePrePost=false"
-        )
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(chart_url, headers={"User-Agent": "Mozilla/5.0"}) as response:
-                    if response.status != 200:
-                        return None
-                    payload = await response.json()
-        except Exception as exc:
-            self.logger.warning("Market context chart fallback failed for %s: %s", symbol, exc)
-            return None
-
-        result = (((payload or {}).get("chart") or {}).get("result") or [None])[0]
-        if not result:
-            return None
-        quote = (((result.get("indicators") or {}).get("quote") or [None])[0]) or {}
-        closes = [float(value) for value in (quote.get("close") or []) if value is not None]
-        if len(closes) < 2:
-            return None
-        latest = closes[-1]
-        previous = closes[-2]
-        if previous == 0:
-            return None
-        change_percent = ((latest - previous) / previous) * 100
-        trend_5d = ((latest - closes[0]) / closes[0]) * 100 if closes[0] else 0.0
-        return {
-            "symbol": symbol,
-            "label": label,
-            "price": round(latest, 4),
-            "change_percent": round(change_percent, 2),
-            "trend_5d": round(trend_5d, 2),
-        }
+        return await self.indicator_board.get(market_scope)
 
     def _evaluate_news(self, asset_type: str, related_articles: List[Dict[str, str]], macro_articles: List[Dict[str, str]]) -> Dict:
         related_positive = 0
         related_negative = 0
         for article in related_articles:
-            sentiment = self._classify_article_sentiment(article)
+            sentiment = news_lexicon.classify(article).sentiment
             if sentiment > 0:
                 related_positive += 1
             elif sentiment < 0:
@@ -203,11 +149,9 @@ class MarketContextService:
         topic_counts: Dict[str, int] = {}
         topic_score = 0
         for article in macro_articles:
-            for topic, config in self.TOPIC_GROUPS.items():
-                combined = f"{article.get('title', '')} {article.get('summary', '')}".lower()
-                if any(keyword in combined for keyword in config["keywords"]):
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
-                    topic_score += config["weight"]
+            for topic in news_lexicon.classify(article).topics:
+                topic_counts[topic] = topic_counts.get(topic, 0) + 1
+                topic_score += int(self.TOPIC_GROUPS[topic]["weight"])
 
         delta = 0
         reasons: List[str] = []
@@ -257,12 +201,21 @@ class MarketContextService:
     def _get_cached_context(self, cache_key: str) -> Optional[Dict]:
         cached = self.context_cache.get(cache_key)
         if not cached:
+            record_cache_lookup("market_context", False)
             return None
         if time.time() > float(cached["expires_at"]):
             self.context_cache.pop(cache_key, None)
+            record_cache_lookup("market_context", False)
             return None
+        record_cache_lookup("market_context", True)
         return dict(cached["data"])  # shallow copy is enough for read-only UI payload
 
+    @staticmethod
+    def _context_version(context: Dict) -> str:
+        # Content digest: rebuilding an unchanged context keeps its version, so downstream result caches stay valid.
+        payload = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
     def _save_cached_context(self, cache_key: str, context: Dict) -> None:
         self.context_cache[cache_key] = {
             "data": dict(context),
@@ -453,13 +406,3 @@ class MarketContextService:
         if not ordered:
             return ""
         return f"실시간 시장 지표는 {', '.join(ordered[:5])} 흐름입니다."
-
-    def _classify_article_sentiment(self, article: Dict[str, str]) -> int:
-        combined = f"{article.get('title', '')} {article.get('summary', '')}".lower()
-        positive = sum(1 for word in self.POSITIVE_WORDS if word in combined)
-        negative = sum(1 for word in self.NEGATIVE_WORDS if word in combined)
-        if positive > negative:
-            return 1
-        if negative > positive:
-            return -1
-        return 0
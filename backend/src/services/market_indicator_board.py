@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from src.config.settings import settings
+from src.utils.metrics import record_cache_lookup
+from src.utils.timing import timed, track_job
+
+GLOBAL_MARKET_SYMBOLS = {
+    "sp500": {"label": "S&P500", "candidates": ["^GSPC"]},
+    "nasdaq": {"label": "나스닥", "candidates": ["^IXIC"]},
+    "dow": {"label": "다우", "candidates": ["^DJI"]},
+    "vix": {"label": "VIX", "candidates": ["^VIX"]},
+    "tnx": {"label": "미국 10년물", "candidates": ["^TNX"]},
+    "dxy": {"label": "달러지수", "candidates": ["DX-Y.NYB", "DX=F"]},
+    "oil": {"label": "WTI", "candidates": ["CL=F"]},
+    "gold": {"label": "금", "candidates": ["GC=F"]},
+}
+DOMESTIC_MARKET_SYMBOLS = {
+    "kospi": {"label": "코스피", "candidates": ["^KS11"]},
+    "kosdaq": {"label": "코스닥", "candidates": ["^KQ11"]},
+    "usdkrw": {"label": "USD/KRW", "candidates": ["KRW=X"]},
+    "oil": {"label": "WTI", "candidates": ["CL=F"]},
+    "gold": {"label": "금", "candidates": ["GC=F"]},
+    "vix": {"label": "VIX", "candidates": ["^VIX"]},
+}
+MARKET_SCOPES = {"global": GLOBAL_MARKET_SYMBOLS, "domestic": DOMESTIC_MARKET_SYMBOLS}
+
+YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+class MarketIndicatorBoard:
+    """
+    시장 범위(국내/해외)별 지수·거시 지표 현황판
+
+    모든 범위의 지표를 Yahoo 시세 요청 한 번으로 묶어 갱신하고, 시장 맥락 계산은 이 현황판만 읽는다.
+    백그라운드 갱신이 멈춰 max_age 를 넘기면 조회 시점에 한 번만 다시 채운다.
+    """
+
+    def __init__(self, max_age: Optional[float] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.max_age = settings.market_board_max_age if max_age is None else max_age
+        self.boards: Dict[str, Dict[str, Dict]] = {}
+        self.updated_at: Optional[float] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def is_fresh(self) -> bool:
+        return self.updated_at is not None and time.time() - self.updated_at <= self.max_age
+
+    async def get(self, market_scope: str) -> Dict[str, Dict]:
+        market_scope = "domestic" if market_scope == "domestic" else "global"
+        if self.is_fresh():
+            record_cache_lookup("market_indicator_board", True)
+            return self.boards.get(market_scope, {})
+        record_cache_lookup("market_indicator_board", False)
+        try:
+            await self._refresh_shared()
+        except Exception as exc:
+            # A stale board still beats an empty one; the next lookup retries.
+            self.logger.warning("Market indicator board refresh failed: %s", exc)
+        return self.boards.get(market_scope, {})
+
+    async def refresh(self) -> Dict[str, Dict[str, Dict]]:
+        with track_job("refresh_market_indicators"):
+            fetched = await self._build_boards()
+        # Indicators the upstream left empty this round keep their last good value.
+        self.boards = {
+            market_scope: {**self.boards.get(market_scope, {}), **fetched.get(market_scope, {})} for market_scope in MARKET_SCOPES
+        }
+        # A round that fetched nothing leaves the board stale, so lookups retry instead of trusting it.
+        if any(fetched.values()):
+            self.updated_at = time.time()
+        return self.boards
+
+    def start(self, interval: float) -> None:
+        if self.is_running or interval <= 0:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(interval))
+        self.logger.info("Market indicator board refresh started (interval=%.0fs)", interval)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self._refresh_shared()
+            except Exception as exc:
+                self.logger.warning("Market indicator board refresh failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def _refresh_shared(self) -> Dict[str, Dict[str, Dict]]:
+        # Lookups that miss while the background task is already refreshing wait for that same refresh.
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self.refresh())
+            self._inflight.add_done_callback(self._clear_inflight)
+        return await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, future: asyncio.Future) -> None:
+        if self._inflight is future:
+            self._inflight = None
+        if not future.cancelled():
+            future.exception()  # mark retrieved; waiters already saw it
+
+    async def _build_boards(self) -> Dict[str, Dict[str, Dict]]:
+        symbols = list(
+            dict.fromkeys(
+                candidate
+                for symbol_map in MARKET_SCOPES.values()
+                for config in symbol_map.values()
+                for candidate in config["candidates"]
+            )
+        )
+        timeout = aiohttp.ClientTimeout(total=settings.request_timeout)
+        async with aiohttp.ClientSession(timeout=timeout, headers=YAHOO_HEADERS) as session:
+            quotes = await self._fetch_quotes(session, symbols)
+            # Only indicators the batched quote left empty fall back to per-symbol 5-day charts.
+            missing = list(
+                dict.fromkeys(
+                    candidate
+                    for symbol_map in MARKET_SCOPES.values()
+                    for config in symbol_map.values()
+                    if not any(candidate in quotes for candidate in config["candidates"])
+                    for candidate in config["candidates"]
+                )
+            )
+            charts = await asyncio.gather(*(self._fetch_chart(session, symbol) for symbol in missing))
+        for symbol, chart in zip(missing, charts):
+            if chart:
+                quotes[symbol] = chart
+
+        boards: Dict[str, Dict[str, Dict]] = {}
+        for market_scope, symbol_map in MARKET_SCOPES.items():
+            board: Dict[str, Dict] = {}
+            for key, config in symbol_map.items():
+                symbol = next((candidate for candidate in config["candidates"] if candidate in quotes), None)
+                if symbol is not None:
+                    board[key] = {"symbol": symbol, "label": config["label"], **quotes[symbol]}
+            boards[market_scope] = board
+        return boards
+
+    @timed(upstream="yahoo_market_indicator")
+    async def _fetch_quotes(self, session: aiohttp.ClientSession, symbols: Iterable[str]) -> Dict[str, Dict]:
+        url = "https://query1.finance.yahoo.com/v7/finance/quote"
+        try:
+            async with session.get(url, params={"symbols": ",".join(symbols)}) as response:
+                if response.status != 200:
+                    self.logger.warning("Market indicator quote batch failed: %s", response.status)
+                    return {}
+                payload = await response.json()
+        except Exception as exc:
+            self.logger.warning("Market indicator quote batch failed: %s", exc)
+            return {}
+        return self._parse_quotes(payload)
+
+    @staticmethod
+    def _parse_quotes(payload: Optional[Dict]) -> Dict[str, Dict]:
+        quotes: Dict[str, Dict] = {}
+        for result in ((payload or {}).get("quoteResponse") or {}).get("result") or []:
+            latest = result.get("regularMarketPrice")
+            previous = result.get("regularMarketPreviousClose")
+            if not result.get("symbol") or latest is None or previous in (None, 0):
+                continue
+            quotes[result["symbol"]] = {
+                "price": round(float(latest), 4),
+                "change_percent": round(((float(latest) - float(previous)) / float(previous)) * 100, 2),
+                "trend_5d": None,
+            }
+        return quotes
+
+    @timed(upstream="yahoo_market_indicator")
+    async def _fetch_chart(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+        try:
+            async with session.get(url, params={"range": "5d", "interval": "1d", "includePrePost": "false"}) as response:
+                if response.status != 200:
+                    return None
+                payload = await response.json()
+        except Exception as exc:
+            self.logger.warning("Market context chart fallback failed for %s: %s", symbol, exc)
+            return None
+        return self._parse_chart(payload)
+
+    @staticmethod
+    def _parse_chart(payload: Optional[Dict]) -> Optional[Dict]:
+        result = (((payload or {}).get("chart") or {}).get("result") or [None])[0]
+        if not result:
+            return None
+        quote = (((result.get("indicators") or {}).get("quote") or [None])[0]) or {}
+        closes: List[float] = [float(value) for value in (quote.get("close") or []) if value is not None]
+        if len(closes) < 2 or closes[-2] == 0:
+            return None
+        latest, previous = closes[-1], closes[-2]
+        trend_5d = ((latest - closes[0]) / closes[0]) * 100 if closes[0] else 0.0
+        return {
+            "price": round(latest, 4),
+            "change_percent": round(((latest - previous) / previous) * 100, 2),
+            "trend_5d": round(trend_5d, 2),
+        }
+
+
+market_indicator_board = MarketIndicatorBoard()
@@ -21,6 +21,8 @@ from urllib.parse import quote
 from functools import lru_cache
 from ..config.stock_urls_config import url_config, price_config
 from ..config.settings import settings
+from .quote_router import record_response_bytes
+from ..utils.timing import timed
 
 class NaverStockService:
     """네이버 기반 주식 정보 서비스 (클라우드 최적화 버전)"""
@@ -166,6 +168,7 @@ class NaverStockService:
             self.logger.error(f"❌ 통합 검색 오류: {e}")
             return []
 
+    @timed(upstream="naver_search")
     async def _search_from_naver_search(self, query: str) -> List[Dict]:
         """네이버 검색에서 한국/해외 주식 모두 찾기"""
         try:
@@ -182,6 +185,7 @@ class NaverStockService:
             session = self._create_fresh_session()
             response = session.get(url, timeout=10)
             response.raise_for_status()
+            record_response_bytes(len(response.content))
             
             html_content = response.text
             results = []
@@ -337,6 +341,7 @@ class NaverStockService:
             self.logger.error(f"❌ 네이버 검색 결과 파싱 오류: {e}")
             return None
 
+    @timed(upstream="naver_world")
     async def _get_world_stock_by_symbol(self, symbol: str) -> Optional[Dict]:
         """
         해외 주식 정보 조회 (동적 파싱)
@@ -361,6 +366,7 @@ class NaverStockService:
                     response = self._create_fresh_session().get(url, timeout=10)
                     
                     if response.status_code == 200:
+                        record_response_bytes(len(response.content))
                         soup = BeautifulSoup(response.text, 'html.parser')
                         self.logger.info(f"✅ 성공: {url}")
                         break
@@ -582,6 +588,7 @@ class NaverStockService:
         except Exception:
             return 'NASDAQ'  # 기본값
 
+    @timed(upstream="naver_finance")
     async def _get_korean_stock_by_code(self, code: str) -> Optional[Dict]:
         """
         종목코드로 한국 주식 정보 조회 (동적 파싱)
@@ -598,6 +605,7 @@ class NaverStockService:
             
             response = self._create_fresh_session().get(url, timeout=url_config.REQUEST_TIMEOUT)
             response.raise_for_status()
+            record_response_bytes(len(response.content))
             
             soup = BeautifulSoup(response.text, 'html.parser')
             
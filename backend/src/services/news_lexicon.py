@@ -0,0 +1,192 @@
+import hashlib
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.utils.metrics import record_cache_lookup
+
+# Matching is by substring on the lowered "title summary" text, exactly like the former `keyword in text` scans.
+TOPIC_GROUPS: Dict[str, Dict[str, object]] = {
+    "금리": {"keywords": ["rate", "fed", "treasury", "yield", "bond"], "weight": -1},
+    "물가": {"keywords": ["inflation", "cpi", "ppi", "price pressure"], "weight": -1},
+    "관세": {"keywords": ["tariff", "duty", "trade tension"], "weight": -1},
+    "지정학": {"keywords": ["war", "attack", "missile", "drone", "conflict", "ceasefire", "sanction"], "weight": -2},
+    "원자재": {"keywords": ["oil", "crude", "gold", "energy"], "weight": -1},
+    "정책완화": {"keywords": ["cut", "stimulus", "easing"], "weight": 1},
+    "성장산업": {"keywords": ["ai", "chip", "semiconductor", "cloud"], "weight": 1},
+}
+
+# Market context article tone.
+POSITIVE_WORDS = ["beat", "surge", "growth", "partnership", "record", "gain", "rally", "strong", "upgrade"]
+NEGATIVE_WORDS = ["fall", "drop", "delay", "risk", "probe", "cut", "warn", "miss", "downgrade", "weak"]
+
+# Analysis news impact score.
+IMPACT_POSITIVE_WORDS = ["beat", "surge", "growth", "partnership", "record", "gain", "rally", "strong"]
+IMPACT_NEGATIVE_WORDS = [
+    "fall",
+    "drop",
+    "delay",
+    "risk",
+    "probe",
+    "cut",
+    "warn",
+    "miss",
+    "tariff",
+    "war",
+    "attack",
+    "missile",
+    "drone",
+    "conflict",
+    "ukraine",
+    "russia",
+    "gaza",
+    "israel",
+    "iran",
+    "sanction",
+]
+
+# keyword -> (label, score for stocks, score for currencies)
+MACRO_SIGNAL_KEYWORDS: Dict[str, Tuple[str, int, int]] = {
+    "rate": ("금리", -1, -1),
+    "inflation": ("물가", -1, -1),
+    "tariff": ("관세", -1, -1),
+    "war": ("지정학", -2, -2),
+    "attack": ("지정학", -2, -2),
+    "missile": ("지정학", -2, -2),
+    "drone": ("지정학", -2, -2),
+    "conflict": ("지정학", -2, -2),
+    "ceasefire": ("지정학", -1, -1),
+    "ukraine": ("지정학", -2, -2),
+    "russia": ("지정학", -2, -2),
+    "gaza": ("지정학", -2, -2),
+    "israel": ("지정학", -2, -2),
+    "iran": ("지정학", -2, -2),
+    "red sea": ("지정학", -2, -2),
+    "sanction": ("제재", -1, -1),
+    "oil": ("원자재", -1, 0),
+    "fed": ("통화정책", -1, -1),
+    "treasury": ("금리", -1, -1),
+    "stimulus": ("정책완화", 1, 1),
+    "ai": ("성장산업", 1, 1),
+    "chip": ("성장산업", 1, 1),
+    "soft landing": ("경기개선", 1, 1),
+    "cut": ("정책완화", 1, 1),
+}
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick 자동자: 텍스트를 한 번 훑어 부분 문자열로 들어 있는 키워드를 모두 찾는다
+
+    실패 링크를 미리 펼쳐 상태마다 완전한 전이표를 두므로 글자당 사전 조회 한 번이면 된다.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[FrozenSet[str]] = [frozenset()]
+        for keyword in dict.fromkeys(keyword for keyword in keywords if keyword):
+            state = 0
+            for char in keyword:
+                following = goto[state].get(char)
+                if following is None:
+                    goto.append({})
+                    outputs.append(frozenset())
+                    following = goto[state][char] = len(goto) - 1
+                state = following
+            outputs[state] = outputs[state] | {keyword}
+
+        # Breadth-first, so a state's failure target (always shallower) is finished before the state itself.
+        self.transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        failure = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.transitions[state] = {**self.transitions[failure[state]], **goto[state]}
+            outputs[state] = outputs[state] | outputs[failure[state]]
+            for char, following in goto[state].items():
+                failure[following] = self.transitions[failure[state]].get(char, 0)
+                queue.append(following)
+        self.outputs = outputs
+
+    def find(self, text: str) -> FrozenSet[str]:
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        found = set()
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return frozenset(found)
+
+
+class ArticleSignals(NamedTuple):
+    keywords: FrozenSet[str]
+    sentiment: int
+    impact: int
+    topics: Tuple[str, ...]
+    macro: Mapping[str, Tuple[str, int]]
+
+    def macro_signal(self, asset_type: str) -> Optional[Dict[str, object]]:
+        label, score = self.macro["stock" if asset_type == "stock" else "currency"]
+        return {"label": label, "score": score} if score else None
+
+
+class NewsLexicon:
+    """
+    뉴스 분류용 키워드 묶음 전체를 자동자 하나로 컴파일하고 기사별 분류 결과를 내용 해시로 캐시
+
+    같은 기사가 여러 종목의 시장 맥락에 반복해 들어와도 텍스트는 한 번만 훑는다.
+    """
+
+    def __init__(self, cache_size: int = 4096) -> None:
+        keywords: List[str] = [*POSITIVE_WORDS, *NEGATIVE_WORDS, *IMPACT_POSITIVE_WORDS, *IMPACT_NEGATIVE_WORDS]
+        keywords.extend(MACRO_SIGNAL_KEYWORDS)
+        for config in TOPIC_GROUPS.values():
+            keywords.extend(config["keywords"])
+        self.automaton = KeywordAutomaton(keywords)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, ArticleSignals]" = OrderedDict()
+        self._positive = frozenset(POSITIVE_WORDS)
+        self._negative = frozenset(NEGATIVE_WORDS)
+        self._impact_positive = frozenset(IMPACT_POSITIVE_WORDS)
+        self._impact_negative = frozenset(IMPACT_NEGATIVE_WORDS)
+        self._topics = [(topic, frozenset(config["keywords"])) for topic, config in TOPIC_GROUPS.items()]
+
+    def classify(self, article: Mapping[str, str]) -> ArticleSignals:
+        title = article.get("title") or ""
+        summary = article.get("summary") or ""
+        key = hashlib.blake2b(f"{title}\x1f{summary}".encode("utf-8"), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            record_cache_lookup("news_lexicon", True)
+            return cached
+        record_cache_lookup("news_lexicon", False)
+
+        signals = self._classify_text(f"{title} {summary}".lower())
+        self._cache[key] = signals
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return signals
+
+    def _classify_text(self, text: str) -> ArticleSignals:
+        keywords = self.automaton.find(text)
+        positive = len(keywords & self._positive)
+        negative = len(keywords & self._negative)
+        # Table order decides which labels lead, as in the former per-keyword loop.
+        hits = [entry for keyword, entry in MACRO_SIGNAL_KEYWORDS.items() if keyword in keywords]
+        macro: Dict[str, Tuple[str, int]] = {}
+        for index, asset_type in ((1, "stock"), (2, "currency")):
+            score = sum(entry[index] for entry in hits)
+            labels = list(dict.fromkeys(entry[0] for entry in hits))[:2]
+            macro[asset_type] = (", ".join(labels), score)
+        return ArticleSignals(
+            keywords=keywords,
+            sentiment=(positive > negative) - (negative > positive),
+            impact=len(keywords & self._impact_positive) - len(keywords & self._impact_negative),
+            topics=tuple(topic for topic, topic_keywords in self._topics if keywords & topic_keywords),
+            macro=macro,
+        )
+
+
+news_lexicon = NewsLexicon()
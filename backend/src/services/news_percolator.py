@@ -0,0 +1,34 @@
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from src.services.news_store import NewsQuery
+
+
+class NewsPercolator:
+    """
+    활성 뉴스 알림의 키워드를 한꺼번에 컴파일해 두고, 기사 하나를 넣으면 맞는 알림을 돌려주는 역방향 검색기
+
+    알림마다 검색을 돌리는 대신 새 기사마다 한 번만 훑으므로 비용이 알림 수가 아니라 새 기사 수를 따른다.
+    일치 규칙은 NewsStore.search 와 같다.
+    """
+
+    def __init__(self, alerts: Iterable[Tuple[str, str]]) -> None:
+        self.queries: Dict[str, NewsQuery] = {}
+        self._anchors: Dict[str, List[str]] = {}
+        for alert_id, keywords in alerts:
+            query = NewsQuery.parse(keywords)
+            if query is None:
+                continue
+            self.queries[alert_id] = query
+            # Every query token must be present, so one token is enough to find the candidates;
+            # the longest one stands in for the rarest.
+            anchor = max(query.tokens, key=lambda token: (len(token), token))
+            self._anchors.setdefault(anchor, []).append(alert_id)
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def match(self, tokens: FrozenSet[str], text: str) -> List[str]:
+        matched: List[str] = []
+        for anchor in self._anchors.keys() & tokens:
+            matched.extend(alert_id for alert_id in self._anchors[anchor] if self.queries[alert_id].matches(tokens, text))
+        return matched
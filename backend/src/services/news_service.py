@@ -1,43 +1,83 @@
+import asyncio
 import logging
 from typing import Dict, List, Optional
 
-import feedparser
+from src.config.settings import settings
+from src.services.feed_fetcher import FeedFetcher, feed_fetcher
+from src.services.news_store import NewsStore, news_store
+from src.utils.timing import timed, track_job
+
+NEWS_FEEDS = {
+    "Bloomberg": "https://feeds.bloomberg.com/economics/news.rss",
+    "MarketWatch": "https://feeds.content.dowjones.io/public/rss/mw_topstories",
+    "Reuters": "https://feeds.reuters.com/reuters/businessNews",
+}
 
 
 class NewsService:
-    def __init__(self) -> None:
+    def __init__(self, fetcher: Optional[FeedFetcher] = None, store: Optional[NewsStore] = None) -> None:
         self.logger = logging.getLogger(__name__)
-        self.feeds = {
-            "Bloomberg": "https://feeds.bloomberg.com/economics/news.rss",
-            "MarketWatch": "https://feeds.content.dowjones.io/public/rss/mw_topstories",
-            "Reuters": "https://feeds.reuters.com/reuters/businessNews",
-        }
+        self.fetcher = fetcher or feed_fetcher
+        self.store = store if store is not None else news_store
+        self.feeds = dict(NEWS_FEEDS)
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
 
+    @timed()
     async def get_latest_news(self, query: Optional[str] = None, limit: int = 10) -> List[Dict[str, str]]:
-        query_lower = query.lower() if query else None
-        results: List[Dict[str, str]] = []
-        for source_name, feed_url in self.feeds.items():
+        """최신순 기사 목록, query 가 있으면 제목·요약 색인에서 찾는다"""
+        await self.ensure_fresh()
+        return self.store.search(query, limit)
+
+    async def ensure_fresh(self) -> None:
+        if self.store.is_fresh(settings.news_store_max_age):
+            return
+        # Background ingestion is off or stalled; fill the store once for everyone waiting.
+        try:
+            await self._ingest_shared()
+        except Exception as exc:
+            self.logger.warning("News ingest failed: %s", exc)
+
+    async def ingest(self) -> int:
+        with track_job("ingest_news"):
+            feeds = await self.fetcher.fetch_all(self.feeds)
+            return self.store.add(
+                ({**entry.article, "summary": entry.article["summary"][:240]}, entry.text, entry.published_at)
+                for entries in feeds.values()
+                for entry in entries
+            )
+
+    def start(self, interval: float) -> None:
+        if (self._task is not None and not self._task.done()) or interval <= 0:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(interval))
+        self.logger.info("News ingestion started (interval=%.0fs)", interval)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
             try:
-                feed = feedparser.parse(feed_url)
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self._ingest_shared()
             except Exception as exc:
-                self.logger.warning("Feed parse failed for %s: %s", source_name, exc)
-                continue
-
-            for entry in feed.entries:
-                title = str(entry.get("title", ""))
-                summary = str(entry.get("summary", ""))
-                combined = f"{title} {summary}".lower()
-                if query_lower and query_lower not in combined:
-                    continue
-                results.append(
-                    {
-                        "title": title,
-                        "summary": summary[:240],
-                        "url": str(entry.get("link", "")),
-                        "published": str(entry.get("published", "")),
-                        "source": source_name,
-                    }
-                )
-                if len(results) >= limit:
-                    return results
-        return results[:limit]
+                self.logger.warning("News ingest failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def _ingest_shared(self) -> int:
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self.ingest())
+            self._inflight.add_done_callback(self._clear_inflight)
+        return await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, future: asyncio.Future) -> None:
+        if self._inflight is future:
+            self._inflight = None
+        if not future.cancelled():
+            future.exception()  # mark retrieved; waiters already saw it
@@ -0,0 +1,224 @@
+import bisect
+import hashlib
+import itertools
+import re
+import time
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from src.config.settings import settings
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+_HANGUL_RUN = re.compile(r"[가-힣]+")
+_TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|cmpid|mod|ref|rss|taid|yptr)$")
+
+# Fingerprints are split into 8-bit bands: copies of one story share at least one band exactly
+# (always within 7 differing bits, almost always a little beyond), so bands index the candidates.
+# Short texts make the Hamming distance itself noisy, so token-set overlap confirms the match.
+NEAR_DUPLICATE_JACCARD = 0.7
+_BAND_BITS = 8
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    소문자 영문·숫자는 단어 단위, 한글은 음절 하나와 이웃한 두 음절(bigram) 단위로 자른다
+
+    한국어는 조사가 붙어 단어 경계가 흐리므로 "삼성전자가"도 "삼성전자" 검색에 걸리도록 음절 조각으로 색인한다.
+    """
+    tokens: Set[str] = set()
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= token[0] <= "힣":
+            tokens.update(token)
+            tokens.update(token[index : index + 2] for index in range(len(token) - 1))
+        else:
+            tokens.add(token)
+    return tokens
+
+
+def canonical_url(url: str) -> str:
+    """스킴·호스트 표기, www, 추적용 쿼리 파라미터, 프래그먼트, 끝 슬래시 차이를 없앤 기사 주소"""
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url
+    host = parts.hostname
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING_PARAM.match(key.lower()))
+    )
+    return urlunsplit(("https", host, parts.path.rstrip("/") or "/", query, ""))
+
+
+def simhash(tokens: Iterable[str]) -> int:
+    """토큰마다 64비트 해시를 더해 비트별 다수결로 만든 SimHash 지문, 문구가 조금 달라도 가까운 값이 나온다"""
+    digests = b"".join(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest() for token in tokens)
+    if not digests:
+        return 0
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    majority = bits.sum(axis=0) * 2 > len(bits)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    return [(band, (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK) for band in range(64 // _BAND_BITS)]
+
+
+class NewsQuery(NamedTuple):
+    """검색어 토큰 전부가 들어 있고, 세 음절 이상 한글 덩어리는 쓰인 그대로 나와야 일치"""
+
+    tokens: FrozenSet[str]
+    runs: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, query: str) -> Optional["NewsQuery"]:
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        # Bigrams can match out of order; a Hangul run must still appear as written.
+        return cls(frozenset(tokens), tuple(run for run in _HANGUL_RUN.findall(query.lower()) if len(run) > 2))
+
+    def matches(self, tokens: FrozenSet[str], text: str) -> bool:
+        return self.tokens <= tokens and all(run in text for run in self.runs)
+
+
+class StoredArticle(NamedTuple):
+    article: Dict[str, str]
+    text: str
+    recency: Tuple[float, int]  # (-published_at, sequence): newest first, then feed order
+    tokens: FrozenSet[str]
+    fingerprint: int
+    keys: List[str]
+
+
+class NewsStore:
+    """
+    정규화한 뉴스 기사를 보관하는 메모리 저장소
+
+    제목·요약 토큰의 역색인과 최신순 목록을 함께 유지해 키워드 조회를 네트워크 없이 처리한다.
+    정규화한 주소가 같거나 SimHash 지문이 가까운 기사는 처음 들어온 기사 하나로 합치고 출처(sources)만 늘린다.
+    capacity 를 넘으면 가장 오래된 기사부터 색인에서 빼낸다.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        self.capacity = capacity
+        self.articles: Dict[int, StoredArticle] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.ingested_at: Optional[float] = None
+        self._keys: Dict[str, int] = {}
+        self._bands: Dict[Tuple[int, int], Set[int]] = {}
+        self._recency: List[Tuple[float, int]] = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.ingested_at is not None and time.time() - self.ingested_at <= max_age
+
+    def add(self, entries: Iterable[Tuple[Dict[str, str], str, Optional[float]]]) -> int:
+        """(기사, 소문자 본문, 발행 시각) 묶음을 넣고 새로 색인한 기사 수를 돌려준다"""
+        now = time.time()
+        added = 0
+        for article, text, published_at in entries:
+            url = canonical_url(article.get("url", ""))
+            key = url or article.get("title") or ""
+            if not key:
+                continue
+            source = article.get("source")
+            article_id = self._keys.get(key)
+            tokens: FrozenSet[str] = frozenset()
+            fingerprint = 0
+            if article_id is None:
+                tokens = frozenset(tokenize(text))
+                fingerprint = simhash(tokens)
+                article_id = self._near_duplicate(tokens, fingerprint) if tokens else None
+                if article_id is not None:
+                    # Later copies of this URL resolve without fingerprinting again.
+                    self._keys[key] = article_id
+                    self.articles[article_id].keys.append(key)
+            if article_id is not None:
+                sources = self.articles[article_id].article["sources"]
+                if source and source not in sources:
+                    sources.append(source)
+                continue
+
+            article_id = next(self._sequence)
+            recency = (-(published_at if published_at is not None else now), article_id)
+            canonical = {**article, "url": url, "sources": [source] if source else []}
+            self.articles[article_id] = StoredArticle(canonical, text, recency, tokens, fingerprint, [key])
+            self._keys[key] = article_id
+            bisect.insort(self._recency, recency)
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(article_id)
+            for band in _bands(fingerprint) if tokens else ():
+                self._bands.setdefault(band, set()).add(article_id)
+            added += 1
+        while len(self._recency) > self.capacity:
+            self._evict(self._recency.pop()[1])
+        self.ingested_at = now
+        return added
+
+    def search(self, query: Optional[str] = None, limit: int = 10) -> List[Dict[str, str]]:
+        if limit <= 0:
+            return []
+        if not query:
+            return [self.public_article(self.articles[article_id]) for _, article_id in self._recency[:limit]]
+
+        parsed = NewsQuery.parse(query)
+        if parsed is None:
+            return []
+        postings = sorted((self.postings.get(token, set()) for token in parsed.tokens), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        results: List[Dict[str, str]] = []
+        for _, article_id in sorted(self.articles[article_id].recency for article_id in candidates):
+            stored = self.articles[article_id]
+            if parsed.runs and not all(run in stored.text for run in parsed.runs):
+                continue
+            results.append(self.public_article(stored))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _near_duplicate(self, tokens: FrozenSet[str], fingerprint: int) -> Optional[int]:
+        candidates = set().union(*(self._bands.get(band, ()) for band in _bands(fingerprint)))
+        for article_id in sorted(candidates):
+            other = self.articles[article_id].tokens
+            if len(tokens & other) >= NEAR_DUPLICATE_JACCARD * len(tokens | other):
+                return article_id
+        return None
+
+    def articles_since(self, cursor: int) -> List[Tuple[int, StoredArticle]]:
+        """cursor 이후에 색인한 기사를 들어온 순서대로 돌려준다 (cursor 는 마지막으로 본 기사 번호)"""
+        newer = list(itertools.takewhile(lambda item: item[0] > cursor, reversed(self.articles.items())))
+        newer.reverse()
+        return newer
+
+    @staticmethod
+    def public_article(stored: StoredArticle) -> Dict:
+        return {**stored.article, "sources": list(stored.article["sources"])}
+
+    def _evict(self, article_id: int) -> None:
+        stored = self.articles.pop(article_id)
+        for key in stored.keys:
+            self._keys.pop(key, None)
+        for band in _bands(stored.fingerprint):
+            members = self._bands.get(band)
+            if members is not None:
+                members.discard(article_id)
+                if not members:
+                    del self._bands[band]
+        for token in stored.tokens:
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.discard(article_id)
+                if not posting:
+                    del self.postings[token]
+
+
+news_store = NewsStore(capacity=settings.news_store_capacity)
@@ -6,6 +6,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.database import DeviceToken, NotificationLog
+from src.utils.metrics import registry
+from src.utils.timing import timed
 
 try:
     from apns2.client import APNsClient
@@ -17,6 +19,8 @@ except ImportError:  # pragma: no cover
     Payload = None
     PayloadAlert = None
 
+PUSH_DELIVERIES = registry.counter("push_deliveries_total", "APNs push deliveries by outcome", ("alert_type", "outcome"))
+
 
 class NotificationService:
     def __init__(self, settings) -> None:
@@ -98,6 +102,7 @@ class NotificationService:
         await db.refresh(log)
         return log
 
+    @timed()
     async def send_push_to_all(
         self,
         db: AsyncSession,
@@ -110,6 +115,7 @@ class NotificationService:
         stmt = select(DeviceToken).where(DeviceToken.is_active.is_(True))
         tokens = list((await db.execute(stmt)).scalars().all())
         if not tokens:
+            PUSH_DELIVERIES.labels(alert_type, "skipped_no_tokens").inc()
             await self.create_notification_log(
                 db,
                 alert_type=alert_type,
@@ -133,7 +139,9 @@ class NotificationService:
                     client.send_notification(token.token, payload, topic=self.settings.apns_bundle_id)
                 token.last_used_at = datetime.now(timezone.utc)
                 sent += 1
+                PUSH_DELIVERIES.labels(alert_type, "sent").inc()
             except Exception as exc:  # pragma: no cover
+                PUSH_DELIVERIES.labels(alert_type, "failed").inc()
                 self.logger.warning("APNs send failed for token %s: %s", token.token[:8], exc)
         await db.commit()
         await self.create_notification_log(
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.services.alert_index import InstrumentKey
+from src.utils.metrics import registry
+
+QUOTE_EVENTS = registry.counter("quote_events_total", "Quote update events by outcome", ("outcome",))
+
+QuoteHandler = Callable[[InstrumentKey, float, Dict[str, Any]], Awaitable[Any]]
+
+
+class QuoteEventBus:
+    """
+    프로세스 안에서 시세 갱신을 구독자에게 전달하는 이벤트 버스
+
+    시세 서비스는 받아 온 시세를 publish 로 큐에 넣기만 하고 바로 돌아가며,
+    백그라운드 소비 태스크가 큐를 비우면서 구독자(알림 엔진 등)를 차례로 호출한다.
+    큐가 가득 차면 새 이벤트는 버리고, 그 시세는 다음 정기 점검이 다시 확인한다.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.handlers: List[QuoteHandler] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, handler: QuoteHandler) -> None:
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+
+    def unsubscribe(self, handler: QuoteHandler) -> None:
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+
+    def publish(self, key: InstrumentKey, price: Any, quote: Dict[str, Any]) -> bool:
+        # Never blocks the quote path: without a consumer or subscribers the event is simply not recorded.
+        if self._queue is None or not self.handlers or price is None:
+            return False
+        try:
+            self._queue.put_nowait((key, float(price), quote))
+        except asyncio.QueueFull:
+            QUOTE_EVENTS.labels("dropped").inc()
+            return False
+        except (TypeError, ValueError):
+            return False
+        QUOTE_EVENTS.labels("published").inc()
+        return True
+
+    def start(self, max_pending: int) -> None:
+        if self.is_running or max_pending <= 0:
+            return
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._task = asyncio.get_running_loop().create_task(self._run(self._queue))
+        self.logger.info("Quote event bus started (max_pending=%s)", max_pending)
+
+    async def stop(self) -> None:
+        self._queue = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            event: Tuple[InstrumentKey, float, Dict[str, Any]] = await queue.get()
+            for handler in list(self.handlers):
+                try:
+                    await handler(*event)
+                except Exception as exc:
+                    self.logger.warning("Quote event handler failed for %s: %s", event[0], exc)
+            queue.task_done()
+
+
+quote_event_bus = QuoteEventBus()
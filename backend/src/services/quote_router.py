@@ -0,0 +1,238 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional
+
+from src.utils.metrics import registry
+
+QuoteFetcher = Callable[[Any], Awaitable[Optional[Dict[str, Any]]]]
+BatchQuoteFetcher = Callable[[List[Any]], Awaitable[Dict[Any, Dict[str, Any]]]]
+
+PROVIDER_REQUESTS = registry.counter(
+    "quote_provider_requests_total", "Quote provider calls by outcome", ("kind", "provider", "outcome")
+)
+PROVIDER_LATENCY = registry.histogram("quote_provider_latency_seconds", "Quote provider call latency", ("kind", "provider"))
+PROVIDER_BYTES = registry.counter("quote_provider_response_bytes_total", "Upstream payload bytes read per provider", ("kind", "provider"))
+COALESCED_KEYS = registry.counter(
+    "quote_requests_coalesced_total", "Quote keys served by an already pending lookup in the same batch", ("kind",)
+)
+
+_response_bytes: contextvars.ContextVar = contextvars.ContextVar("quote_response_bytes", default=None)
+
+
+def record_response_bytes(size: int) -> None:
+    # Providers call this after reading an upstream body so the router can attribute payload size.
+    counter = _response_bytes.get()
+    if counter is not None:
+        counter[0] += int(size or 0)
+
+
+class QuoteProvider:
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        fetch: QuoteFetcher,
+        fields: Iterable[str] = ("price",),
+        cost: float = 1.0,
+        accepts: Optional[Callable[[Any], bool]] = None,
+        fetch_batch: Optional[BatchQuoteFetcher] = None,
+        max_batch_size: int = 50,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.fetch = fetch
+        self.fields: FrozenSet[str] = frozenset(fields)
+        self.cost = float(cost)
+        self.accepts = accepts
+        self.fetch_batch = fetch_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+
+    @property
+    def supports_batch(self) -> bool:
+        return self.fetch_batch is not None
+
+    def can_serve(self, key: Any, required_fields: FrozenSet[str]) -> bool:
+        if required_fields and not required_fields <= self.fields:
+            return False
+        return self.accepts is None or bool(self.accepts(key))
+
+
+class ProviderStats:
+    def __init__(self, smoothing: float = 0.2) -> None:
+        self.smoothing = smoothing
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.bytes_per_quote: Optional[float] = None
+        self.cooldown_until = 0.0
+
+    def _blend(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + (sample - current) * self.smoothing
+
+    def record(self, ok: bool, latency_ms: float, response_bytes: int, quotes: int) -> None:
+        self.calls += 1
+        self.latency_ms = self._blend(self.latency_ms, latency_ms)
+        self.error_rate = self._blend(self.error_rate, 0.0 if ok else 1.0)
+        if ok:
+            self.consecutive_failures = 0
+            if response_bytes:
+                self.bytes_per_quote = self._blend(self.bytes_per_quote, response_bytes / max(1, quotes))
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+
+class QuoteRouter:
+    # A provider is skipped (but still kept as a last resort) after this many failures in a row.
+    FAILURE_THRESHOLD = 3
+    COOLDOWN_SECONDS = 60.0
+    MAX_HEALTHY_ERROR_RATE = 0.5
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.providers: Dict[str, List[QuoteProvider]] = {}
+        self.stats: Dict[str, ProviderStats] = {}
+
+    def register(self, provider: QuoteProvider) -> None:
+        providers = self.providers.setdefault(provider.kind, [])
+        providers[:] = [item for item in providers if item.name != provider.name]
+        providers.append(provider)
+        self.stats.setdefault(self._stats_key(provider), ProviderStats())
+
+    def unregister(self, kind: str, name: str) -> None:
+        self.providers[kind] = [item for item in self.providers.get(kind, []) if item.name != name]
+
+    async def fetch(
+        self,
+        kind: str,
+        key: Any,
+        required_fields: Iterable[str] = (),
+    ) -> Optional[Dict[str, Any]]:
+        for provider in self.rank(kind, key, required_fields):
+            quote = await self._call(provider, provider.fetch, key, quotes=1)
+            if quote:
+                return quote
+        return None
+
+    async def fetch_many(
+        self,
+        kind: str,
+        keys: Iterable[Hashable],
+        required_fields: Iterable[str] = (),
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        requested = list(keys)
+        pending = list(dict.fromkeys(requested))
+        if len(requested) > len(pending):
+            COALESCED_KEYS.labels(kind).inc(len(requested) - len(pending))
+        results: Dict[Hashable, Dict[str, Any]] = {}
+        if not pending:
+            return results
+
+        # Batch-capable providers that rank first for some keys get those keys in one upstream call.
+        grouped: Dict[str, List[Hashable]] = {}
+        provider_map: Dict[str, QuoteProvider] = {}
+        for key in pending:
+            ranked = self.rank(kind, key, required_fields)
+            if ranked and ranked[0].supports_batch:
+                grouped.setdefault(ranked[0].name, []).append(key)
+                provider_map[ranked[0].name] = ranked[0]
+
+        for name, batch_keys in grouped.items():
+            provider = provider_map[name]
+            for start in range(0, len(batch_keys), provider.max_batch_size):
+                chunk = batch_keys[start:start + provider.max_batch_size]
+                batch = await self._call(provider, provider.fetch_batch, chunk, quotes=len(chunk))
+                for key, quote in (batch or {}).items():
+                    if quote:
+                        results[key] = quote
+
+        missing = [key for key in pending if key not in results]
+        fetched = await asyncio.gather(*(self.fetch(kind, key, required_fields) for key in missing))
+        for key, quote in zip(missing, fetched):
+            if quote:
+                results[key] = quote
+        return results
+
+    def rank(self, kind: str, key: Any, required_fields: Iterable[str] = ()) -> List[QuoteProvider]:
+        required = frozenset(required_fields)
+        candidates = [provider for provider in self.providers.get(kind, []) if provider.can_serve(key, required)]
+        now = time.monotonic()
+        healthy = [provider for provider in candidates if self.is_healthy(provider, now)]
+        degraded = [provider for provider in candidates if provider not in healthy]
+        healthy.sort(key=self.score)
+        degraded.sort(key=lambda provider: self.stats[self._stats_key(provider)].error_rate)
+        return healthy + degraded
+
+    def score(self, provider: QuoteProvider) -> float:
+        stats = self.stats[self._stats_key(provider)]
+        latency_factor = 1.0 + (stats.latency_ms or 0.0) / 1000.0
+        bytes_factor = 1.0 + (stats.bytes_per_quote or 0.0) / 100_000.0
+        error_factor = 1.0 + stats.error_rate * 2.0
+        return provider.cost * latency_factor * bytes_factor * error_factor
+
+    def is_healthy(self, provider: QuoteProvider, now: Optional[float] = None) -> bool:
+        stats = self.stats[self._stats_key(provider)]
+        if stats.cooldown_until > (now if now is not None else time.monotonic()):
+            return False
+        return stats.error_rate < self.MAX_HEALTHY_ERROR_RATE or stats.consecutive_failures == 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        now = time.monotonic()
+        for kind, providers in self.providers.items():
+            for provider in providers:
+                stats = self.stats[self._stats_key(provider)]
+                rows.append(
+                    {
+                        "kind": kind,
+                        "name": provider.name,
+                        "cost": provider.cost,
+                        "fields": sorted(provider.fields),
+                        "supports_batch": provider.supports_batch,
+                        "healthy": self.is_healthy(provider, now),
+                        "calls": stats.calls,
+                        "failures": stats.failures,
+                        "latency_ms": round(stats.latency_ms, 2) if stats.latency_ms is not None else None,
+                        "error_rate": round(stats.error_rate, 4),
+                        "bytes_per_quote": round(stats.bytes_per_quote) if stats.bytes_per_quote is not None else None,
+                        "score": round(self.score(provider), 4),
+                    }
+                )
+        return rows
+
+    async def _call(self, provider: QuoteProvider, fetcher: Callable[[Any], Awaitable[Any]], argument: Any, quotes: int) -> Any:
+        counter = [0]
+        token = _response_bytes.set(counter)
+        started = time.perf_counter()
+        result = None
+        failed = False
+        try:
+            result = await fetcher(argument)
+        except Exception as exc:
+            failed = True
+            self.logger.warning("Quote provider %s failed: %s", provider.name, exc)
+        finally:
+            _response_bytes.reset(token)
+        elapsed = time.perf_counter() - started
+        latency_ms = elapsed * 1000
+        PROVIDER_LATENCY.labels(provider.kind, provider.name).observe(elapsed)
+        # An empty answer (unknown or delisted symbol) is a healthy call; only errors and timeouts count against the provider.
+        outcome = "failed" if failed else "ok" if result else "empty"
+        PROVIDER_REQUESTS.labels(provider.kind, provider.name, outcome).inc()
+        if counter[0]:
+            PROVIDER_BYTES.labels(provider.kind, provider.name).inc(counter[0])
+        stats = self.stats[self._stats_key(provider)]
+        stats.record(not failed, latency_ms, counter[0], quotes)
+        if stats.consecutive_failures >= self.FAILURE_THRESHOLD:
+            stats.cooldown_until = time.monotonic() + self.COOLDOWN_SECONDS
+        return result
+
+    @staticmethod
+    def _stats_key(provider: QuoteProvider) -> str:
+        return f"{provider.kind}:{provider.name}"
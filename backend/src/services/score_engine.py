@@ -0,0 +1,305 @@
+from typing import Dict
+
+import numpy as np
+
+from src.services.analysis_service import AnalysisService
+from src.services.candle_series import CandleSeries
+from src.services.indicator_engine import IndicatorEngine, rolling_max, rolling_mean, rolling_min, rolling_std
+
+ACTION_BUY = 1
+ACTION_HOLD = 0
+ACTION_SELL = -1
+
+TREND_UP = 1
+TREND_SIDEWAYS = 0
+TREND_DOWN = -1
+
+
+def trailing_window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(len(values))
+    return sums[index + 1] - sums[np.maximum(0, index - window + 1)]
+
+
+def trailing_window_mean(values: np.ndarray, window: int) -> np.ndarray:
+    # values[max(0, t-window+1):t+1].mean() for every t: a rolling mean that starts out expanding.
+    # The short expanding head uses slice means so that two spans covering the same prefix compare equal.
+    out = np.empty(len(values))
+    for index in range(min(window - 1, len(values))):
+        out[index] = values[:index + 1].mean()
+    if len(values) >= window:
+        out[window - 1:] = rolling_mean(values, window)[window - 1:]
+    return out
+
+
+def trailing_window_max(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.maximum.accumulate(values)
+    if len(values) >= window:
+        out[window - 1:] = rolling_max(values, window)[window - 1:]
+    return out
+
+
+def trailing_window_min(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.minimum.accumulate(values)
+    if len(values) >= window:
+        out[window - 1:] = rolling_min(values, window)[window - 1:]
+    return out
+
+
+def trailing_window_std(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.empty(len(values))
+    for index in range(min(window - 1, len(values))):
+        head = values[:index + 1]
+        out[index] = 0.0 if head.max() == head.min() else head.std()
+    if len(values) >= window:
+        out[window - 1:] = rolling_std(values, window)[window - 1:]
+    return out
+
+
+class ScoreSeries:
+    """봉마다 '그 봉까지의 데이터로 분석했을 때'의 점수·판단·가격대 (_build_analysis 의 기술적 부분과 같은 규칙)"""
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self.trend = np.zeros(length, dtype=np.int8)
+        self.trend_score = np.zeros(length, dtype=np.int64)
+        self.momentum_score = np.zeros(length, dtype=np.int64)
+        self.volume_score = np.zeros(length, dtype=np.int64)
+        self.volatility_score = np.zeros(length, dtype=np.int64)
+        self.risk_penalty = np.zeros(length, dtype=np.int64)
+        self.final_score = np.zeros(length, dtype=np.int64)
+        self.action = np.zeros(length, dtype=np.int8)
+        self.first_buy = np.full(length, np.nan)
+        self.second_buy = np.full(length, np.nan)
+        self.first_sell = np.full(length, np.nan)
+        self.second_sell = np.full(length, np.nan)
+        self.stop_loss = np.full(length, np.nan)
+
+    def at(self, index: int) -> Dict[str, float]:
+        return {
+            "trend_score": int(self.trend_score[index]),
+            "momentum_score": int(self.momentum_score[index]),
+            "volume_score": int(self.volume_score[index]),
+            "volatility_score": int(self.volatility_score[index]),
+            "risk_penalty": int(self.risk_penalty[index]),
+            "final_score": int(self.final_score[index]),
+            "first_buy": float(self.first_buy[index]),
+            "second_buy": float(self.second_buy[index]),
+            "first_sell": float(self.first_sell[index]),
+            "second_sell": float(self.second_sell[index]),
+            "stop_loss": float(self.stop_loss[index]),
+        }
+
+
+class ScoreEngine:
+    """
+    분석 점수 모델의 봉 단위 벡터 계산기 (백테스트용)
+
+    시장 맥락·뉴스·수급·펀더멘털은 과거 시점 값을 재현할 수 없어 중립(0/없음)으로 둔다.
+    """
+
+    def __init__(self) -> None:
+        self.indicator_engine = IndicatorEngine()
+
+    def score(self, history: CandleSeries, period: str = "short") -> ScoreSeries:
+        length = len(history)
+        result = ScoreSeries(length)
+        if length < 2:
+            return result
+
+        profile = AnalysisService._get_strategy_profile(period)
+        score_profile = AnalysisService._get_score_profile(period)
+        intraday = (period or "").lower() == "intraday"
+        close, high, low, volume = history.close, history.high, history.low, history.volume
+        # Bollinger in _build_analysis uses min(20, len(history)) bars, i.e. an expanding window at first.
+        indicators = self.indicator_engine.compute(high, low, close, volume, bollinger_period=length + 1)
+        index = np.arange(length)
+
+        current = close
+        previous_close = np.concatenate(([close[0]], close[:-1]))
+        primary_span = int(profile["primary_span"])
+        secondary_span = int(profile["secondary_span"])
+        sma20 = trailing_window_mean(close, primary_span)
+        sma60 = trailing_window_mean(close, secondary_span)
+        prev_sma20 = np.concatenate(([sma20[0]], trailing_window_mean(close[:-1], primary_span)))
+        prev_sma20 = np.where(index + 1 > primary_span, prev_sma20, sma20)
+        low20 = trailing_window_min(low, primary_span)
+        low60 = trailing_window_min(low, secondary_span)
+        high20 = trailing_window_max(high, primary_span)
+        high60 = trailing_window_max(high, secondary_span)
+
+        macd_line, signal_line = self._masked_macd(indicators, index)
+        prev_macd = np.concatenate(([np.nan], indicators.macd[:-1]))
+        prev_signal = np.concatenate(([np.nan], indicators.macd_signal[:-1]))
+        macd_ok = ~np.isnan(macd_line)
+        macd_golden = macd_ok & (prev_macd <= prev_signal) & (macd_line > signal_line)
+        macd_dead = macd_ok & (prev_macd >= prev_signal) & (macd_line < signal_line)
+
+        stoch_k, stoch_d = self._masked_stochastic(indicators, index)
+        prev_k = np.concatenate(([np.nan], indicators.stoch_k[:-1]))
+        prev_d = np.concatenate(([np.nan], indicators.stoch_d[:-1]))
+        k_ok = ~np.isnan(stoch_k)
+        stoch_golden = k_ok & (prev_k <= prev_d) & (stoch_k > stoch_d)
+        stoch_dead = k_ok & (prev_k >= prev_d) & (stoch_k < stoch_d)
+
+        rsi = indicators.rsi
+        atr = indicators.atr
+        middle, bandwidth, position = self._bollinger(close)
+        volume_ratio = self._volume_ratio(volume)
+
+        with np.errstate(invalid="ignore"):
+            up = (current >= sma20) & (sma20 >= sma60)
+            down = (current <= sma20) & (sma20 <= sma60)
+            sideways = ~up & ~down
+            result.trend = np.select([up, down], [TREND_UP, TREND_DOWN], TREND_SIDEWAYS).astype(np.int8)
+
+            # _score_trend
+            trend_base = np.select([up, (current >= sma20) & (sma20 < sma60), down], [18, 12, 3], 8)
+            crossed_up = (previous_close <= prev_sma20) & ((prev_sma20 < current) | (current > sma20))
+            macd_holding = macd_ok & (macd_line > signal_line) & (macd_line - signal_line >= 0)
+            macd_points = np.select([macd_golden, macd_holding], [7, 5], 0)
+            result.trend_score = np.minimum(30, trend_base + np.where(crossed_up, 5, 0) + macd_points)
+
+            # _score_momentum
+            rsi_ok = ~np.isnan(rsi)
+            rsi_points = np.select(
+                [(45 <= rsi) & (rsi <= 65), (30 <= rsi) & (rsi < 45), (65 < rsi) & (rsi <= 75), rsi < 30],
+                [8, 6, 6 if intraday else 4, 4],
+                3 if intraday else 2,
+            )
+            stoch_points = np.select(
+                [
+                    stoch_golden & (stoch_k <= 45),
+                    k_ok & ~np.isnan(stoch_d) & (stoch_k > stoch_d) & (stoch_k < (90 if intraday else 80)),
+                    stoch_dead & (stoch_k >= 55),
+                    k_ok & (stoch_k >= 85),
+                ],
+                [8, 7 if intraday else 6, 2 if intraday else 1, 2 if intraday else 1],
+                0,
+            )
+            result.momentum_score = np.minimum(20, np.where(rsi_ok, rsi_points, 0) + stoch_points)
+
+            # _score_volume
+            price_up = current >= previous_close
+            volume_points = np.select(
+                [
+                    (volume_ratio >= 1.8) & price_up,
+                    (volume_ratio >= 1.2) & price_up,
+                    intraday & (volume_ratio >= 0.6) & price_up,
+                    intraday & (volume_ratio >= 0.45) & price_up,
+                    (0.9 <= volume_ratio) & (volume_ratio < 1.2),
+                    (volume_ratio >= 1.2) & ~price_up,
+                ],
+                [15, 12, 7, 5, 9, 5],
+                3,
+            )
+            result.volume_score = np.where(np.isnan(volume_ratio), 5, np.minimum(15, volume_points))
+
+            # _score_volatility
+            band_ok = ~np.isnan(bandwidth) & ~np.isnan(position)
+            band_points = np.select(
+                [(0.15 <= position) & (position <= 0.75) & (bandwidth <= 0.18), position >= 0.85, position <= 0.15],
+                [8, 4, 4],
+                6,
+            )
+            atr_ok = ~np.isnan(atr) & (atr != 0) & (current != 0)
+            atr_ratio = np.where(atr_ok, atr / np.where(current != 0, current, 1.0), np.nan)
+            atr_points = np.select([atr_ratio <= 0.025, atr_ratio <= 0.05, atr_ratio <= 0.08], [7, 5, 3], 1)
+            result.volatility_score = np.minimum(15, np.where(band_ok, band_points, 5) + np.where(atr_ok, atr_points, 0))
+
+            # Price levels (supports below / resistances above the current price)
+            supports = np.round(
+                np.vstack(
+                    [low20, low60, sma20, sma60, current * (1 - profile["buy_gap_1"]), current * (1 - profile["buy_gap_2"])]
+                ),
+                6,
+            )
+            supports = np.where(supports < current, supports, -np.inf)
+            first_buy = supports.max(axis=0)
+            second_buy = np.where(supports < first_buy, supports, -np.inf).max(axis=0)
+            resistances = np.round(
+                np.vstack([high20, high60, current * (1 + profile["sell_gap_1"]), current * (1 + profile["sell_gap_2"])]),
+                6,
+            )
+            resistances = np.where(resistances > current, resistances, np.inf)
+            first_sell = resistances.min(axis=0)
+            second_sell = np.where(resistances > first_sell, resistances, np.inf).min(axis=0)
+            result.first_buy = np.where(np.isfinite(first_buy), first_buy, current * (1 - profile["buy_gap_1"]))
+            result.second_buy = np.where(np.isfinite(second_buy), second_buy, current * (1 - profile["buy_gap_2"]))
+            result.first_sell = np.where(np.isfinite(first_sell), first_sell, current * (1 + profile["sell_gap_1"]))
+            result.second_sell = np.where(np.isfinite(second_sell), second_sell, current * (1 + profile["sell_gap_2"]))
+            result.stop_loss = np.maximum(result.second_buy * profile["stop_factor"], low60 * profile["low_factor"])
+
+            # _score_risk (no investor flow or news in a replay)
+            gap = np.where(
+                np.isfinite(first_sell) & (current != 0),
+                np.abs(first_sell - current) / np.where(current != 0, current, 1.0),
+                np.inf,
+            )
+            penalty = (
+                np.where((current < sma20) & (sma20 < sma60), 3 if intraday else 5, 0)
+                + np.where(gap <= 0.015, 2 if intraday else 4, 0)
+                + np.where(rsi >= 75, 2 if intraday else 4, 0)
+                + np.where(stoch_dead & (stoch_k >= 75), 2 if intraday else 3, 0)
+                + np.where(position >= 0.95, 1 if intraday else 2, 0)
+                + np.where(macd_dead, 2 if intraday else 3, 0)
+            )
+            result.risk_penalty = np.minimum(20, penalty)
+
+        volume_confirmation = int(score_profile["volume_confirmation_bonus"])
+        structural = np.where(
+            up,
+            int(score_profile["uptrend_bonus"])
+            + np.select([result.volume_score >= 9, result.volume_score >= 6], [volume_confirmation, max(1, volume_confirmation - 1)], 0),
+            np.where(sideways, int(score_profile["sideways_bonus"]), 0),
+        )
+        weighted_risk = np.round(result.risk_penalty * score_profile["risk_multiplier"]).astype(np.int64)
+        result.final_score = np.clip(
+            result.trend_score + result.momentum_score + result.volume_score + result.volatility_score + structural - weighted_risk,
+            0,
+            100,
+        )
+        result.action = np.select(
+            [result.final_score >= score_profile["buy_threshold"], result.final_score <= score_profile["sell_threshold"]],
+            [ACTION_BUY, ACTION_SELL],
+            ACTION_HOLD,
+        ).astype(np.int8)
+        return result
+
+    def _masked_macd(self, indicators, index: np.ndarray):
+        # With fewer than MACD_MIN_BARS bars the live analysis has no MACD at all.
+        available = index + 1 >= IndicatorEngine.MACD_MIN_BARS
+        return np.where(available, indicators.macd, np.nan), np.where(available, indicators.macd_signal, np.nan)
+
+    def _masked_stochastic(self, indicators, index: np.ndarray):
+        available = index + 1 >= IndicatorEngine.STOCH_PERIOD + IndicatorEngine.STOCH_SMOOTH
+        return np.where(available, indicators.stoch_k, np.nan), np.where(available, indicators.stoch_d, np.nan)
+
+    @staticmethod
+    def _bollinger(close: np.ndarray):
+        period = IndicatorEngine.BOLLINGER_PERIOD
+        middle = trailing_window_mean(close, period)
+        deviation = trailing_window_std(close, period)
+        upper = middle + IndicatorEngine.BOLLINGER_MULTIPLIER * deviation
+        lower = middle - IndicatorEngine.BOLLINGER_MULTIPLIER * deviation
+        width = upper - lower
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bandwidth = np.where(middle != 0, width / middle, np.nan)
+            position = np.where(width == 0, 0.5, (close - lower) / width)
+        return middle, bandwidth, position
+
+    @staticmethod
+    def _volume_ratio(volume: np.ndarray) -> np.ndarray:
+        # IndicatorEngine._volume_ratio evaluated on every prefix volume[:t+1].
+        period = IndicatorEngine.VOLUME_PERIOD
+        length = len(volume)
+        positive = volume > 0
+        last_positive_index = np.maximum.accumulate(np.where(positive, np.arange(length), -1))
+        last_positive = np.where(last_positive_index >= 0, volume[np.maximum(last_positive_index, 0)], np.nan)
+        window_sum = trailing_window_sum(np.where(positive, volume, 0.0), period)
+        window_count = trailing_window_sum(positive.astype(np.float64), period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            average = np.where(window_count > 0, window_sum / window_count, 0.0)
+            ratio = last_positive / average
+        ratio = np.where((np.arange(length) + 1 > period) & (average > 0) & (ratio >= 0.05), ratio, np.nan)
+        return ratio
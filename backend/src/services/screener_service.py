@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import operator
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.settings import settings
+from src.services.analysis_service import AnalysisService
+from src.services.candle_series import CANDLE_FIELDS, CandleSeries
+from src.services.score_engine import ACTION_BUY, ACTION_SELL, TREND_DOWN, TREND_UP, ScoreEngine
+from src.utils.server_timing import stage
+
+NUMERIC_FIELDS = (
+    "final_score",
+    "trend_score",
+    "momentum_score",
+    "volume_score",
+    "volatility_score",
+    "risk_penalty",
+    "close",
+    "change_percent",
+    "first_buy",
+    "first_sell",
+    "stop_loss",
+)
+LABEL_FIELDS = {"action": ("buy", "hold", "sell"), "trend": ("up", "sideways", "down"), "market": ()}
+COMPARISONS: Dict[str, Callable] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+_FILTER_PATTERN = re.compile(r"^\s*([a-z_]+)\s*(>=|<=|==|!=|=|>|<)\s*(\S+)\s*$")
+MARKET_SUFFIXES = {".KS": "KOSPI", ".KQ": "KOSDAQ"}
+
+ScreenFilter = Tuple[str, str, object]
+
+
+def parse_filters(expressions: Sequence[str]) -> List[ScreenFilter]:
+    """'final_score>=60', 'action==buy' 같은 조건식을 (필드, 연산자, 값)으로 변환"""
+    filters: List[ScreenFilter] = []
+    for expression in expressions:
+        match = _FILTER_PATTERN.match(expression or "")
+        if not match:
+            raise ValueError(f"Invalid filter expression: {expression}")
+        field, comparison, raw_value = match.groups()
+        if field in NUMERIC_FIELDS:
+            try:
+                value: object = float(raw_value)
+            except ValueError as exc:
+                raise ValueError(f"Filter {field} needs a number: {raw_value}") from exc
+            if not math.isfinite(value):
+                raise ValueError(f"Filter {field} needs a finite number: {raw_value}")
+        elif field in LABEL_FIELDS:
+            if comparison not in ("==", "=", "!="):
+                raise ValueError(f"Filter {field} only supports == and !=")
+            value = raw_value.upper() if field == "market" else raw_value.lower()
+            allowed = LABEL_FIELDS[field]
+            if allowed and value not in allowed:
+                raise ValueError(f"Filter {field} must be one of {', '.join(allowed)}")
+        else:
+            raise ValueError(f"Unknown filter field: {field}")
+        filters.append((field, comparison, value))
+    return filters
+
+
+def is_equity(yahoo_symbol: str) -> bool:
+    # Indices (^KS11), FX pairs (KRW=X) and futures (CL=F) share the candle store but have no score to screen.
+    return not yahoo_symbol.startswith("^") and "=" not in yahoo_symbol
+
+
+def market_of(yahoo_symbol: str) -> str:
+    for suffix, market in MARKET_SUFFIXES.items():
+        if yahoo_symbol.endswith(suffix):
+            return market
+    return "GLOBAL"
+
+
+def score_chunk(payload: Dict[str, object]) -> List[Dict[str, object]]:
+    """프로세스 풀 작업 단위: 종목 묶음의 마지막 봉 기술적 점수"""
+    engine = ScoreEngine()
+    period = str(payload["period"])
+    rows: List[Dict[str, object]] = []
+    for symbol, columns in payload["items"]:
+        history = CandleSeries(*(columns[field] for field in CANDLE_FIELDS))
+        if len(history) < 2:
+            continue
+        scores = engine.score(history, period)
+        close = float(history.close[-1])
+        previous = float(history.close[-2])
+        row: Dict[str, object] = scores.at(-1)
+        row.update(
+            {
+                "symbol": symbol,
+                "market": market_of(symbol),
+                "close": close,
+                "change_percent": (close / previous - 1) * 100 if previous else 0.0,
+                "action": "buy" if scores.action[-1] == ACTION_BUY else ("sell" if scores.action[-1] == ACTION_SELL else "hold"),
+                "trend": "up" if scores.trend[-1] == TREND_UP else ("down" if scores.trend[-1] == TREND_DOWN else "sideways"),
+                "last_bar_at": int(history.timestamp[-1]),
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+def rank_rows(rows: List[Dict[str, object]], filters: Sequence[ScreenFilter], limit: int) -> Tuple[int, List[Dict[str, object]]]:
+    """종목 전체를 열 배열로 모아 조건을 한 번에 걸고 final_score 내림차순으로 자른다"""
+    if not rows:
+        return 0, []
+    columns = {field: np.array([row[field] for row in rows]) for field in (*NUMERIC_FIELDS, *LABEL_FIELDS)}
+    mask = np.ones(len(rows), dtype=bool)
+    for field, comparison, value in filters:
+        mask &= COMPARISONS[comparison](columns[field], value)
+    matched = np.flatnonzero(mask)
+    # Stable sort keeps ties in universe order so repeated screens list them identically.
+    order = matched[np.argsort(-columns["final_score"][matched], kind="stable")]
+    return len(matched), [rows[index] for index in order[:limit]]
+
+
+class ScreenerService:
+    """
+    종목 유니버스 전체에 분석 점수 모델의 기술적 부분(추세·모멘텀·거래량·변동성)을 돌려 순위를 매긴다
+
+    봉은 캔들 저장소에 있는 것을 쓰고, 계산은 종목 묶음 단위로 프로세스 풀에 나눠 맡긴다.
+    """
+
+    def __init__(self, analysis_service: Optional[AnalysisService] = None, max_workers: Optional[int] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.analysis_service = analysis_service or AnalysisService()
+        self.max_workers = max_workers if max_workers is not None else (settings.screener_workers or os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def universe(self, market: Optional[str] = None) -> List[str]:
+        """설정된 유니버스 파일, 없으면 캔들 저장소에 일봉이 있는 종목"""
+        symbols: List[str] = []
+        if settings.screener_universe_file:
+            try:
+                with open(settings.screener_universe_file, encoding="utf-8") as handle:
+                    symbols = [line.strip().upper() for line in handle if line.strip() and not line.startswith("#")]
+            except OSError as exc:
+                self.logger.warning("Screener universe file unreadable: %s", exc)
+        if not symbols:
+            symbols = self.analysis_service.candle_store.stored_symbols("1d")
+        symbols = [symbol for symbol in symbols if is_equity(symbol)]
+        if market:
+            wanted = market.upper()
+            symbols = [symbol for symbol in symbols if symbol.isdigit() or market_of(symbol) == wanted]
+        return list(dict.fromkeys(symbols))
+
+    async def screen(
+        self,
+        period: str = "short",
+        filters: Sequence[ScreenFilter] = (),
+        symbols: Optional[Sequence[str]] = None,
+        market: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict[str, object]:
+        period = (period or "short").lower()
+        if period not in AnalysisService.ALL_PERIODS:
+            raise ValueError(f"Unsupported screener period: {period}")
+        universe = [symbol.upper() for symbol in symbols] if symbols else self.universe(market)
+        with stage("screener_history", f"{len(universe)} symbols"):
+            histories = await self._load_histories(universe, period, market)
+        with stage("screener_scoring", period):
+            rows = await self._score(histories, period)
+        with stage("screener_rank"):
+            matched, ranked = rank_rows(rows, filters, limit)
+        for row in ranked:
+            row["yahoo_symbol"] = row["symbol"]
+            if row["market"] != "GLOBAL":
+                row["symbol"] = row["symbol"].split(".")[0]
+        return {"period": period, "universe": len(universe), "scored": len(rows), "matched": matched, "results": ranked}
+
+    async def _load_histories(self, symbols: Sequence[str], period: str, market: Optional[str]) -> Dict[str, CandleSeries]:
+        analysis = self.analysis_service
+        range_value = analysis._get_analysis_window(period)["range"]
+        semaphore = asyncio.Semaphore(max(1, settings.analysis_batch_concurrency))
+        now = time.time()
+        # Bare KRX codes resolve to whichever .KS/.KQ series is already stored; only unknown codes probe upstream.
+        stored = set(analysis.candle_store.stored_symbols("1d"))
+
+        async def load(symbol: str) -> Tuple[str, CandleSeries]:
+            async with semaphore:
+                try:
+                    yahoo_symbol = next(
+                        (candidate for candidate in analysis._symbol_candidates(symbol, market) if candidate in stored), None
+                    ) or await analysis._resolve_stock_symbol(symbol, market, max_age=settings.screener_candle_max_age)
+                    daily = await analysis.candle_store.get_history(
+                        yahoo_symbol,
+                        "1d",
+                        range_value,
+                        analysis._download_history,
+                        max_age=settings.screener_candle_max_age,
+                    )
+                except Exception as exc:
+                    self.logger.warning("Screener history load failed for %s: %s", symbol, exc)
+                    return symbol, CandleSeries.empty()
+                return yahoo_symbol, analysis._derive_period_history(daily, yahoo_symbol, period, now) if len(daily) else daily
+
+        loaded = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        histories = {symbol: history for symbol, history in loaded if len(history)}
+        if market:
+            histories = {symbol: history for symbol, history in histories.items() if market_of(symbol) == market.upper()}
+        return histories
+
+    async def _score(self, histories: Dict[str, CandleSeries], period: str) -> List[Dict[str, object]]:
+        items = [(symbol, {field: getattr(history, field) for field in CANDLE_FIELDS}) for symbol, history in histories.items()]
+        if not items:
+            return []
+        if self.max_workers <= 1:
+            return await asyncio.to_thread(score_chunk, {"period": period, "items": items})
+        chunk_size = max(1, math.ceil(len(items) / (self.max_workers * 4)))
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, score_chunk, {"period": period, "items": items[start:start + chunk_size]})
+                for start in range(0, len(items), chunk_size)
+            )
+        )
+        return [row for chunk in chunks for row in chunk]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned (not forked) workers: the server process has an event loop and threads running.
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
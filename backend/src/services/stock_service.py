@@ -1,18 +1,26 @@
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+from src.services.alert_index import stock_key
 from src.services.domestic_quote_service import DomesticQuoteService
 from src.services.global_quote_service import GlobalQuoteService
 from src.services.naver_stock_service import NaverStockService
+from src.services.quote_events import QuoteEventBus, quote_event_bus
+from src.services.quote_router import QuoteRouter
+from src.utils.timing import timed
 
 
 class StockService:
-    def __init__(self) -> None:
+    def __init__(self, quote_router: Optional[QuoteRouter] = None, events: Optional[QuoteEventBus] = None) -> None:
         self.logger = logging.getLogger(__name__)
         self.naver = NaverStockService()
-        self.domestic = DomesticQuoteService(self.naver)
-        self.global_quote = GlobalQuoteService(self.naver)
+        self.quote_router = quote_router or QuoteRouter()
+        self.events = events if events is not None else quote_event_bus
+        self.domestic = DomesticQuoteService(self.naver, router=self.quote_router)
+        self.global_quote = GlobalQuoteService(self.naver, router=self.quote_router)
 
+    @timed()
     async def search_stocks(self, query: str) -> List[Dict[str, Any]]:
         results = await self.naver.search_stock(query)
         normalized: List[Dict[str, Any]] = []
@@ -57,22 +65,47 @@ class StockService:
                 ordered.append(global_map[symbol])
             else:
                 ordered.append(item)
+        for item in ordered:
+            self._publish(item["symbol"], item)
         return ordered
 
+    @timed()
     async def get_stock_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         normalized_symbol = str(symbol or "").strip().upper()
         if not normalized_symbol:
             return None
         if normalized_symbol.isdigit():
-            return await self.domestic.get_quote(normalized_symbol)
-        return await self.global_quote.get_quote(normalized_symbol)
+            quote = await self.domestic.get_quote(normalized_symbol)
+        else:
+            quote = await self.global_quote.get_quote(normalized_symbol)
+        self._publish(normalized_symbol, quote)
+        return quote
 
+    @timed()
+    async def get_stock_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        normalized = [str(symbol or "").strip().upper() for symbol in symbols]
+        domestic_symbols = [symbol for symbol in normalized if symbol.isdigit()]
+        global_symbols = [symbol for symbol in normalized if symbol and not symbol.isdigit()]
+        domestic_quotes, global_quotes = await asyncio.gather(
+            self.domestic.get_quotes(domestic_symbols),
+            self.global_quote.get_quotes(global_symbols),
+        )
+        quotes = {**domestic_quotes, **global_quotes}
+        for symbol, quote in quotes.items():
+            self._publish(symbol, quote)
+        return quotes
+
+    @timed()
     async def get_stock_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
         normalized_symbol = str(symbol or "").strip().upper()
         if not normalized_symbol or normalized_symbol.isdigit():
             return None
         return await self.global_quote.get_fundamentals(normalized_symbol)
 
+    def _publish(self, symbol: str, quote: Optional[Dict[str, Any]]) -> None:
+        if quote:
+            self.events.publish(stock_key(symbol), quote.get("price"), quote)
+
     @staticmethod
     def _coerce_float(value: Any) -> Optional[float]:
         if value is None or value == "":
@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Iterable, List, Optional
 
@@ -7,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.database import StockQuoteSnapshot, WatchlistItem
 from src.services.stock_service import StockService
+from src.utils.timing import timed
 
 
 class WatchlistQuoteService:
@@ -33,6 +33,7 @@ class WatchlistQuoteService:
         row_map = {row.symbol: row for row in rows}
         return [row_map[symbol] for symbol in symbols if symbol in row_map]
 
+    @timed()
     async def refresh_snapshots(
         self,
         db: AsyncSession,
@@ -50,11 +51,10 @@ class WatchlistQuoteService:
         if not target_symbols:
             return []
 
-        quotes = await asyncio.gather(
-            *(self.stock_service.get_stock_quote(symbol) for symbol in target_symbols)
-        )
+        quotes = await self.stock_service.get_stock_quotes(target_symbols)
         refreshed_symbols: List[str] = []
-        for symbol, quote in zip(target_symbols, quotes):
+        for symbol in target_symbols:
+            quote = quotes.get(symbol)
             if not quote or quote.get("price") is None:
                 continue
 
@@ -1,4 +1,6 @@
+import asyncio
 import functools
+import logging
 import time
 import traceback
 from typing import Any, Callable
@@ -21,54 +23,62 @@ def log_function(
         log_return: 반환값 로깅 여부
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
+        def resolve_logger():
             # 로거 설정 (미제공 시 함수의 모듈 로거 사용)
             nonlocal logger
             if logger is None:
                 logger = get_logger(func.__module__)
-            
-            # 로깅 레벨 매핑
-            log_levels = {
-                'DEBUG': logger.debug,
-                'INFO': logger.info,
-                'WARNING': logger.warning,
-                'ERROR': logger.error,
-                'CRITICAL': logger.critical
-            }
-            log_method = log_levels.get(log_level.upper(), logger.info)
-            
-            # 함수 호출 로깅
-            func_name = func.__name__
-            log_method(f"Calling function: {func_name}")
-            
-            # 인자 로깅
-            if log_args:
-                log_method(f"Function arguments: args={args}, kwargs={kwargs}")
-            
-            # 실행 시간 측정
-            start_time = time.time()
-            
+            return logger
+
+        def before_call(args, kwargs):
+            func_logger = resolve_logger()
+            log_method = getattr(func_logger, log_level.lower(), func_logger.info)
+            log_method(f"Calling function: {func.__name__}")
+
+            # 인자는 크기가 클 수 있어 DEBUG 레벨에서만 기록
+            if log_args and func_logger.isEnabledFor(logging.DEBUG):
+                func_logger.debug(f"Function arguments: args={args}, kwargs={kwargs}")
+            return log_method, time.perf_counter()
+
+        def after_call(log_method, start_time, result):
+            execution_time = time.perf_counter() - start_time
+            log_method(f"Function {func.__name__} executed in {execution_time:.4f} seconds")
+
+            # 반환값 로깅
+            if log_return:
+                log_method(f"Function return value: {result}")
+
+        def on_error(error: Exception):
+            func_logger = resolve_logger()
+            func_logger.error(f"Exception in {func.__name__}: {str(error)}")
+            func_logger.error(f"Traceback: {traceback.format_exc()}")
+
+        if asyncio.iscoroutinefunction(func):
+            # 코루틴은 생성 시점이 아니라 await 완료 시점까지 측정
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                log_method, start_time = before_call(args, kwargs)
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    on_error(e)
+                    raise
+                after_call(log_method, start_time, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            log_method, start_time = before_call(args, kwargs)
             try:
-                # 함수 실행
                 result = func(*args, **kwargs)
-                
-                # 실행 시간 계산
-                execution_time = time.time() - start_time
-                log_method(f"Function {func_name} executed in {execution_time:.4f} seconds")
-                
-                # 반환값 로깅
-                if log_return:
-                    log_method(f"Function return value: {result}")
-                
-                return result
-            
             except Exception as e:
-                # 예외 로깅
-                logger.error(f"Exception in {func_name}: {str(e)}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                on_error(e)
                 raise
-        
+            after_call(log_method, start_time, result)
+            return result
+
         return wrapper
-    
-    return decorator 
\ No newline at end of file
+
+    return decorator
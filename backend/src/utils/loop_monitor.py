@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from src.utils.metrics import Histogram
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+APP_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EventLoopMonitor:
+    """이벤트 루프 지연 측정 + 루프를 막은 호출 지점 샘플링"""
+
+    def __init__(self, interval: float = 0.1, slow_threshold: float = 0.1, max_sites: int = 200) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.max_sites = max_sites
+        self.lag = Histogram(LAG_BUCKETS)
+        self.slow_sites: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._captured_heartbeat = 0.0
+        self._pending_site: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, interval: Optional[float] = None, slow_threshold: Optional[float] = None) -> None:
+        if self.is_running:
+            return
+        if interval:
+            self.interval = interval
+        if slow_threshold:
+            self.slow_threshold = slow_threshold
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        # Each run gets its own stop event, so a restart can never revive a watchdog that is still winding down.
+        self._stop = threading.Event()
+        self.started_at = time.time()
+        self._task = asyncio.get_running_loop().create_task(self._sample_lag())
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stop,), name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        self.logger.info("Event loop monitor started (interval=%.3fs, slow=%.3fs)", self.interval, self.slow_threshold)
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, max(self.slow_threshold, 0.02) * 2)
+            self._watchdog = None
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            sites = sorted(self.slow_sites.values(), key=lambda item: item["total_seconds"], reverse=True)
+            top_sites = [
+                {
+                    **{key: value for key, value in site.items() if key != "stack"},
+                    "total_seconds": round(site["total_seconds"], 4),
+                    "max_seconds": round(site["max_seconds"], 4),
+                    "stack": list(site["stack"]),
+                }
+                for site in sites[:top]
+            ]
+        return {
+            "enabled": self.is_running,
+            "started_at": self.started_at,
+            "interval_seconds": self.interval,
+            "slow_threshold_seconds": self.slow_threshold,
+            "lag": self.lag.snapshot(),
+            "slow_call_sites": top_sites,
+        }
+
+    def reset(self) -> None:
+        self.lag.reset()
+        with self._lock:
+            self.slow_sites.clear()
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.lag.observe(lag)
+            if lag >= self.slow_threshold:
+                self._record_stall(lag)
+
+    def _record_stall(self, lag: float) -> None:
+        with self._lock:
+            site = self._pending_site or {"site": "unattributed", "stack": []}
+            self._pending_site = None
+            entry = self.slow_sites.get(site["site"])
+            if entry is None:
+                if len(self.slow_sites) >= self.max_sites:
+                    return
+                entry = {"site": site["site"], "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "stack": site["stack"]}
+                self.slow_sites[site["site"]] = entry
+            entry["count"] += 1
+            entry["total_seconds"] += lag
+            entry["max_seconds"] = max(entry["max_seconds"], lag)
+            entry["last_seen"] = time.time()
+
+    def _watch(self, stop: threading.Event) -> None:
+        # Runs off-loop: when the heartbeat stops advancing, the loop thread is stuck in a callback,
+        # so its current Python stack is the offending call site.
+        poll = max(self.slow_threshold / 2, 0.01)
+        while not stop.wait(poll):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for < self.slow_threshold or heartbeat == self._captured_heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._captured_heartbeat = heartbeat
+            site = self._describe_stack(traceback.extract_stack(frame))
+            with self._lock:
+                self._pending_site = site
+
+    @staticmethod
+    def _describe_stack(stack: traceback.StackSummary) -> Dict[str, Any]:
+        frames = [frame for frame in stack if "asyncio" not in frame.filename.replace("\\", "/").split("/")]
+        app_frames = [frame for frame in frames if frame.filename.startswith(APP_SOURCE_ROOT)]
+        origin = (app_frames or frames or list(stack))[-1]
+        filename = origin.filename
+        if filename.startswith(APP_SOURCE_ROOT):
+            filename = os.path.relpath(filename, os.path.dirname(APP_SOURCE_ROOT))
+        site = f"{filename}:{origin.lineno} in {origin.name}"
+        rendered: List[str] = [
+            f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in (frames or list(stack))[-12:]
+        ]
+        return {"site": site, "stack": rendered}
+
+
+event_loop_monitor = EventLoopMonitor()
@@ -0,0 +1,272 @@
+import bisect
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets: List[float] = sorted(float(bound) for bound in buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def cumulative_counts(self) -> List[int]:
+        total = 0
+        cumulative: List[int] = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets + [self.max], self.cumulative_counts()):
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            cumulative = self.cumulative_counts()
+            return {
+                "count": self.count,
+                "sum": round(self.sum, 6),
+                "max": round(self.max, 6),
+                "p50": self.quantile(0.5),
+                "p99": self.quantile(0.99),
+                "buckets": {
+                    **{str(bound): cumulative[index] for index, bound in enumerate(self.buckets)},
+                    "+Inf": cumulative[-1],
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0.0
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def reset(self) -> None:
+        self.set(0.0)
+
+
+class MetricFamily(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.children: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        ...
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {key}")
+            with self._lock:
+                child = self.children.setdefault(key, self._new_child())
+        return child
+
+    def items(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            children = sorted(self.children.items())
+        return [(dict(zip(self.label_names, key)), child) for key, child in children]
+
+    def reset(self) -> None:
+        for _, child in self.items():
+            child.reset()
+
+
+class CounterFamily(MetricFamily):
+    type = "counter"
+
+    def _new_child(self) -> Counter:
+        return Counter()
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        return [{"labels": labels, "value": child.value} for labels, child in self.items()]
+
+
+class GaugeFamily(MetricFamily):
+    type = "gauge"
+
+    def _new_child(self) -> Gauge:
+        return Gauge()
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        return [{"labels": labels, "value": child.value} for labels, child in self.items()]
+
+
+class HistogramFamily(MetricFamily):
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> Histogram:
+        return Histogram(self.buckets)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        return [{"labels": labels, **child.snapshot()} for labels, child in self.items()]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.families: Dict[str, MetricFamily] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, family_class: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            family = self.families.get(name)
+            if family is None:
+                family = family_class(name, *args)
+                self.families[name] = family
+            elif not isinstance(family, family_class):
+                raise ValueError(f"Metric {name} already registered as {family.type}")
+            return family
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> CounterFamily:
+        return self._get_or_create(CounterFamily, name, description, label_names)
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> GaugeFamily:
+        return self._get_or_create(GaugeFamily, name, description, label_names)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> HistogramFamily:
+        return self._get_or_create(HistogramFamily, name, description, label_names, buckets)
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        # Collectors refresh pull-style gauges (pool usage, cache sizes) right before exposition.
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in list(self.collectors):
+            try:
+                collector()
+            except Exception:
+                logging.getLogger(__name__).warning("Metrics collector %s failed", collector, exc_info=True)
+
+    def render(self) -> str:
+        self.collect()
+        lines: List[str] = []
+        with self._lock:
+            families = sorted(self.families.values(), key=lambda family: family.name)
+        for family in families:
+            lines.append(f"# HELP {family.name} {_escape_help(family.description)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for labels, child in family.items():
+                if isinstance(child, Histogram):
+                    lines.extend(_render_histogram(family.name, labels, child))
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items())
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _render_histogram(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+    with histogram._lock:
+        cumulative = histogram.cumulative_counts()
+        total, count = histogram.sum, histogram.count
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative[index]}"
+        for index, bound in enumerate(histogram.buckets)
+    ]
+    lines.append(f"{name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {cumulative[-1]}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return lines
+
+
+registry = MetricsRegistry()
+
+CACHE_REQUESTS = registry.counter("cache_requests_total", "In-memory cache lookups by result", ("cache", "result"))
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
@@ -0,0 +1,60 @@
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+_current_timer: contextvars.ContextVar = contextvars.ContextVar("stage_timer", default=None)
+_METRIC_NAME_PATTERN = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class StageTimer:
+    """요청 단위 단계별 소요 시간 기록 (Server-Timing 헤더/디버그 블록용)"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: List[Dict[str, object]] = []
+
+    def record(self, name: str, duration_ms: float, description: Optional[str] = None) -> None:
+        self.stages.append({"name": name, "duration_ms": round(duration_ms, 2), "description": description})
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def header_value(self) -> str:
+        entries = []
+        for stage in self.stages:
+            entry = f"{_METRIC_NAME_PATTERN.sub('_', str(stage['name']))};dur={stage['duration_ms']}"
+            if stage["description"]:
+                entry += f';desc="{str(stage["description"]).replace(chr(34), "")}"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.total_ms}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"total_ms": self.total_ms, "stages": [dict(stage) for stage in self.stages]}
+
+
+def start_stage_timer() -> StageTimer:
+    # Child tasks created with asyncio.gather copy the context, so they share (and append to) this timer.
+    timer = StageTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    return _current_timer.get()
+
+
+@contextmanager
+def stage(name: str, description: Optional[str] = None) -> Iterator[None]:
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(name, (time.perf_counter() - started) * 1000, description)
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from src.utils.metrics import registry
+from src.utils.server_timing import stage
+
+STAGE_FAILURES = registry.counter(
+    "analysis_stage_failures_total", "Pipeline stages that timed out or failed", ("stage", "reason")
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StageFailed(Exception):
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(f"Stage {name} {reason}")
+        self.name = name
+        self.reason = reason
+
+
+class StageGraph:
+    """
+    의존 관계가 있는 비동기 단계 실행기
+
+    선행 단계가 끝난 단계부터 동시에 실행한다. 각 단계 함수는 선행 단계 결과를 같은 이름의 키워드 인자로 받는다.
+    필수가 아닌 단계가 제한 시간을 넘기거나 실패하면 기본값으로 대체하고 degraded에 기록한다.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self.degraded: List[str] = []
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        required: bool = True,
+        default: Any = None,
+        description: Union[None, str, Callable[[Dict[str, Any]], Optional[str]]] = None,
+    ) -> None:
+        # Dependencies must already be registered, which also rules out cycles.
+        missing = [dependency for dependency in depends if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {missing}")
+        self._stages[name] = {
+            "func": func,
+            "depends": tuple(depends),
+            "timeout": timeout,
+            "required": required,
+            "default": default,
+            "description": description,
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def execute(name: str) -> Any:
+            spec = self._stages[name]
+            inputs = {dependency: await tasks[dependency] for dependency in spec["depends"]}
+            description = spec["description"](inputs) if callable(spec["description"]) else spec["description"]
+            with stage(name, description):
+                try:
+                    return await asyncio.wait_for(spec["func"](**inputs), spec["timeout"])
+                except asyncio.TimeoutError:
+                    reason = "timeout"
+                except Exception as exc:
+                    logger.warning("Stage %s failed: %s", name, exc)
+                    reason = "error"
+            STAGE_FAILURES.labels(name, reason).inc()
+            if spec["required"]:
+                raise StageFailed(name, reason)
+            logger.warning("Stage %s %s; continuing with default", name, reason)
+            self.degraded.append(name)
+            return spec["default"]
+
+        for name in self._stages:
+            tasks[name] = asyncio.create_task(execute(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from src.utils.metrics import registry
+
+FUNCTION_LATENCY = registry.histogram(
+    "function_latency_seconds", "Wall time of instrumented service functions", ("function",)
+)
+UPSTREAM_LATENCY = registry.histogram(
+    "upstream_latency_seconds", "Wall time of calls to external data sources", ("upstream",)
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "upstream_requests_total", "Calls to external data sources by outcome", ("upstream", "outcome")
+)
+JOB_DURATION = registry.histogram(
+    "job_duration_seconds", "Wall time of background jobs", ("job",), buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+JOB_RUNS = registry.counter("job_runs_total", "Background job runs by outcome", ("job", "outcome"))
+JOB_LAST_SUCCESS = registry.gauge(
+    "job_last_success_timestamp_seconds", "Unix time of the last successful background job run", ("job",)
+)
+
+
+class TimingConfig:
+    enabled = True
+    sample_rate = 1.0
+
+
+timing_config = TimingConfig()
+
+
+def configure_timing(enabled: bool, sample_rate: float = 1.0) -> None:
+    timing_config.enabled = enabled
+    timing_config.sample_rate = max(0.0, min(1.0, sample_rate))
+
+
+def _should_sample() -> bool:
+    if not timing_config.enabled:
+        return False
+    return timing_config.sample_rate >= 1.0 or random.random() < timing_config.sample_rate
+
+
+def timed(name: Optional[str] = None, upstream: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    동기/비동기 함수 모두 실제 실행 시간을 히스토그램에 기록하는 데코레이터
+
+    Args:
+        name: 함수 라벨 (기본값: 모듈.클래스.함수)
+        upstream: 지정하면 외부 호출 지연 히스토그램에 이 이름으로 기록
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = upstream or name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+        histogram = (UPSTREAM_LATENCY if upstream else FUNCTION_LATENCY).labels(label)
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _should_sample():
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await func(*args, **kwargs)
+                    outcome = "ok" if result is not None else "empty"
+                    return result
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+                    if upstream:
+                        UPSTREAM_REQUESTS.labels(label, outcome).inc()
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _should_sample():
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "ok" if result is not None else "empty"
+                return result
+            finally:
+                histogram.observe(time.perf_counter() - started)
+                if upstream:
+                    UPSTREAM_REQUESTS.labels(label, outcome).inc()
+
+        return sync_wrapper
+
+    return decorator
+
+
+@contextmanager
+def time_upstream(upstream: str) -> Iterator[None]:
+    if not _should_sample():
+        yield
+        return
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_LATENCY.labels(upstream).observe(time.perf_counter() - started)
+        UPSTREAM_REQUESTS.labels(upstream, outcome).inc()
+
+
+@contextmanager
+def track_job(job: str) -> Iterator[None]:
+    # Jobs are rare and always recorded, regardless of the sampling rate.
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        JOB_DURATION.labels(job).observe(time.perf_counter() - started)
+        JOB_RUNS.labels(job, outcome).inc()
+        if outcome == "ok":
+            JOB_LAST_SUCCESS.labels(job).set(time.time())
@@ -24,6 +24,51 @@ else:
     engine = None
 
 
+class AlertSession:
+    def __init__(self, news_alerts=(), stock_alerts=(), currency_alerts=()):
+        # Keyed by model name so this module does not import the app before the test environment is set up.
+        self.alerts = {"NewsAlert": list(news_alerts), "StockAlert": list(stock_alerts), "CurrencyAlert": list(currency_alerts)}
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        entity = statement.column_descriptions[0]["entity"]
+        rows = [alert for alert in self.alerts[entity.__name__] if alert.is_active]
+
+        class Result:
+            def scalars(self):
+                return iter(rows)
+
+        return Result()
+
+    async def commit(self):
+        self.commits += 1
+
+
+class RecordingNotifications:
+    def __init__(self):
+        self.sent = []
+
+    async def send_push_to_all(self, db, title, body, alert_type, alert_id=None, extra_data=None):
+        self.sent.append((alert_id, body, extra_data.get("article_count")))
+        return 0
+
+
+@pytest.fixture
+def alert_session():
+    return AlertSession
+
+
+@pytest.fixture
+def notifications():
+    return RecordingNotifications()
+
+
 def require_test_database() -> None:
     if has_test_database:
         return
@@ -0,0 +1,57 @@
+import random
+
+from src.services.alert_index import PriceAlertIndex, ThresholdBook, currency_key, stock_key
+
+
+def naive_crossed(entries, price):
+    def matches(target, condition):
+        if condition == "above":
+            return price > target
+        if condition == "below":
+            return price < target
+        return price == target
+
+    return {alert_id for alert_id, target, condition in entries if matches(target, condition)}
+
+
+def test_book_finds_exactly_the_crossed_thresholds():
+    rng = random.Random(3)
+    entries = [
+        (f"a{index}", float(rng.choice([rng.randint(90, 110), round(rng.uniform(90, 110), 2)])), rng.choice(["above", "below", "equal"]))
+        for index in range(2000)
+    ]
+    book = ThresholdBook.build(entries[:1000])
+    for entry in entries[1000:]:
+        book.add(*entry)
+    for entry in entries[::7]:
+        book.remove(*entry)
+    live = [entry for index, entry in enumerate(entries) if index % 7]
+
+    assert len(book) == len(live)
+    for price in [80.0, 90.0, 95.5, 100.0, 104.37, 110.0, 120.0] + [round(rng.uniform(90, 110), 2) for _ in range(50)]:
+        crossed = book.crossed(price)
+        assert len(crossed) == len(set(crossed))
+        assert set(crossed) == naive_crossed(live, price)
+
+
+def test_index_tracks_alerts_per_instrument():
+    index = PriceAlertIndex()
+    index.rebuild(
+        [
+            (stock_key("aapl"), "s1", 150, "above"),
+            (stock_key("AAPL "), "s2", 120, "below"),
+            (currency_key("usd", "krw"), "c1", 1300, "above"),
+        ]
+    )
+    index.add(stock_key("AAPL"), "s3", 140, "above")
+    index.add(stock_key("AAPL"), "s1", 160, "above")  # re-adding moves the threshold
+
+    assert sorted(index.crossed(stock_key("AAPL"), 155)) == ["s3"]
+    assert index.crossed(stock_key("AAPL"), 100) == ["s2"]
+    assert index.crossed(currency_key("USD", "KRW"), 1350.5) == ["c1"]
+    assert index.crossed(stock_key("MSFT"), 1.0) == []
+
+    assert index.remove("s3") and not index.remove("s3")
+    assert "s3" not in index and len(index) == 3
+    assert index.crossed(stock_key("AAPL"), 155) == []
+    assert sorted(index.instruments()) == [currency_key("USD", "KRW"), stock_key("AAPL")]
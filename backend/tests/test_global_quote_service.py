@@ -48,6 +48,53 @@ async def test_get_quote_uses_latest_trade_price_and_previous_close(monkeypatch)
     assert quote["source"] == "global:yahoo_extended_quote:NVDA"
 
 
+@pytest.mark.asyncio
+async def test_get_quotes_batches_symbols_into_one_quote_call(monkeypatch):
+    urls = []
+
+    async def fake_fetch_json(self, url: str):
+        urls.append(url)
+        if "finance/chart/" in url:
+            return None
+        return {
+            "quoteResponse": {
+                "result": [
+                    {
+                        "symbol": "NVDA",
+                        "shortName": "NVIDIA Corporation",
+                        "exchange": "NMS",
+                        "currency": "USD",
+                        "regularMarketPrice": 183.22,
+                        "regularMarketTime": 1_700_000_000,
+                        "regularMarketPreviousClose": 180.25,
+                        "postMarketPrice": 184.55,
+                        "postMarketTime": 1_700_003_600,
+                    },
+                    {"symbol": "BRK-B", "regularMarketPrice": 410.0, "regularMarketTime": 1_700_000_000, "regularMarketPreviousClose": 400.0},
+                ]
+            }
+        }
+
+    monkeypatch.setattr(GlobalQuoteService, "_fetch_json", fake_fetch_json)
+
+    async def no_world_quote(symbol):
+        return None
+
+    service = GlobalQuoteService()
+    monkeypatch.setattr(service.naver, "_get_world_stock_by_symbol", no_world_quote)
+    quotes = await service.get_quotes(["nvda", "BRK-B", "ZZZZ", "NVDA"])
+
+    assert sorted(quotes) == ["BRK-B", "NVDA"]
+    assert quotes["NVDA"]["price"] == 184.55
+    assert quotes["NVDA"]["change_percent"] == 2.38
+    assert quotes["NVDA"]["market"] == "NASDAQ"
+    assert quotes["BRK-B"]["change"] == 10.0
+    # One quote call for every symbol; only the one it left out falls back to its own chart request.
+    assert len(urls) == 2
+    assert "v7/finance/quote?symbols=NVDA%2CBRK-B%2CZZZZ" in urls[0]
+    assert "finance/chart/ZZZZ" in urls[1]
+
+
 @pytest.mark.asyncio
 async def test_get_fundamentals_parses_timeseries_payload(monkeypatch):
     async def fake_fetch_json(self, url: str):
@@ -0,0 +1,185 @@
+import random
+from statistics import mean, pstdev
+
+import pytest
+
+from src.services.indicator_engine import IndicatorEngine
+
+# Reference implementations: the pure-Python indicator functions AnalysisService used before the engine.
+
+
+def reference_rsi(closes, period):
+    if len(closes) <= period:
+        return None
+    gains = []
+    losses = []
+    for previous, current in zip(closes[:-1], closes[1:]):
+        delta = current - previous
+        gains.append(max(delta, 0))
+        losses.append(abs(min(delta, 0)))
+    avg_gain = mean(gains[-period:])
+    avg_loss = mean(losses[-period:])
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def reference_ema(values, period):
+    multiplier = 2 / (period + 1)
+    ema_values = [values[0]]
+    for value in values[1:]:
+        ema_values.append((value - ema_values[-1]) * multiplier + ema_values[-1])
+    return ema_values
+
+
+def reference_macd_metrics(closes):
+    if len(closes) < 35:
+        return {"macd_line": None, "signal_line": None, "histogram": None, "golden_cross": False, "dead_cross": False}
+    ema12 = reference_ema(closes, 12)
+    ema26 = reference_ema(closes, 26)
+    macd_series = [a - b for a, b in zip(ema12[-len(ema26):], ema26)]
+    signal_series = reference_ema(macd_series, 9)
+    macd_line = macd_series[-1]
+    signal_line = signal_series[-1]
+    prev_macd = macd_series[-2]
+    prev_signal = signal_series[-2]
+    return {
+        "macd_line": macd_line,
+        "signal_line": signal_line,
+        "histogram": macd_line - signal_line,
+        "golden_cross": prev_macd <= prev_signal and macd_line > signal_line,
+        "dead_cross": prev_macd >= prev_signal and macd_line < signal_line,
+    }
+
+
+def reference_stochastic(history, period=14, smooth=3):
+    if len(history) < period + smooth:
+        return {"k": None, "d": None, "golden_cross": False, "dead_cross": False}
+    fast_k_values = []
+    for idx in range(period - 1, len(history)):
+        window = history[idx - period + 1: idx + 1]
+        highest = max(candle["high"] for candle in window)
+        lowest = min(candle["low"] for candle in window)
+        close = history[idx]["close"]
+        fast_k_values.append(50.0 if highest == lowest else ((close - lowest) / (highest - lowest)) * 100)
+    slow_k_series = [mean(fast_k_values[max(0, idx - smooth + 1): idx + 1]) for idx in range(len(fast_k_values))]
+    slow_d_series = [mean(slow_k_series[max(0, idx - smooth + 1): idx + 1]) for idx in range(len(slow_k_series))]
+    k_value, d_value = slow_k_series[-1], slow_d_series[-1]
+    prev_k, prev_d = slow_k_series[-2], slow_d_series[-2]
+    return {
+        "k": k_value,
+        "d": d_value,
+        "golden_cross": prev_k <= prev_d and k_value > d_value,
+        "dead_cross": prev_k >= prev_d and k_value < d_value,
+    }
+
+
+def reference_bollinger(closes, period=20, multiplier=2.0):
+    if len(closes) < period:
+        return {"middle": None, "upper": None, "lower": None, "bandwidth": None, "position": None}
+    window = closes[-period:]
+    middle = mean(window)
+    deviation = pstdev(window) if len(window) > 1 else 0.0
+    upper = middle + multiplier * deviation
+    lower = middle - multiplier * deviation
+    return {
+        "middle": middle,
+        "upper": upper,
+        "lower": lower,
+        "bandwidth": ((upper - lower) / middle) if middle else None,
+        "position": 0.5 if upper == lower else (closes[-1] - lower) / (upper - lower),
+    }
+
+
+def reference_atr(history, period):
+    if len(history) <= period:
+        return None
+    true_ranges = []
+    prev_close = history[0]["close"]
+    for candle in history[1:]:
+        true_ranges.append(
+            max(candle["high"] - candle["low"], abs(candle["high"] - prev_close), abs(candle["low"] - prev_close))
+        )
+        prev_close = candle["close"]
+    return mean(true_ranges[-period:])
+
+
+def reference_volume_ratio(volumes, period):
+    if len(volumes) <= period:
+        return None
+    latest_non_zero = next((value for value in reversed(volumes) if value and value > 0), None)
+    if latest_non_zero is None:
+        return None
+    recent_non_zero = [value for value in volumes[-period:] if value and value > 0]
+    average = mean(recent_non_zero) if recent_non_zero else 0
+    if average <= 0:
+        return None
+    ratio = latest_non_zero / average
+    return None if ratio < 0.05 else ratio
+
+
+def make_history(length, seed, start=50_000.0, flat_tail=0):
+    rng = random.Random(seed)
+    price = start
+    history = []
+    for index in range(length):
+        if index >= length - flat_tail:
+            history.append({"open": price, "high": price, "low": price, "close": price, "volume": 0.0})
+            continue
+        open_ = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        high = max(open_, price) * (1 + abs(rng.gauss(0, 0.005)))
+        low = min(open_, price) * (1 - abs(rng.gauss(0, 0.005)))
+        volume = 0.0 if rng.random() < 0.05 else float(rng.randint(1_000, 2_000_000))
+        history.append({"open": open_, "high": high, "low": low, "close": price, "volume": volume})
+    return history
+
+
+def assert_matches(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_matches(actual[key], expected[key])
+    elif expected is None or isinstance(expected, bool):
+        assert actual == expected
+    else:
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "length,seed,flat_tail",
+    [(1, 1, 0), (14, 2, 0), (17, 3, 0), (34, 4, 0), (35, 5, 0), (130, 6, 0), (260, 7, 25), (5200, 8, 0)],
+)
+def test_engine_matches_reference_indicators(length, seed, flat_tail):
+    history = make_history(length, seed, flat_tail=flat_tail)
+    closes = [item["close"] for item in history]
+    volumes = [item["volume"] for item in history]
+
+    latest = IndicatorEngine().compute(
+        [item["high"] for item in history],
+        [item["low"] for item in history],
+        closes,
+        volumes,
+        bollinger_period=min(20, len(closes)),
+    ).latest()
+
+    assert_matches(latest["rsi"], reference_rsi(closes, 14))
+    assert_matches(latest["macd"], reference_macd_metrics(closes))
+    assert_matches(latest["stochastic"], reference_stochastic(history))
+    assert_matches(latest["atr"], reference_atr(history, 14))
+    assert_matches(latest["bollinger"], reference_bollinger(closes, min(20, len(closes))))
+    assert_matches(latest["volume_ratio"], reference_volume_ratio(volumes, 20))
+
+
+def test_engine_series_match_reference_at_every_bar():
+    history = make_history(300, 11)
+    closes = [item["close"] for item in history]
+    series = IndicatorEngine().compute(
+        [item["high"] for item in history], [item["low"] for item in history], closes, [item["volume"] for item in history]
+    )
+
+    assert series.ema_slow.tolist() == pytest.approx(reference_ema(closes, 26), rel=1e-12)
+    for end in (15, 40, 120, 300):
+        assert series.rsi[end - 1] == pytest.approx(reference_rsi(closes[:end], 14), rel=1e-9)
+        assert series.atr[end - 1] == pytest.approx(reference_atr(history[:end], 14), rel=1e-9)
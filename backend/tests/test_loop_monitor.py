@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.loop_monitor import EventLoopMonitor
+
+
+def blocking_helper():
+    time.sleep(0.25)
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_lag_and_blocking_call_site():
+    monitor = EventLoopMonitor(interval=0.02, slow_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_helper()
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert report["lag"]["count"] > 0
+    assert report["lag"]["max"] >= 0.2
+    sites = report["slow_call_sites"]
+    assert sites
+    assert "blocking_helper" in sites[0]["site"]
+    assert sites[0]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_restart_leaves_a_single_watchdog_thread():
+    # A slow threshold keeps the old watchdog parked in its poll wait when stop() is called.
+    monitor = EventLoopMonitor(interval=0.02, slow_threshold=0.5)
+    monitor.start()
+    first = monitor._watchdog
+    await monitor.stop()
+    monitor.start()
+    try:
+        assert not first.is_alive()
+        watchdogs = [thread for thread in threading.enumerate() if thread.name == "event-loop-watchdog"]
+        assert watchdogs == [monitor._watchdog]
+    finally:
+        await monitor.stop()
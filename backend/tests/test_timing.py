@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.timing import FUNCTION_LATENCY, UPSTREAM_LATENCY, configure_timing, timed, time_upstream
+
+
+@timed(name="test.slow_coroutine")
+async def slow_coroutine():
+    await asyncio.sleep(0.05)
+    return "done"
+
+
+@timed(upstream="test_upstream")
+def blocking_fetch():
+    time.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_timed_measures_awaited_execution_not_coroutine_creation():
+    histogram = FUNCTION_LATENCY.labels("test.slow_coroutine")
+    histogram.reset()
+
+    assert await slow_coroutine() == "done"
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 1
+    assert snapshot["sum"] >= 0.045
+    assert slow_coroutine.__name__ == "slow_coroutine"
+
+
+def test_upstream_timing_and_sampling_switch():
+    histogram = UPSTREAM_LATENCY.labels("test_upstream")
+    histogram.reset()
+
+    blocking_fetch()
+    with time_upstream("test_upstream"):
+        pass
+    assert histogram.count == 2
+
+    configure_timing(False)
+    try:
+        blocking_fetch()
+    finally:
+        configure_timing(True)
+    assert histogram.count == 2